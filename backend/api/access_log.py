@@ -0,0 +1,177 @@
+# File: backend/api/access_log.py
+"""
+Structured, sampled access logging kept off the request hot path.
+
+One JSON line per logged request (method, route template, status, timings,
+byte counts). Requests are sampled per route prefix; errors and slow requests
+are always logged. Request bodies are captured only for opt-in routes, never
+for multipart uploads, and only their first ACCESS_LOG_BODY_BYTES, teed from
+the stream as the endpoint reads it so nothing is buffered in advance.
+
+Records go through the shared queue logging (backend.logging_config); the
+listener thread does the JSON encoding and file writes, so the request
+thread only enqueues a dict.
+
+Settings (environment):
+    ACCESS_LOG_SAMPLE_RATE    default share of requests logged (1.0)
+    ACCESS_LOG_ROUTE_SAMPLING per-prefix rates, e.g. "/user-input/resume/cache/stats=0.01,/recommendations=0.5"
+    ACCESS_LOG_BODY_ROUTES    comma separated path prefixes whose bodies are captured
+    ACCESS_LOG_BODY_BYTES     capture cap in bytes (1024)
+    ACCESS_LOG_SLOW_MS        requests at least this slow are always logged (1000)
+    ACCESS_LOG_FILE           access log file (logs/access.log)
+"""
+import json
+import logging
+import logging.handlers
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from backend.logging_config import start_queue_listener
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+access_logger = logging.getLogger("backend.access")
+
+SAMPLE_RATE = float(os.environ.get("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+BODY_BYTES = int(os.environ.get("ACCESS_LOG_BODY_BYTES", "1024"))
+SLOW_MS = float(os.environ.get("ACCESS_LOG_SLOW_MS", "1000"))
+ACCESS_LOG_FILE = os.environ.get("ACCESS_LOG_FILE", os.path.join("logs", "access.log"))
+
+
+def parse_route_rates(spec: Optional[str]) -> List[Tuple[str, float]]:
+    """Parse "prefix=rate,..." into (prefix, rate) pairs, longest prefix first."""
+    rates = []
+    for part in (spec or "").split(","):
+        prefix, _, rate = part.strip().partition("=")
+        if not prefix or not rate:
+            continue
+        try:
+            rates.append((prefix.strip(), min(max(float(rate), 0.0), 1.0)))
+        except ValueError:
+            logger.warning(f"Ignoring invalid access log sampling rule {part!r}")
+    return sorted(rates, key=lambda x: -len(x[0]))
+
+
+def parse_prefixes(spec: Optional[str]) -> Tuple[str, ...]:
+    return tuple(p.strip() for p in (spec or "").split(",") if p.strip())
+
+
+ROUTE_RATES = parse_route_rates(os.environ.get("ACCESS_LOG_ROUTE_SAMPLING"))
+BODY_ROUTES = parse_prefixes(os.environ.get("ACCESS_LOG_BODY_ROUTES"))
+
+_queue_handler: Optional[logging.Handler] = None
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        if isinstance(record.msg, dict):
+            return json.dumps({"ts": round(record.created, 3), **record.msg})
+        return super().format(record)
+
+
+def configure_access_logger(path: str = ACCESS_LOG_FILE, *handlers: logging.Handler) -> logging.Logger:
+    """
+    Route the access logger through a queue to a rotating file (idempotent).
+
+    Args:
+        path (str): Access log file
+        handlers (logging.Handler): Extra handlers fed by the same listener
+
+    Returns:
+        logging.Logger: The access logger
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        return access_logger
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=10 * 1024 * 1024, backupCount=5)
+    file_handler.setFormatter(_JsonFormatter("%(message)s"))
+    # A queue of its own: access records are sampled already and must not be rate limited
+    _queue_handler = start_queue_listener(file_handler, *handlers)
+    access_logger.addHandler(_queue_handler)
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    return access_logger
+
+
+class AccessLogMiddleware:
+    """ASGI middleware writing one sampled JSON access record per request."""
+
+    def __init__(self, app, sample_rate: float = SAMPLE_RATE, route_rates: Optional[List[Tuple[str, float]]] = None,
+                 body_routes: Optional[Tuple[str, ...]] = None, body_bytes: int = BODY_BYTES,
+                 slow_ms: float = SLOW_MS, log: logging.Logger = access_logger):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.route_rates = ROUTE_RATES if route_rates is None else route_rates
+        self.body_routes = BODY_ROUTES if body_routes is None else body_routes
+        self.body_bytes = body_bytes
+        self.slow_ms = slow_ms
+        self.log = log
+
+    def _rate(self, path: str) -> float:
+        for prefix, rate in self.route_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.log.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        sampled = random.random() < self._rate(path)
+        capture = sampled and self.body_bytes > 0 and path.startswith(self.body_routes)
+        if capture:
+            content_type = dict(scope["headers"]).get(b"content-type", b"")
+            capture = not content_type.startswith(b"multipart/")
+
+        start = time.perf_counter()
+        state = {"status": 500, "request_bytes": 0, "response_bytes": 0, "ttfb": None}
+        captured = bytearray()
+
+        async def tee_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                state["request_bytes"] += len(chunk)
+                if capture and len(captured) < self.body_bytes:
+                    captured.extend(chunk[:self.body_bytes - len(captured)])
+            return message
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                state["ttfb"] = time.perf_counter()
+            elif message["type"] == "http.response.body":
+                state["response_bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, tee_receive, timed_send)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if sampled or state["status"] >= 500 or elapsed_ms >= self.slow_ms:
+                self._emit(scope, state, elapsed_ms, start, captured if capture else None)
+
+    def _emit(self, scope, state: Dict, elapsed_ms: float, start: float, body: Optional[bytearray]):
+        route = scope.get("route")
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": state["status"],
+            "duration_ms": round(elapsed_ms, 2),
+            "ttfb_ms": round((state["ttfb"] - start) * 1000, 2) if state["ttfb"] else None,
+            "request_bytes": state["request_bytes"],
+            "response_bytes": state["response_bytes"],
+            "client": scope["client"][0] if scope.get("client") else None,
+        }
+        if body is not None:
+            record["body"] = body.decode("utf-8", errors="replace")
+            record["body_truncated"] = state["request_bytes"] > len(body)
+        # Only the dict is enqueued; JSON encoding and disk I/O happen on the listener thread
+        self.log.info(record)
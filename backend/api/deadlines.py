@@ -0,0 +1,76 @@
+# File: backend/api/deadlines.py
+"""
+Request deadlines and the degraded flag.
+
+Every request gets a time budget (backend/services/deadline.py): the
+endpoint's budget below, shortened to what the client will wait for when it
+sends X-Request-Timeout (the frontend sends its read timeout), less a
+margin for the response to travel back. Snowflake statements and LLM
+attempts made for the request run within it. When a request fell back to a
+degraded result, the response carries X-Degraded with the reasons.
+
+Settings (environment):
+    REQUEST_DEADLINE      budget of an ordinary request in seconds (30)
+    LLM_REQUEST_DEADLINE  budget of the LLM-heavy endpoints in seconds (45)
+"""
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from backend.services import deadline
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+REQUEST_DEADLINE = float(os.environ.get("REQUEST_DEADLINE", "30"))
+LLM_REQUEST_DEADLINE = float(os.environ.get("LLM_REQUEST_DEADLINE", "45"))
+
+TIMEOUT_HEADER = b"x-request-timeout"
+CLIENT_MARGIN = 1.0
+
+PATH_DEADLINES = [
+    ("/user-input/career-question", LLM_REQUEST_DEADLINE),
+    ("/user-input/skills/extract", LLM_REQUEST_DEADLINE),
+    ("/user-input/skills/missing", LLM_REQUEST_DEADLINE),
+    ("/user-input/workflow/", LLM_REQUEST_DEADLINE),
+]
+
+
+class DeadlineMiddleware:
+    """ASGI middleware giving each request a deadline and flagging degraded responses."""
+
+    def __init__(self, app, default: float = REQUEST_DEADLINE, path_deadlines: Optional[List[Tuple[str, float]]] = None):
+        self.app = app
+        self.default = default
+        self.path_deadlines = PATH_DEADLINES if path_deadlines is None else path_deadlines
+
+    def budget_for(self, scope) -> float:
+        path = scope["path"]
+        seconds = next((s for prefix, s in self.path_deadlines if path.startswith(prefix)), self.default)
+        client_timeout = dict(scope["headers"]).get(TIMEOUT_HEADER)
+        if client_timeout:
+            try:
+                seconds = min(seconds, max(1.0, float(client_timeout) - CLIENT_MARGIN))
+            except ValueError:
+                pass
+        return seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/health"):
+            await self.app(scope, receive, send)
+            return
+
+        token = deadline.start(self.budget_for(scope))
+        budget = deadline.current()
+
+        async def flagged_send(message):
+            if message["type"] == "http.response.start" and budget.degraded:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-degraded", ",".join(budget.degraded).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, flagged_send)
+        finally:
+            deadline.reset(token)
@@ -1,19 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 import sys
 import os
 import logging
-from logging.config import dictConfig
-import time
 
 # Add parent directory to path to make relative imports work
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+# Queue-based logging for the whole process, before any module logs at import time
+from backend.logging_config import setup_logging
+setup_logging("api_server", detailed=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the shared services and warm up before this worker accepts requests
+    (see backend/api/warmup.py); release them on shutdown.
+    """
+    from fastapi.concurrency import run_in_threadpool
+    from backend.api.throttling import size_threadpool
+    from backend.api.warmup import run_warmup
+    size_threadpool()
+    await run_in_threadpool(run_warmup)
+    yield
+    from backend.database import close_connection_pool
+    from backend.services.resume_parser import shutdown_extraction_pool
+    shutdown_extraction_pool()
+    close_connection_pool()
+
 app = FastAPI(
     title="SkillPathAI API",
     description="API for SkillPathAI Career Transition Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Get environment variables
@@ -46,93 +66,55 @@ app.include_router(user_input.router)
 
 logger = logging.getLogger(__name__)
 
-@app.middleware("http")
-async def log_requests(request, call_next):
-    start_time = time.time()
-    
-    # Log request details
-    logger.debug(f"Request: {request.method} {request.url}")
-    logger.debug(f"Headers: {request.headers}")
-    
-    # Try to log request body for POST/PUT
-    if request.method in ["POST", "PUT"]:
-        try:
-            body = await request.body()
-            logger.debug(f"Request body: {body.decode()}")
-            # Reset the request body since we consumed it
-            request._body = body
-        except Exception as e:
-            logger.error(f"Failed to log request body: {e}")
-    
-    # Process the request
-    response = await call_next(request)
-    
-    # Log response details
-    process_time = time.time() - start_time
-    logger.debug(f"Response status: {response.status_code}")
-    logger.debug(f"Response time: {process_time:.3f}s")
-    
-    return response
+# Each request runs within a deadline; responses built from fallbacks carry X-Degraded
+from backend.api.deadlines import DeadlineMiddleware
+app.add_middleware(DeadlineMiddleware)
+
+# Compress course lists, plans and chat history; tiny responses aren't worth the CPU
+from starlette.middleware.gzip import GZipMiddleware
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.environ.get("GZIP_MINIMUM_SIZE", "1024")),
+    compresslevel=int(os.environ.get("GZIP_LEVEL", "1")),
+)
+
+# Rate limits and full dependency queues answer 429 with Retry-After, wherever they are hit
+from backend.api.throttling import admission_rejected_handler
+from backend.services.admission import AdmissionRejected
+app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
+
+# Oversized uploads are rejected before anything reads them
+from backend.api.upload_limits import UploadLimitMiddleware
+app.add_middleware(UploadLimitMiddleware)
+
+# Outermost, so rejected uploads are logged too; records are written by a background thread
+from backend.api.access_log import AccessLogMiddleware, configure_access_logger
+configure_access_logger()
+app.add_middleware(AccessLogMiddleware)
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to SkillPathAI API"}
 
-# Define your logging configuration
-logging_config = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "default": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        },
-        "detailed": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(pathname)s:%(lineno)d - %(message)s",
-        },
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "level": "DEBUG",
-            "formatter": "detailed",
-        },
-        "rotating_file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "filename": "logs/api_server.log",
-            "maxBytes": 1048576,
-            "backupCount": 3,
-            "level": "DEBUG",
-            "formatter": "detailed",
-        },
-    },
-    "loggers": {
-        "": {  # Root logger
-            "handlers": ["console", "rotating_file"],
-            "level": "DEBUG",
-        },
-        "uvicorn": {
-            "handlers": ["console", "rotating_file"],
-            "level": "INFO",
-            "propagate": False,
-        },
-        "uvicorn.error": {
-            "handlers": ["console", "rotating_file"],
-            "level": "INFO",
-            "propagate": False,
-        },
-        "snowflake.connector": {
-            "handlers": ["console", "rotating_file"],
-            "level": "DEBUG",
-            "propagate": False
-        },
-    },
-}
-
-# Apply the configuration
-dictConfig(logging_config)
-
-# Enable detailed Snowflake connector logging
-logging.getLogger('snowflake.connector').setLevel(logging.INFO)
+@app.get("/health/live")
+def liveness():
+    """The process is up and serving."""
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+def readiness_check():
+    """200 once this worker finished its warmup (failed steps are listed in "degraded"), else 503."""
+    from fastapi.responses import JSONResponse
+    from backend.api.warmup import readiness
+    state = readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+@app.get("/health/admission")
+def admission_metrics():
+    """Queue depth, rejections and wait times per dependency, and rate limit counters, of this worker."""
+    from backend.services.admission import admission_stats
+    return admission_stats()
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("api.main:app", host="0.0.0.0", port=8000, reload=True, log_level="debug") 
\ No newline at end of file
@@ -0,0 +1,115 @@
+# File: backend/api/responses.py
+"""
+Fast JSON responses for large, trusted payloads.
+
+FastAPI validates a returned value against the endpoint's response_model,
+runs it through jsonable_encoder and encodes it with the stdlib json module.
+For payloads built by our own services (course lists, markdown plans) that
+work only burns CPU. Endpoints return FastJSONResponse instead: the content
+is encoded directly with orjson (stdlib json if orjson is not installed).
+The response_model stays on the route for the OpenAPI schema, and
+project() keeps the documented shape by selecting the model's fields.
+
+conditional_response() adds a validator: the ETag is a hash of the encoded
+body, and a request whose If-None-Match carries it gets an empty 304. The
+POST endpoints that use it are lookups with no side effects, so they answer
+If-None-Match with 304 like a GET.
+"""
+import hashlib
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any):
+    """Encode the extra types Snowflake rows carry."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if hasattr(value, "tolist"):  # numpy scalars and arrays
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson; returning it skips response_model validation."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def project(items: Iterable[Dict], model: Type[BaseModel]) -> List[Dict]:
+    """
+    Select a model's fields from trusted dicts without validating them.
+
+    Args:
+        items (iterable): Dicts produced by our own services
+        model (BaseModel): Model whose fields (and defaults) define the output shape
+
+    Returns:
+        list: One dict per item with exactly the model's fields
+    """
+    fields = [(name, field.default if not field.is_required() else None)
+              for name, field in model.model_fields.items()]
+    return [{name: item.get(name, default) for name, default in fields} for item in items]
+
+
+def etag_for(body: bytes) -> str:
+    """Weak ETag of an encoded body (weak, because GZipMiddleware may re-encode it)."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def conditional_response(request: Request, content: Any) -> Response:
+    """
+    Encode content once and answer 304 if the client already holds it.
+
+    Args:
+        request (Request): Incoming request, read for If-None-Match
+        content: JSON-serializable response content
+
+    Returns:
+        Response: 200 with the body and its ETag, or an empty 304
+    """
+    body = dumps(content)
+    headers = {"ETag": etag_for(body), "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
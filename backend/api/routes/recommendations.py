@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 import sys
 import os
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
+from backend.api.responses import conditional_response, project
+from backend.services.admission import AdmissionRejected
 from backend.services.skill_service import  get_top_skills_for_role
 # from backend.services.course_service import get_courses_for_skills
 
@@ -36,6 +39,9 @@ class Course(BaseModel):
     LEVEL: Optional[str] = None
     PLATFORM: Optional[str] = None
     LEVEL_CATEGORY: Optional[str] = None
+    PLAN_ORDER: Optional[int] = None
+    PLAN_STAGE: Optional[int] = None
+    CLUSTER_ID: Optional[str] = None
 
 
 class RoleCourseRequest(BaseModel):
@@ -43,6 +49,45 @@ class RoleCourseRequest(BaseModel):
     limit: Optional[int] = 5
     user_id: Optional[int] = None
 
+class CourseSearchRequest(BaseModel):
+    """Boolean skill query against the in-memory course index."""
+    all_skills: List[str] = []
+    any_skills: List[str] = []
+    exclude_skills: List[str] = []
+    levels: List[str] = []
+    platforms: List[str] = []
+    limit: Optional[int] = 10
+    offset: Optional[int] = 0
+    collapse_duplicates: Optional[bool] = True
+
+class BatchRecommendationItem(BaseModel):
+    """One unit of cohort work: courses or top skills for a user's target role."""
+    id: Optional[str] = None
+    user_id: Optional[str] = None
+    role: str
+    kind: str = "courses"  # "courses" or "top_skills"
+    skill_ratings: Optional[Dict[str, int]] = None
+    missing_skills: Optional[List[str]] = None
+    limit: Optional[int] = 6
+
+class BatchRecommendationRequest(BaseModel):
+    items: List[BatchRecommendationItem]
+    max_concurrency: Optional[int] = None
+
+class RoleFitRequest(BaseModel):
+    """Skills to score against every role; extracted skills, self-ratings or a known resume."""
+    skills: List[str] = []
+    skill_ratings: Optional[Dict[str, int]] = None
+    resume_hash: Optional[str] = None
+    limit: Optional[int] = 10
+    missing_limit: Optional[int] = 5
+
+class CourseSearchResponse(BaseModel):
+    total: int
+    courses: List[Course]
+    facets: Dict[str, Dict[str, int]]
+    elapsed_us: int
+
 # @router.post("/skills", response_model=SkillRecommendationResponse)
 # def get_skill_recommendations_api(request: SkillRecommendationRequest):
 #     try:
@@ -59,7 +104,7 @@ class RoleCourseRequest(BaseModel):
 #         )
 
 @router.post("/courses", response_model=List[Course])
-def get_courses_recommendations_for_role(request: RoleCourseRequest):
+def get_courses_recommendations_for_role(request: RoleCourseRequest, http_request: Request):
     """
     Get course recommendations for a specific role
     """
@@ -69,10 +114,11 @@ def get_courses_recommendations_for_role(request: RoleCourseRequest):
         # Get course recommendations from the service
         courses = get_course_recommendations(request.role, request.user_id)
         
-        # Convert DataFrame to list of dictionaries
-        
-        
-        return courses
+        # Trusted service output: keep the Course fields and encode with orjson, no per-course validation;
+        # a client that already holds this list gets a 304
+        return conditional_response(http_request, project(courses or [], Course))
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -101,8 +147,103 @@ def get_top_skills(role: str):
                 "message": f"No skills found for role: {role}",
                 "skills": []
             }
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error getting top skills for role {role}: {str(e)}"
         )
+
+@router.post("/courses/search", response_model=CourseSearchResponse)
+def search_courses(request: CourseSearchRequest):
+    """
+    Search courses by skills with AND/OR/NOT semantics, filtered by level and platform,
+    and return facet counts. Served from the in-memory course index, no Cortex call.
+    """
+    try:
+        from backend.services.course_index import get_course_index
+
+        return get_course_index().search(
+            all_skills=request.all_skills,
+            any_skills=request.any_skills,
+            exclude_skills=request.exclude_skills,
+            levels=request.levels,
+            platforms=request.platforms,
+            limit=max(1, min(request.limit or 10, 100)),
+            offset=max(0, request.offset or 0),
+            collapse=bool(request.collapse_duplicates),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching courses: {str(e)}"
+        )
+
+@router.post("/roles/fit")
+def score_role_fit(request: RoleFitRequest):
+    """
+    Rank the roles in the role x skill matrix by how well the user's skills fit them,
+    with coverage and the most important missing skills per role. One vectorized pass
+    over all roles, no Cortex call.
+    """
+    try:
+        from backend.services.role_fit import get_role_fit_matrix
+
+        matrix = get_role_fit_matrix()
+        if not len(matrix):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Role fit matrix has not been built"
+            )
+
+        skills = request.skills
+        if not skills and not request.skill_ratings and request.resume_hash:
+            from backend.services.resume_cache import get_resume_cache, normalize_hash
+
+            cached = get_resume_cache().peek(normalize_hash(request.resume_hash))
+            skills = (cached or {}).get("skills") or []
+            if not skills:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="No extracted skills are cached for this resume"
+                )
+
+        return matrix.score(
+            skills=skills,
+            ratings=request.skill_ratings,
+            limit=max(1, min(request.limit or 10, 100)),
+            missing_limit=max(0, min(request.missing_limit if request.missing_limit is not None else 5, 40)),
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error scoring role fit: {str(e)}"
+        )
+
+@router.post("/batch")
+async def batch_recommendations(request: BatchRecommendationRequest):
+    """
+    Run many course / top-skill recommendations in one request.
+
+    Identical work is deduplicated, unique work fans out with bounded concurrency,
+    and results stream back as NDJSON (one line per item, in completion order,
+    with per-item errors) followed by a summary line.
+    """
+    from backend.services.batch_recommendations import BATCH_MAX_ITEMS, stream_batch
+
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large: {len(request.items)} items (max {BATCH_MAX_ITEMS})"
+        )
+
+    items = [item.model_dump() for item in request.items]
+    return StreamingResponse(
+        stream_batch(items, request.max_concurrency),
+        media_type="application/x-ndjson"
+    )
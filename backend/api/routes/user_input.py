@@ -1,13 +1,19 @@
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from uuid import uuid4
 from datetime import datetime
 import json
 import logging
-from backend.services.chat_service import ChatService
+from backend.api.responses import FastJSONResponse, conditional_response
+from backend.api.throttling import rate_limited
+from backend.services.admission import AdmissionRejected, get_limiter
+from backend.services.chat_service import ChatService, get_chat_service
+from backend.services.deadline import is_degraded
 # from backend.database import save_chat_history, store_skill_ratings
-from backend.services.resume_parser import extract_text
+from backend.services.resume_parser import SUPPORTED_EXTENSIONS, ResumeTooLargeError, extract_resume
 from backend.services.skill_matcher import extract_skills_from_text
 from backend.services.career_transition_service import (
     process_missing_skills, 
@@ -16,7 +22,6 @@ from backend.services.career_transition_service import (
     format_transition_plan
 )
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 router = APIRouter(
     prefix="/user-input",
@@ -61,6 +66,7 @@ class LearningPathRequest(BaseModel):
     user_id: str
     target_role: str
     current_skills: List[str]
+    skill_ratings: Optional[Dict[str, int]] = None
     learning_style: Optional[str] = None
     time_commitment: Optional[str] = None
 
@@ -87,27 +93,49 @@ class ResumeExtractResponse(BaseModel):
     success: bool
     text: str
     message: Optional[str] = None
+    resume_hash: Optional[str] = None
+    cached: bool = False
+    partial: bool = False  # page limit or extraction deadline reached
+
+class ResumeLookupRequest(BaseModel):
+    """Request model for looking up a resume by content hash."""
+    resume_hash: str
+    target_role: Optional[str] = None
+
+class ResumeLookupResponse(BaseModel):
+    """Response model for resume lookup; found is False when the file must be uploaded."""
+    found: bool
+    resume_hash: str
+    text: Optional[str] = None
+    skills: Optional[List[str]] = None
+    missing_skills: Optional[List[str]] = None
 
 class SkillsExtractRequest(BaseModel):
     """Request model for skills extraction."""
     resume_text: str
+    mode: Optional[str] = None  # "hybrid" (default), "dictionary" or "llm"
+    resume_hash: Optional[str] = None
 
 class SkillsExtractResponse(BaseModel):
     """Response model for skills extraction."""
     success: bool
     skills: List[str]
     message: Optional[str] = None
+    report: Optional[Dict[str, Any]] = None
+    degraded: bool = False  # some sections were skipped to meet the deadline
 
 class MissingSkillsRequest(BaseModel):
     """Request model for missing skills analysis."""
     extracted_skills: List[str]
     target_role: str
+    resume_hash: Optional[str] = None
 
 class MissingSkillsResponse(BaseModel):
     """Response model for missing skills analysis."""
     success: bool
     missing_skills: List[str]
     message: Optional[str] = None
+    degraded: bool = False  # generic skills for the role instead of an LLM analysis
 
 class CareerAnalysisRequest(BaseModel):
     """Request model for career analysis storage."""
@@ -116,6 +144,7 @@ class CareerAnalysisRequest(BaseModel):
     extracted_skills: List[str]
     target_role: str
     missing_skills: List[str]
+    resume_hash: Optional[str] = None
 
 class CareerAnalysisResponse(BaseModel):
     """Response model for career analysis storage."""
@@ -135,6 +164,7 @@ class CareerCoursesResponse(BaseModel):
     courses: List[Dict[str, Any]]
     count: int
     message: Optional[str] = None
+    degraded: bool = False  # fallback courses instead of search results
 
 class TransitionPlanRequest(BaseModel):
     """Request model for transition plan formatting."""
@@ -154,6 +184,23 @@ class TransitionPlanResponse(BaseModel):
     has_valid_courses: bool
     message: Optional[str] = None
 
+class CareerWorkflowRequest(BaseModel):
+    """Request model for the career transition workflow."""
+    username: str
+    target_role: str
+    resume_text: Optional[str] = None  # or the resume_hash of an already extracted resume
+    resume_hash: Optional[str] = None
+    extracted_skills: Optional[List[str]] = None  # skills the client already has
+    mode: Optional[str] = None
+    limit: int = 6
+
+class LearningPathWorkflowRequest(BaseModel):
+    """Request model for the learning path workflow."""
+    name: str
+    target_role: str
+    skill_ratings: Dict[str, int] = {}
+    top_skills: Optional[List[str]] = None  # top skills the client already has
+
 class CleanChatHistoryRequest(BaseModel):
     user_name: str
     timestamp: datetime
@@ -164,13 +211,20 @@ async def upload_resume(
     user_id: str = Form(...)
 ):
     try:
-        content = await file.read()
-        return {
-            "message": "Resume uploaded successfully",
-            "file_name": file.filename,
-            "user_id": user_id,
-            "resume_id": str(uuid4())
-        }
+        from backend.services.upload_spool import spool_upload
+        
+        # Stream to disk with the size cap instead of reading the whole file
+        with await spool_upload(file) as upload:
+            return {
+                "message": "Resume uploaded successfully",
+                "file_name": file.filename,
+                "user_id": user_id,
+                "resume_id": str(uuid4()),
+                "size": upload.size,
+                "resume_hash": upload.sha256
+            }
+    except ResumeTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -213,12 +267,30 @@ def submit_career_transition_data(data: CareerTransitionData):
 
 @router.post("/learning-path")
 def generate_learning_path(request: LearningPathRequest):
+    """
+    Serve a learning path from the nightly materialized plans, personalized with the
+    user's current skills and ratings. Roles that were not precomputed are built live.
+    """
     try:
+        from backend.services.learning_path_materializer import (
+            build_plan, canonical_role, get_materialized_plan, personalize_plan, rating_profile
+        )
+
+        profile = rating_profile(request.skill_ratings)
+        plan = get_materialized_plan(request.target_role, profile)
+        materialized = plan is not None
+        if not materialized:
+            logger.info(f"No materialized plan for {request.target_role}/{profile}, building live")
+            plan = build_plan(canonical_role(request.target_role), profile)
+            plan["version"] = "live"
+
         return {
             "message": "Learning path generated successfully",
             "user_id": request.user_id,
             "target_role": request.target_role,
-            "path_id": str(uuid4())
+            "path_id": f"{canonical_role(request.target_role)}:{profile}:{plan.get('version')}",
+            "materialized": materialized,
+            "plan": personalize_plan(plan, request.current_skills, request.skill_ratings)
         }
     except Exception as e:
         raise HTTPException(
@@ -264,8 +336,10 @@ def save_session_state(data: SessionStateData):
 @router.post("/skill-ratings/store")
 def store_skill_ratings_endpoint(data: LearningPathData):
     try:
+        from backend.services.learning_path_service import store_learning_path
+        
         path_data = data.model_dump()
-        record_id = store_career_analysis(path_data)
+        record_id = store_learning_path(path_data)
         if record_id:
             return {
                 "success": True,
@@ -306,7 +380,7 @@ def clean_chat_history(request: CleanChatHistoryRequest):
     #     raise HTTPException(status_code=500, detail=f"Error cleaning chat history: {str(e)}")
 
 @router.get("/chat-history/recent", response_model=List[ChatHistoryResponse])
-def fetch_recent_chats(user_name: str, limit: int = Query(5, ge=1, le=20)):
+def fetch_recent_chats(http_request: Request, user_name: str, limit: int = Query(5, ge=1, le=20)):
     try:
         from backend.database import retrieve_session_state
         rows = retrieve_session_state(user_name, limit)
@@ -326,22 +400,22 @@ def fetch_recent_chats(user_name: str, limit: int = Query(5, ge=1, le=20)):
                     cur_timestamp=str(timestamp),
                     source_page=source,
                     role=role
-                ))
+                ).model_dump())
             except Exception as e:
                 logger.warning(f"Skipping invalid chat record: {e}")
                 continue
 
-        return result
+        # The dashboard polls this on every rerun; unchanged history is answered with a 304
+        return conditional_response(http_request, result)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 # -------------------- Career Questions --------------------
 
-@router.post("/career-question")
-def answer_career_question(request: CareerQuestionRequest):
+@router.post("/career-question", dependencies=[Depends(rate_limited)])
+def answer_career_question(request: CareerQuestionRequest, chat_service: ChatService = Depends(get_chat_service)):
     try:
-        chat_service = ChatService()
         flag, response = chat_service.answer_career_question(
             request.question,
             request.user_context
@@ -353,67 +427,190 @@ def answer_career_question(request: CareerQuestionRequest):
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=f"Error answering your question: {response}"
             )
+    except (HTTPException, AdmissionRejected):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error answering your question: {str(e)}"
         )
 
-@router.post("/resume/extract", response_model=ResumeExtractResponse)
+@router.post("/resume/extract", response_model=ResumeExtractResponse, dependencies=[Depends(rate_limited)])
 async def extract_resume_text(file: UploadFile = File(...)):
-    """Extract text from a resume file (PDF or DOCX)."""
+    """
+    Extract text from a resume file (PDF or DOCX).
+    
+    Files are keyed by the SHA-256 of their bytes; re-uploading an identical file
+    reuses the text extracted the first time. Parsing runs in the extraction process
+    pool, off the event loop, within the page, size and time limits of resume_parser.
+    """
     try:
+        from backend.services.resume_cache import get_resume_cache
+        from backend.services.upload_spool import spool_upload
+        
         # Check file type
-        if not file.filename.endswith(('.pdf', '.docx')):
+        if not file.filename.lower().endswith(SUPPORTED_EXTENSIONS):
             raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
         
-        # Extract text from the file
-        extracted_text = extract_text(file)
+        # Stream to a temporary file (hashing as it goes); workers parse it by path
+        with await spool_upload(file) as upload:
+            resume_hash = upload.sha256
+            cache = get_resume_cache()
+            
+            # Extract text from the file unless this exact file was seen before
+            extracted_text = cache.get_text(resume_hash)
+            cached = extracted_text is not None
+            partial = timed_out = False
+            if not cached:
+                # Waits for a parsing slot (or is turned away when too many are queued)
+                extraction = await run_in_threadpool(get_limiter("pdf").call, extract_resume, upload.path, file.filename)
+                extracted_text = extraction["text"]
+                partial = extraction["truncated"] or extraction["timed_out"]
+                timed_out = extraction["timed_out"]
+                logger.info(
+                    f"Extracted {file.filename}: {extraction['pages_extracted']}/{extraction['pages']} pages "
+                    f"in {extraction['elapsed_ms']} ms (timed_out={timed_out})"
+                )
         
         # Check if extraction was successful
         if not extracted_text or len(extracted_text) < 50:
             return ResumeExtractResponse(
                 success=False,
                 text="",
-                message="Could not extract enough text from the file. Please try a different file."
+                message="Could not extract enough text from the file. Please try a different file.",
+                resume_hash=resume_hash
             )
         
+        # A timed-out extraction may do better next time, so it is not cached
+        if not cached and not timed_out:
+            cache.put_text(resume_hash, extracted_text)
+        
         # Return successful response
         return ResumeExtractResponse(
             success=True,
             text=extracted_text,
-            message="Text extracted successfully"
+            message="Text extracted successfully" if not partial else "Text partially extracted (page or time limit reached)",
+            resume_hash=resume_hash,
+            cached=cached,
+            partial=partial
         )
+    except (HTTPException, AdmissionRejected):
+        raise
+    except ResumeTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception as e:
         logging.error(f"Error extracting text from resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
 
-@router.post("/skills/extract", response_model=SkillsExtractResponse)
-async def extract_skills_endpoint(request: SkillsExtractRequest):
-    """Extract skills from resume text using LLM."""
+@router.post("/resume/lookup", response_model=ResumeLookupResponse)
+def lookup_resume_endpoint(request: ResumeLookupRequest):
+    """
+    Look up a resume by the SHA-256 of its bytes before uploading it.
+    
+    On a hit the client can skip the upload and reuse the returned text and
+    skills (and missing skills, if this resume was analyzed for target_role).
+    """
+    try:
+        from backend.services.learning_path_materializer import canonical_role
+        from backend.services.resume_cache import lookup_resume, normalize_hash
+        
+        try:
+            resume_hash = normalize_hash(request.resume_hash)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        entry = lookup_resume(resume_hash)
+        if not entry or not entry.get("text"):
+            return ResumeLookupResponse(found=False, resume_hash=resume_hash)
+        
+        missing_skills = None
+        if request.target_role:
+            missing_skills = entry["missing"].get(canonical_role(request.target_role))
+        return ResumeLookupResponse(
+            found=True,
+            resume_hash=resume_hash,
+            text=entry["text"],
+            skills=entry["skills"],
+            missing_skills=missing_skills
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error looking up resume: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error looking up resume: {str(e)}")
+
+@router.get("/resume/cache/stats")
+def resume_cache_stats():
+    """Hit rate of the resume content-hash cache in this worker, and of the cache shared by all workers."""
+    from backend.services.resume_cache import get_resume_cache
+    from backend.services.shared_cache import get_shared_cache
+    return {**get_resume_cache().stats(), "shared": get_shared_cache().stats()}
+
+@router.post("/skills/extract", response_model=SkillsExtractResponse, dependencies=[Depends(rate_limited)])
+def extract_skills_endpoint(request: SkillsExtractRequest):
+    """
+    Extract skills from resume text.
+    
+    The skill dictionary scans the whole resume first; the LLM only sees sections
+    the dictionary could not explain (or everything, with mode="llm").
+    """
     try:
-        # Initialize chat service
-        chat_service = ChatService()
+        from backend.services.resume_cache import get_resume_cache, normalize_hash
+        from backend.services.skill_extraction import EXTRACTION_MODES, extract_skills
+        
+        if request.mode and request.mode.lower() not in EXTRACTION_MODES:
+            raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(EXTRACTION_MODES)}")
+        try:
+            resume_hash = normalize_hash(request.resume_hash)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Extract skills using LLM
-        extracted_skills = chat_service.extract_skills(request.resume_text)
+        cache = get_resume_cache()
+        if resume_hash:
+            cached_skills = cache.get_skills(resume_hash, request.resume_text, request.mode)
+            if cached_skills:
+                return SkillsExtractResponse(
+                    success=True,
+                    skills=cached_skills,
+                    message="Skills reused for an identical resume",
+                    report={"cached": True, "skills": len(cached_skills)}
+                )
+        
+        # The chat service (and its Snowflake connection) is only created if the LLM is needed
+        extracted_skills, report = extract_skills(request.resume_text, mode=request.mode)
+        degraded = is_degraded()
+        # Skills found under time pressure are not reused for this resume
+        if resume_hash and extracted_skills and not degraded:
+            cache.put_skills(resume_hash, extracted_skills, mode=request.mode or report["mode"],
+                             resume_text=request.resume_text)
         
         if not extracted_skills:
             return SkillsExtractResponse(
                 success=False,
                 skills=[],
-                message="Could not extract skills from the resume text."
+                message="Could not extract skills from the resume text.",
+                report=report
             )
         
         return SkillsExtractResponse(
             success=True,
             skills=extracted_skills,
-            message="Skills extracted successfully"
+            message="Skills extracted successfully",
+            report=report,
+            degraded=degraded
         )
+    except (HTTPException, AdmissionRejected):
+        raise
     except Exception as e:
         logging.error(f"Error extracting skills: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error extracting skills: {str(e)}")
 
+@router.get("/skills/extract/stats")
+def skill_extraction_stats():
+    """How many resumes were extracted, and what fraction needed no LLM call at all."""
+    from backend.services.skill_extraction import get_extraction_stats
+    return get_extraction_stats()
+
 @router.post("/skills/extract-regex", response_model=SkillsExtractResponse)
 async def extract_skills_regex_endpoint(request: SkillsExtractRequest):
     """Extract skills from resume text using regex."""
@@ -437,36 +634,73 @@ async def extract_skills_regex_endpoint(request: SkillsExtractRequest):
         logging.error(f"Error extracting skills with regex: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error extracting skills with regex: {str(e)}")
 
-@router.post("/skills/missing", response_model=MissingSkillsResponse)
-async def process_missing_skills_endpoint(request: MissingSkillsRequest):
-    """Process missing skills for a target role."""
+@router.post("/skills/missing", response_model=MissingSkillsResponse, dependencies=[Depends(rate_limited)])
+def process_missing_skills_endpoint(request: MissingSkillsRequest):
+    """
+    Process missing skills for a target role.
+    
+    With a resume_hash, results are reused per (resume, canonical role) as long as
+    the extracted skills are unchanged.
+    """
     try:
+        from backend.services.resume_cache import get_resume_cache, normalize_hash
+        
+        try:
+            resume_hash = normalize_hash(request.resume_hash)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        cache = get_resume_cache()
+        if resume_hash:
+            cached_missing = cache.get_missing(resume_hash, request.target_role, request.extracted_skills)
+            if cached_missing is not None:
+                return MissingSkillsResponse(
+                    success=True,
+                    missing_skills=cached_missing,
+                    message="Missing skills reused for an identical resume and role"
+                )
+        
         # Process missing skills
         missing_skills = process_missing_skills(
             request.extracted_skills, 
             request.target_role
         )
+        degraded = is_degraded()
+        # Generic fallback skills are not cached: the next request may get a real analysis
+        if resume_hash and missing_skills and not degraded:
+            cache.put_missing(resume_hash, request.target_role, request.extracted_skills, missing_skills)
         
         return MissingSkillsResponse(
             success=True,
             missing_skills=missing_skills,
-            message="Missing skills identified successfully"
+            message="Missing skills identified successfully",
+            degraded=degraded
         )
+    except (HTTPException, AdmissionRejected):
+        raise
     except Exception as e:
         logging.error(f"Error processing missing skills: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing missing skills: {str(e)}")
 
 @router.post("/career-analysis/store", response_model=CareerAnalysisResponse)
-async def store_career_analysis_endpoint(request: CareerAnalysisRequest):
-    """Store career analysis data."""
+def store_career_analysis_endpoint(request: CareerAnalysisRequest):
+    """Store career analysis data; with a resume_hash, repeat analyses update the existing row."""
     try:
+        from backend.services.resume_cache import normalize_hash
+        
+        try:
+            resume_hash = normalize_hash(request.resume_hash)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
         # Store career analysis
         resume_id = store_career_analysis(
             username=request.username,
             resume_text=request.resume_text,
             extracted_skills=request.extracted_skills,
             target_role=request.target_role,
-            missing_skills=request.missing_skills
+            missing_skills=request.missing_skills,
+            resume_hash=resume_hash
         )
         
         if not resume_id:
@@ -480,41 +714,98 @@ async def store_career_analysis_endpoint(request: CareerAnalysisRequest):
             resume_id=resume_id,
             message="Career analysis stored successfully"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error storing career analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error storing career analysis: {str(e)}")
 
+@router.post("/bulk-ingest", status_code=status.HTTP_202_ACCEPTED)
+async def bulk_ingest_endpoint(
+    file: UploadFile = File(...),
+    target_role: Optional[str] = Form(None),
+    skills_mode: str = Form("dictionary")
+):
+    """
+    Start bulk ingestion of a zip archive of resumes.
+    
+    The archive is streamed to disk and ingested in the background; poll the returned
+    status URL for progress. Uploading the same archive again resumes an interrupted job.
+    """
+    try:
+        import zipfile
+        from backend.services.bulk_ingestion import get_job, start_job
+        from backend.services.skill_extraction import EXTRACTION_MODES
+        from backend.services.upload_settings import BULK_MAX_BYTES
+        from backend.services.upload_spool import spool_upload
+        
+        if skills_mode not in EXTRACTION_MODES:
+            raise HTTPException(status_code=400, detail=f"skills_mode must be one of {', '.join(EXTRACTION_MODES)}")
+        
+        upload = await spool_upload(file, max_bytes=BULK_MAX_BYTES)
+        if not zipfile.is_zipfile(upload.path):
+            upload.close()
+            raise HTTPException(status_code=400, detail="Bulk ingestion expects a zip archive")
+        
+        # The job owns the spooled archive from here on and removes it when done
+        job = start_job(upload.path, upload.sha256, target_role=target_role, skills_mode=skills_mode)
+        return {
+            "message": "Bulk ingestion started",
+            "status_url": f"/user-input/bulk-ingest/{job['job_id']}",
+            **get_job(job["job_id"])
+        }
+    except HTTPException:
+        raise
+    except ResumeTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except Exception as e:
+        logging.error(f"Error starting bulk ingestion: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error starting bulk ingestion: {str(e)}")
+
+@router.get("/bulk-ingest/{job_id}")
+def bulk_ingest_status(job_id: str):
+    """Progress, throughput and per-stage timing of a bulk ingestion job."""
+    from backend.services.bulk_ingestion import get_job
+    
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown bulk ingestion job: {job_id}")
+    return job
+
 @router.post("/career-courses", response_model=CareerCoursesResponse)
-async def get_career_transition_courses_endpoint(request: CareerCoursesRequest):
+async def get_career_transition_courses_endpoint(request: CareerCoursesRequest, http_request: Request):
     """Get career transition courses."""
     try:
-        # Get career transition courses
-        courses_result = get_career_transition_courses(
+        # Get career transition courses (a blocking Snowflake search, so off the event loop)
+        courses_result = await run_in_threadpool(
+            get_career_transition_courses,
             target_role=request.target_role,
             missing_skills=request.missing_skills,
             limit=request.limit
         )
         
         if not courses_result or courses_result.get("count", 0) == 0:
-            return CareerCoursesResponse(
-                success=False,
-                courses=[],
-                count=0,
-                message="No courses found for the specified criteria."
-            )
+            return FastJSONResponse({
+                "success": False,
+                "courses": [],
+                "count": 0,
+                "message": "No courses found for the specified criteria."
+            })
         
-        return CareerCoursesResponse(
-            success=True,
-            courses=courses_result.get("courses", []),
-            count=courses_result.get("count", 0),
-            message="Courses retrieved successfully"
-        )
+        # Service output is trusted: encode it directly instead of validating every course
+        return conditional_response(http_request, {
+            "success": True,
+            "courses": courses_result.get("courses", []),
+            "count": courses_result.get("count", 0),
+            "message": "Courses retrieved successfully",
+            "degraded": is_degraded()
+        })
     except Exception as e:
         logging.error(f"Error getting career transition courses: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error getting career transition courses: {str(e)}")
 
 @router.post("/transition-plan", response_model=TransitionPlanResponse)
-async def format_transition_plan_endpoint(request: TransitionPlanRequest):
+async def format_transition_plan_endpoint(request: TransitionPlanRequest, http_request: Request):
     """Format transition plan."""
     try:
         # Format transition plan
@@ -526,15 +817,72 @@ async def format_transition_plan_endpoint(request: TransitionPlanRequest):
             courses=request.courses
         )
         
-        return TransitionPlanResponse(
-            success=True,
-            introduction=transition_plan.get("introduction", ""),
-            skill_assessment=transition_plan.get("skill_assessment", ""),
-            course_recommendations=transition_plan.get("course_recommendations", ""),
-            career_advice=transition_plan.get("career_advice", ""),
-            has_valid_courses=transition_plan.get("has_valid_courses", False),
-            message="Transition plan formatted successfully"
-        )
+        return conditional_response(http_request, {
+            "success": True,
+            "introduction": transition_plan.get("introduction", ""),
+            "skill_assessment": transition_plan.get("skill_assessment", ""),
+            "course_recommendations": transition_plan.get("course_recommendations", ""),
+            "career_advice": transition_plan.get("career_advice", ""),
+            "has_valid_courses": transition_plan.get("has_valid_courses", False),
+            "message": "Transition plan formatted successfully"
+        })
     except Exception as e:
         logging.error(f"Error formatting transition plan: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error formatting transition plan: {str(e)}")
+
+@router.post("/workflow/career-transition", dependencies=[Depends(rate_limited)])
+async def career_transition_workflow(request: CareerWorkflowRequest):
+    """
+    Run the whole career transition analysis in one request.
+
+    Resume text, skills and missing skills are resolved in turn; the analysis is then
+    stored while courses are searched, and the transition plan follows the courses.
+    Progress streams back as NDJSON, one line per finished step, then a summary line.
+    """
+    from backend.services.resume_cache import normalize_hash
+    from backend.services.skill_extraction import EXTRACTION_MODES
+    from backend.services.workflow import WORKFLOW_CAREER_TRANSITION, career_transition_steps, run_workflow
+
+    if request.mode and request.mode.lower() not in EXTRACTION_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(EXTRACTION_MODES)}")
+    try:
+        resume_hash = normalize_hash(request.resume_hash)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not request.resume_text and not resume_hash:
+        raise HTTPException(status_code=400, detail="Send resume_text or resume_hash")
+
+    steps = career_transition_steps(
+        username=request.username,
+        target_role=request.target_role,
+        resume_text=request.resume_text,
+        resume_hash=resume_hash,
+        extracted_skills=request.extracted_skills,
+        mode=request.mode,
+        limit=request.limit
+    )
+    return StreamingResponse(
+        run_workflow(WORKFLOW_CAREER_TRANSITION, steps),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/workflow/learning-path", dependencies=[Depends(rate_limited)])
+async def learning_path_workflow(request: LearningPathWorkflowRequest):
+    """
+    Run the learning path flow in one request.
+
+    Top skills, storing the skill ratings and the course search run side by side;
+    progress streams back as NDJSON, one line per finished step, then a summary line.
+    """
+    from backend.services.workflow import WORKFLOW_LEARNING_PATH, learning_path_steps, run_workflow
+
+    steps = learning_path_steps(
+        name=request.name,
+        target_role=request.target_role,
+        skill_ratings=request.skill_ratings,
+        top_skills=request.top_skills
+    )
+    return StreamingResponse(
+        run_workflow(WORKFLOW_LEARNING_PATH, steps),
+        media_type="application/x-ndjson"
+    )
@@ -0,0 +1,92 @@
+# File: backend/api/throttling.py
+"""
+API side of admission control (see backend/services/admission.py).
+
+rate_limited is a route dependency that charges the caller's token bucket
+before the endpoint runs. Callers are keyed by client address. X-User-Id is
+not authenticated, so it is only trusted from the Streamlit frontend, whose
+requests all come from one host: when they carry the shared
+FRONTEND_API_TOKEN in X-Frontend-Token, or come from an address listed in
+RATE_LIMIT_TRUSTED_CLIENTS. The per-user keys are advisory either way; they
+split the frontend's traffic fairly between its users, while anything else
+calling the API directly is limited per address.
+admission_rejected_handler turns AdmissionRejected, wherever it is raised,
+into a 429 with Retry-After. size_threadpool() runs at startup: callers
+queued for a dependency slot each block a threadpool thread, so the pool is
+grown to hold every slot and queue place plus THREADPOOL_HEADROOM threads
+for everything else (health checks, cached reads).
+
+Settings (environment):
+    FRONTEND_API_TOKEN          secret the frontend sends in X-Frontend-Token (unset: not used)
+    RATE_LIMIT_TRUSTED_CLIENTS  comma separated frontend addresses whose X-User-Id is trusted
+    API_THREADPOOL_HEADROOM     threads kept free of admission queues (16)
+"""
+import hmac
+import logging
+import os
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from backend.services.admission import AdmissionRejected, admission_threads, get_rate_limiter
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+USER_HEADER = "X-User-Id"
+TOKEN_HEADER = "X-Frontend-Token"
+
+THREADPOOL_HEADROOM = int(os.environ.get("API_THREADPOOL_HEADROOM", "16"))
+
+FRONTEND_TOKEN = os.environ.get("FRONTEND_API_TOKEN", "")
+TRUSTED_CLIENTS = frozenset(
+    address.strip() for address in os.environ.get("RATE_LIMIT_TRUSTED_CLIENTS", "").split(",") if address.strip()
+)
+
+
+def _from_frontend(request: Request, host: str) -> bool:
+    if host in TRUSTED_CLIENTS:
+        return True
+    token = request.headers.get(TOKEN_HEADER)
+    return bool(FRONTEND_TOKEN and token) and hmac.compare_digest(token.encode(), FRONTEND_TOKEN.encode())
+
+
+def client_key(request: Request) -> str:
+    """Rate limit key of a request: X-User-Id when it comes from the frontend, else the client address."""
+    host = request.client.host if request.client else "unknown"
+    user = request.headers.get(USER_HEADER)
+    if user and _from_frontend(request, host):
+        return f"user:{user.strip()[:128]}"
+    return f"ip:{host}"
+
+
+def rate_limited(request: Request):
+    """Route dependency: one token from the caller's bucket, or a 429."""
+    get_rate_limiter().check(client_key(request))
+
+
+def size_threadpool() -> int:
+    """
+    Grow the AnyIO threadpool so admission queues can never fill it.
+
+    Must run on the event loop (the application lifespan).
+
+    Returns:
+        int: Threadpool size
+    """
+    from anyio.to_thread import current_default_thread_limiter
+
+    pool = current_default_thread_limiter()
+    needed = admission_threads() + THREADPOOL_HEADROOM
+    if pool.total_tokens < needed:
+        logger.info(f"Threadpool grown from {pool.total_tokens:g} to {needed} threads for the admission queues")
+        pool.total_tokens = needed
+    return int(pool.total_tokens)
+
+
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        {"detail": str(exc), "retry_after": exc.retry_after},
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
@@ -0,0 +1,101 @@
+# File: backend/api/upload_limits.py
+"""
+Early rejection of oversized multipart uploads.
+
+Multipart bodies are parsed (and spooled) before an endpoint runs, so the cap
+has to be enforced while the body is still streaming in. Requests declaring a
+Content-Length above the cap get a 413 before any of the body is read; bodies
+without one (chunked transfer) are counted as they arrive and cut off at the
+cap.
+"""
+import json
+import logging
+
+from backend.services.resume_parser import MAX_BYTES
+from backend.services.upload_settings import BULK_MAX_BYTES
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Room for multipart boundaries and form fields around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+# Endpoints that accept more than a single resume
+PATH_LIMITS = {
+    "/user-input/bulk-ingest": BULK_MAX_BYTES + MULTIPART_OVERHEAD,
+}
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    """ASGI middleware capping multipart request bodies at max_bytes (or a per-path limit)."""
+
+    def __init__(self, app, max_bytes: int = MAX_BYTES + MULTIPART_OVERHEAD, path_limits=None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = PATH_LIMITS if path_limits is None else path_limits
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+        max_bytes = self.path_limits.get(scope["path"], self.max_bytes)
+
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > max_bytes:
+            logger.warning(f"Rejected {scope['path']}: Content-Length {int(declared)} > {max_bytes}")
+            await self._reject(send, max_bytes)
+            return
+
+        received = 0
+        overflowed = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, overflowed
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    overflowed = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def limited_send(message):
+            nonlocal response_started
+            if overflowed:
+                # The framework turns the aborted body into its own error response; send 413 instead
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await self._reject(send, max_bytes)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except _BodyTooLarge:
+            if not response_started:
+                response_started = True
+                await self._reject(send, max_bytes)
+        if overflowed:
+            logger.warning(f"Rejected {scope['path']}: body exceeded {max_bytes} bytes")
+
+    @staticmethod
+    def _is_multipart(scope) -> bool:
+        content_type = dict(scope["headers"]).get(b"content-type", b"")
+        return content_type.startswith(b"multipart/")
+
+    @staticmethod
+    async def _reject(send, max_bytes: int):
+        body = json.dumps({"detail": f"Upload exceeds the limit of {max_bytes} bytes"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
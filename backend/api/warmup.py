@@ -0,0 +1,149 @@
+# File: backend/api/warmup.py
+"""
+Startup warmup and readiness of an API worker.
+
+run_warmup() loads what the first requests would otherwise pay for: the
+shared service instances, the heavy libraries that are otherwise imported on
+first use (Snowflake connector, pandas), the offline artifacts, the skill
+matcher, the course index, the materialized learning paths and the top
+skills of the most requested roles (seeded into the shared cache from the
+materialized plans, so Cortex is only called for roles that have no plan).
+The application lifespan runs it before the worker accepts connections.
+Under gunicorn with preload it already runs in the master (see
+backend/gunicorn_conf.py), so the workers fork with everything loaded and
+their own call returns at once.
+
+A failed step is logged and reported by /health/ready, but it does not keep
+the worker out of rotation: the data is loaded lazily on first use instead.
+
+Settings (environment):
+    WARMUP         0 skips everything but the shared services and the prerequisite graph (1)
+    WARMUP_ROLES   extra comma separated roles whose skills are fetched up front
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.environ.get("WARMUP", "1") != "0"
+WARMUP_ROLES = [role.strip() for role in os.environ.get("WARMUP_ROLES", "").split(",") if role.strip()]
+
+_state: Dict = {"ready": False, "pid": None, "seconds": None, "steps": {}}
+_lock = threading.Lock()
+
+
+def _services():
+    from backend.services.chat_service import get_chat_service
+    from backend.services.resume_cache import get_resume_cache
+    from backend.services.shared_cache import get_shared_cache
+    get_chat_service()
+    get_resume_cache()
+    return get_shared_cache().backend
+
+
+def _libraries():
+    # Deferred at import time to keep startup fast; loaded here so the first
+    # request doesn't pay for them (and, under preload, shared by every worker)
+    import pandas  # noqa: F401
+    import snowflake.connector  # noqa: F401
+    from backend.services import course_service  # noqa: F401
+
+
+def _prerequisite_graph():
+    from backend.services.prerequisite_graph import get_prerequisite_graph
+    get_prerequisite_graph()
+
+
+def _skill_matcher():
+    from backend.services.skill_normalizer import get_skill_normalizer
+    get_skill_normalizer()
+
+
+def _course_index():
+    from backend.services.course_index import get_course_index
+    return f"{len(get_course_index().courses)} courses"
+
+
+def _resumes_schema():
+    from backend.services.resume_cache import migrate_resumes_table
+    migrate_resumes_table()
+
+
+def _role_fit_matrix():
+    from backend.services.role_fit import get_role_fit_matrix
+    get_role_fit_matrix()
+
+
+def _role_skills():
+    from backend.services.learning_path_materializer import get_materialized_plans
+    from backend.services.skill_service import cache_role_skills, get_top_skills_for_role
+
+    seeded = set()
+    for (role, _), plan in get_materialized_plans().items():
+        if role not in seeded and plan.get("skills"):
+            cache_role_skills(role, plan["skills"])
+            seeded.add(role)
+    for role in WARMUP_ROLES:
+        get_top_skills_for_role(role)
+    return f"{len(seeded)} roles from materialized plans, {len(WARMUP_ROLES)} from WARMUP_ROLES"
+
+
+def warmup_steps() -> List[Tuple[str, Callable]]:
+    steps = [("services", _services), ("prerequisite_graph", _prerequisite_graph)]
+    if WARMUP_ENABLED:
+        steps += [
+            ("libraries", _libraries),
+            ("resumes_schema", _resumes_schema),
+            ("skill_matcher", _skill_matcher),
+            ("course_index", _course_index),
+            ("role_fit_matrix", _role_fit_matrix),
+            ("role_skills", _role_skills),
+        ]
+    return steps
+
+
+def run_warmup() -> Dict:
+    """
+    Run the warmup steps once per process and mark the worker ready.
+
+    Returns:
+        dict: Readiness state (see readiness())
+    """
+    with _lock:
+        # A worker forked from a warmed-up master inherits everything it loaded
+        if _state["ready"]:
+            return readiness()
+        started = time.perf_counter()
+        for name, step in warmup_steps():
+            step_started = time.perf_counter()
+            try:
+                detail = step()
+                _state["steps"][name] = {"ok": True, "seconds": round(time.perf_counter() - step_started, 3)}
+                if detail:
+                    _state["steps"][name]["detail"] = detail
+            except Exception as e:
+                logger.warning(f"Warmup step {name} failed, loading lazily instead: {e}")
+                _state["steps"][name] = {"ok": False, "seconds": round(time.perf_counter() - step_started, 3),
+                                         "error": str(e)}
+        _state["seconds"] = round(time.perf_counter() - started, 3)
+        _state["pid"] = os.getpid()
+        _state["ready"] = True
+        failed = [name for name, result in _state["steps"].items() if not result["ok"]]
+        logger.info(f"Warmup finished in {_state['seconds']:.2f}s" + (f", failed: {', '.join(failed)}" if failed else ""))
+    return readiness()
+
+
+def readiness() -> Dict:
+    """Readiness of this worker: ready flag, failed steps and per-step timings."""
+    return {
+        "ready": _state["ready"],
+        "pid": os.getpid(),
+        "warmed_in_pid": _state["pid"],
+        "seconds": _state["seconds"],
+        "degraded": [name for name, result in _state["steps"].items() if not result["ok"]],
+        "steps": dict(_state["steps"]),
+    }
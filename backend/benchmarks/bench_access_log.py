@@ -0,0 +1,151 @@
+# File: backend/benchmarks/bench_access_log.py
+"""
+API throughput with the previous request logging and with the access log middleware.
+
+Both apps serve the same two endpoints (a GET and a JSON POST of --body-kb)
+under the server's logging setup: root logger at DEBUG with a console and a
+rotating file handler (both pointed at a temporary directory here). The
+previous log_requests middleware buffered and decoded every POST body and
+logged six DEBUG lines per request on the request thread; AccessLogMiddleware
+enqueues one sampled record for a background thread. Requests are driven
+in-process through httpx's ASGI transport with --concurrency in flight.
+Run from the project root:
+
+    python -m backend.benchmarks.bench_access_log --requests 3000
+"""
+import argparse
+import asyncio
+import logging
+import logging.handlers
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+from backend.api.access_log import AccessLogMiddleware, configure_access_logger
+
+logger = logging.getLogger("bench.access")
+
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.json()
+        return {"items": len(body["items"])}
+
+    return app
+
+
+def legacy_app():
+    app = make_app()
+
+    @app.middleware("http")
+    async def log_requests(request, call_next):
+        """The previous middleware from backend/api/main.py."""
+        start_time = time.time()
+        logger.debug(f"Request: {request.method} {request.url}")
+        logger.debug(f"Headers: {request.headers}")
+        if request.method in ["POST", "PUT"] and not request.headers.get("content-type", "").startswith("multipart/"):
+            try:
+                body = await request.body()
+                logger.debug(f"Request body: {body.decode()}")
+                request._body = body
+            except Exception as e:
+                logger.error(f"Failed to log request body: {e}")
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.debug(f"Response status: {response.status_code}")
+        logger.debug(f"Response time: {process_time:.3f}s")
+        return response
+
+    return app
+
+
+def access_log_app(sample_rate):
+    app = make_app()
+    app.add_middleware(AccessLogMiddleware, sample_rate=sample_rate, route_rates=[])
+    return app
+
+
+def server_logging(directory):
+    """The root logging setup of backend/api/main.py, writing into directory."""
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(pathname)s:%(lineno)d - %(message)s")
+    console = logging.StreamHandler(open(os.path.join(directory, "console.log"), "w"))
+    rotating = logging.handlers.RotatingFileHandler(os.path.join(directory, "api_server.log"),
+                                                    maxBytes=1048576, backupCount=3)
+    root = logging.getLogger()
+    for handler in (console, rotating):
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+
+
+async def drive(app, total, concurrency, payload):
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(total))
+
+        async def worker():
+            for i in counter:
+                start = time.perf_counter()
+                if i % 2:
+                    response = await client.post("/echo", json=payload)
+                else:
+                    response = await client.get("/ping")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return total / elapsed, latencies
+
+
+def report(label, rate, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"  {label:<32}{rate:>9.0f} req/s   p50 {statistics.median(latencies) * 1000:6.2f} ms"
+          f"   p99 {p99 * 1000:6.2f} ms")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request logging overhead")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--body-kb", type=int, default=16, help="Size of the JSON POST body")
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="Access log sampling for the second run")
+    args = parser.parse_args()
+
+    payload = {"items": ["x" * 100] * (args.body_kb * 1024 // 104)}
+    with tempfile.TemporaryDirectory() as directory:
+        server_logging(directory)
+        configure_access_logger(os.path.join(directory, "access.log"))
+        print(f"{args.requests} requests, {args.concurrency} in flight, half POSTs of {args.body_kb} KB")
+        runs = [
+            ("log_requests (previous)", legacy_app()),
+            ("access log, every request", access_log_app(1.0)),
+            (f"access log, {args.sample_rate:.0%} sampled", access_log_app(args.sample_rate)),
+        ]
+        rates = []
+        for label, app in runs:
+            asyncio.run(drive(app, 200, args.concurrency, payload))  # warm up
+            rate, latencies = asyncio.run(drive(app, args.requests, args.concurrency, payload))
+            rates.append(report(label, rate, latencies))
+        print(f"  throughput gain: {rates[1] / rates[0]:.1f}x (every request), {rates[2] / rates[0]:.1f}x (sampled)")
+        logging.getLogger().handlers.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# File: backend/benchmarks/bench_admission.py
+"""
+Latency under a burst of LLM calls, with and without admission control.
+
+--clients threads each send --requests calls to a stand-in warehouse that
+serves --capacity statements at the speed of --llm-ms and slows down in
+proportion beyond that (queued warehouse work). Without admission control
+every call goes straight to the warehouse; with it, calls go through the
+"complete" ConcurrencyLimiter (--concurrency slots, --queue waiters) and
+the rest are rejected with a Retry-After. Reported: latency percentiles of
+the calls that were served, and how many were rejected. Run from the
+project root:
+
+    python -m backend.benchmarks.bench_admission --clients 48 --requests 5
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Warehouse:
+    """Runs capacity statements at full speed; more at once share it."""
+
+    def __init__(self, capacity, llm_s):
+        self.capacity = capacity
+        self.llm_s = llm_s
+        self.running = 0
+        self.lock = threading.Lock()
+
+    def complete(self):
+        with self.lock:
+            self.running += 1
+        try:
+            # Sampled on entry: a crude model of a saturated warehouse
+            time.sleep(self.llm_s * max(1.0, self.running / self.capacity))
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def run(call, args):
+    latencies, rejected = [], 0
+    lock = threading.Lock()
+
+    def client(_):
+        nonlocal rejected
+        from backend.services.admission import AdmissionRejected
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            try:
+                call()
+            except AdmissionRejected:
+                with lock:
+                    rejected += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        list(executor.map(client, range(args.clients)))
+    return latencies, rejected, time.perf_counter() - start
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark admission control under a burst")
+    parser.add_argument("--clients", type=int, default=48, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=5, help="Calls per client")
+    parser.add_argument("--capacity", type=int, default=4, help="Statements the warehouse runs at full speed")
+    parser.add_argument("--llm-ms", type=float, default=100, help="COMPLETE call time at full speed")
+    parser.add_argument("--concurrency", type=int, default=4, help="Limiter slots")
+    parser.add_argument("--queue", type=int, default=16, help="Limiter waiters")
+    args = parser.parse_args()
+
+    from backend.services.admission import ConcurrencyLimiter
+
+    warehouse = Warehouse(args.capacity, args.llm_ms / 1000)
+    limiter = ConcurrencyLimiter("complete", args.concurrency, args.queue, timeout=30)
+    print(f"{args.clients} clients x {args.requests} calls, warehouse capacity {args.capacity}, "
+          f"LLM {args.llm_ms:.0f} ms")
+    for label, call in (("unbounded", warehouse.complete),
+                        (f"limiter {args.concurrency}+{args.queue}", lambda: limiter.call(warehouse.complete))):
+        latencies, rejected, elapsed = run(call, args)
+        print(f"  {label:<14} p50 {percentile(latencies, 0.5) * 1000:7.0f} ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.0f} ms  "
+              f"served {len(latencies):4d}  rejected {rejected:4d}  ({elapsed:.1f}s)")
+    stats = limiter.stats()
+    print(f"  limiter: max queue depth {stats['max_queue_depth']}, avg wait {stats['avg_wait_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# File: backend/benchmarks/bench_chat_concurrency.py
+"""
+Concurrent career questions on the shared ChatService.
+
+--users threads each ask --questions questions with their own chat history,
+as the API threadpool would. Snowflake is replaced by a stand-in that takes
+--connect-ms to open a connection and --llm-ms per COMPLETE call and answers
+with the prompt it was sent, so every answer can be checked for another
+user's history. Compared:
+
+    per request    a new ChatService and connection per question (the old routes)
+    shared, old    one instance that stores the history on the class attribute
+    shared, pooled the current service on a connection pool of --pool-size
+
+Run from the project root:
+
+    python -m backend.benchmarks.bench_chat_concurrency --users 16 --questions 5
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FakeConnection:
+    """Stand-in for a Snowflake connection; COMPLETE answers with its prompt."""
+
+    def __init__(self, connect_s, llm_s):
+        time.sleep(connect_s)
+        self.llm_s = llm_s
+
+    def cursor(self):
+        llm_s = self.llm_s
+
+        class Cursor:
+            result = None
+
+            def execute(self, query, params=None, timeout=None):
+                time.sleep(llm_s if timeout is None else min(llm_s, timeout))
+                self.result = query
+
+            def fetchone(self):
+                return (self.result,)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        pass
+
+
+def make_services(args):
+    from backend.database import SnowflakeConnectionPool
+    from backend.services.chat_service import ChatService
+
+    def connect():
+        return FakeConnection(args.connect_ms / 1000, args.llm_ms / 1000)
+
+    class LegacyChatService(ChatService):
+        # The history used to be assigned to the (shared) instance before building the prompt
+        CONVERSATION_HISTORY = []
+
+        def answer_career_question(self, question, user_context=None):
+            self.CONVERSATION_HISTORY = user_context.get('chat_history', [])
+            time.sleep(0.001)  # the prompt was built after other work on the request thread
+            return self.get_llm_response(self._build_prompt(question, self.CONVERSATION_HISTORY))
+
+    unbounded = SnowflakeConnectionPool(size=1000, connect=connect)
+    legacy_shared = LegacyChatService(pool=unbounded)
+
+    def per_request(question, context):
+        # A fresh service whose connection is opened for this question alone
+        return ChatService(pool=SnowflakeConnectionPool(size=1, connect=connect)).answer_career_question(
+            question, context)
+
+    pooled = ChatService(pool=SnowflakeConnectionPool(size=args.pool_size, connect=connect))
+    return {
+        "per request": per_request,
+        "shared, old": legacy_shared.answer_career_question,
+        "shared, pooled": pooled.answer_career_question,
+    }, pooled.pool
+
+
+def run(handler, args):
+    leaks = 0
+    lock = threading.Lock()
+
+    def user(index):
+        nonlocal leaks
+        context = {"chat_history": [{"role": "user", "content": f"<history-of-user-{index}>"}]}
+        for _ in range(args.questions):
+            _, answer = handler(f"question from user {index}", context)
+            others = [i for i in range(args.users) if i != index and f"<history-of-user-{i}>" in answer]
+            if others or f"<history-of-user-{index}>" not in answer:
+                with lock:
+                    leaks += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        list(executor.map(user, range(args.users)))
+    return time.perf_counter() - start, leaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent questions on the shared ChatService")
+    parser.add_argument("--users", type=int, default=16, help="Concurrent users (threads)")
+    parser.add_argument("--questions", type=int, default=5, help="Questions per user")
+    parser.add_argument("--pool-size", type=int, default=8, help="Connections in the pool")
+    parser.add_argument("--connect-ms", type=float, default=250, help="Stand-in Snowflake connect time")
+    parser.add_argument("--llm-ms", type=float, default=50, help="Stand-in COMPLETE call time")
+    args = parser.parse_args()
+
+    handlers, pool = make_services(args)
+    total = args.users * args.questions
+    print(f"{args.users} users x {args.questions} questions (connect {args.connect_ms:.0f} ms, "
+          f"LLM {args.llm_ms:.0f} ms, pool size {args.pool_size})")
+    for label, handler in handlers.items():
+        elapsed, leaks = run(handler, args)
+        print(f"  {label:<16}{elapsed:7.2f}s  {total / elapsed:7.1f} questions/s  "
+              f"{leaks:4d} answers with the wrong history")
+    print(f"  pool: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
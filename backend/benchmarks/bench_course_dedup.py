@@ -0,0 +1,84 @@
+# File: backend/benchmarks/bench_course_dedup.py
+"""
+Speed and correctness of near-duplicate course clustering.
+
+Builds a synthetic catalog of --courses distinct English courses, re-lists
+--duplicates of them as new editions ("... 2024 Edition", same description),
+and adds courses whose titles are in Japanese, Russian, Arabic, Hindi and
+Greek plus courses with no words at all. Reported: clustering time, how many
+edition duplicates were merged with their original, and how many distinct
+non-Latin or empty courses were wrongly merged with anything. The run fails
+if any were. Run from the project root:
+
+    python -m backend.benchmarks.bench_course_dedup --courses 20000
+"""
+import argparse
+import random
+import sys
+import time
+
+NON_LATIN_TITLES = [
+    "データサイエンス入門", "機械学習の基礎", "クラウドコンピューティング実践",
+    "Введение в машинное обучение", "Основы анализа данных", "Программирование на Python",
+    "مقدمة في علم البيانات", "أساسيات التعلم الآلي", "تطوير تطبيقات الويب",
+    "डेटा विज्ञान का परिचय", "मशीन लर्निंग की बुनियाद",
+    "Εισαγωγή στην επιστήμη δεδομένων", "Βασικές αρχές μηχανικής μάθησης",
+]
+EMPTY_TITLES = ["", "!!!", "--", "***"]
+
+
+def make_catalog(args):
+    rng = random.Random(args.seed)
+    words = [f"w{i}" for i in range(5000)]
+    rows = []
+    for i in range(args.courses):
+        rows.append({
+            "COURSE_NAME": " ".join(rng.sample(words, 5)),
+            "DESCRIPTION": " ".join(rng.sample(words, 40)),
+            "URL": f"https://courses.example/{i}",
+            "RATING": rng.uniform(3, 5),
+        })
+    duplicates = []
+    for i in rng.sample(range(args.courses), args.duplicates):
+        original = rows[i]
+        duplicates.append((original["URL"], f"{original['URL']}-2024"))
+        rows.append({**original, "COURSE_NAME": f"{original['COURSE_NAME']} 2024 Edition",
+                     "URL": f"{original['URL']}-2024"})
+    distinct = []
+    for j, title in enumerate(NON_LATIN_TITLES + EMPTY_TITLES):
+        url = f"https://courses.example/intl/{j}"
+        distinct.append(url)
+        rows.append({"COURSE_NAME": title, "DESCRIPTION": "", "URL": url, "RATING": 4.0})
+    rng.shuffle(rows)
+    return rows, duplicates, distinct
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate course clustering")
+    parser.add_argument("--courses", type=int, default=20000, help="Distinct English courses")
+    parser.add_argument("--duplicates", type=int, default=1000, help="Courses re-listed as a new edition")
+    parser.add_argument("--seed", type=int, default=3, help="Random seed")
+    args = parser.parse_args()
+
+    from backend.services.course_dedup import cluster_courses
+
+    rows, duplicates, distinct = make_catalog(args)
+    start = time.perf_counter()
+    assignments = cluster_courses(rows)
+    elapsed = time.perf_counter() - start
+
+    cluster_of = {a["URL"]: a["CLUSTER_ID"] for a in assignments}
+    size_of = {a["URL"]: a["CLUSTER_SIZE"] for a in assignments}
+    merged = sum(1 for original, edition in duplicates if cluster_of[original] == cluster_of[edition])
+    false_merges = [url for url in distinct if size_of[url] != 1]
+    clusters = sum(1 for a in assignments if a["IS_CANONICAL"])
+
+    print(f"{len(rows)} courses clustered in {elapsed:.2f}s ({clusters} clusters)")
+    print(f"  edition duplicates merged      {merged}/{len(duplicates)}")
+    print(f"  non-Latin/empty wrongly merged {len(false_merges)}/{len(distinct)}")
+    if false_merges:
+        sys.exit(f"Distinct courses were merged: {false_merges}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# File: backend/benchmarks/bench_deadlines.py
+"""
+Time to an answer when Cortex COMPLETE hangs, with and without a deadline.
+
+A stand-in warehouse takes --llm-ms on every COMPLETE call and then fails,
+as a stalled model would, so ChatService.get_llm_response walks its whole
+fallback chain of three models. Without a deadline each call runs to the
+end; with a request deadline of --deadline seconds the statements are
+cancelled at the budget and no model is tried once less than
+--min-budget seconds are left, so the caller gets its fallback in time.
+Run from the project root:
+
+    python -m backend.benchmarks.bench_deadlines --llm-ms 2000 --deadline 3
+"""
+import argparse
+import os
+import time
+
+
+class StalledConnection:
+    """Stand-in for a Snowflake connection whose COMPLETE calls stall and fail."""
+
+    def __init__(self, llm_s):
+        self.llm_s = llm_s
+        self.statements = 0
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def execute(self, query, params=None, timeout=None):
+                connection.statements += 1
+                if timeout is not None and timeout < connection.llm_s:
+                    time.sleep(timeout)
+                    raise TimeoutError("Statement reached its statement or warehouse timeout")
+                time.sleep(connection.llm_s)
+                raise RuntimeError("Model overloaded")
+
+            def fetchone(self):
+                return None
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request deadlines against a stalled LLM")
+    parser.add_argument("--llm-ms", type=float, default=2000, help="Time a COMPLETE call stalls before failing")
+    parser.add_argument("--deadline", type=float, default=3, help="Request deadline in seconds")
+    parser.add_argument("--min-budget", type=float, default=1, help="Seconds an LLM attempt needs to start")
+    args = parser.parse_args()
+
+    # Read by backend.services.deadline at import
+    os.environ["LLM_MIN_BUDGET"] = str(args.min_budget)
+
+    from backend.database import SnowflakeConnectionPool
+    from backend.services import deadline
+    from backend.services.chat_service import ChatService
+
+    print(f"COMPLETE stalls {args.llm_ms:.0f} ms then fails; 3 models in the fallback chain")
+    for label, seconds in (("no deadline", None), (f"deadline {args.deadline:g}s", args.deadline)):
+        connection = StalledConnection(args.llm_ms / 1000)
+        service = ChatService(pool=SnowflakeConnectionPool(size=1, connect=lambda: connection))
+        token = deadline.start(seconds) if seconds else None
+        start = time.perf_counter()
+        try:
+            flag, _ = service.get_llm_response("What should I learn next?")
+            reasons = deadline.degraded_reasons()
+        finally:
+            if token:
+                deadline.reset(token)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<14} answered in {elapsed:5.2f}s  statements {connection.statements}  "
+              f"llm ok {flag}  degraded {','.join(reasons) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
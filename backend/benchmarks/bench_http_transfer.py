@@ -0,0 +1,85 @@
+# File: backend/benchmarks/bench_http_transfer.py
+"""
+Bytes on the wire and server CPU per Streamlit rerun for the heavy endpoints.
+
+Serves the course list, transition plan and recent chat history payloads
+(sized as in bench_json_responses) from an in-process FastAPI app with the
+API's GZipMiddleware and conditional_response(), and requests each one three
+ways: uncompressed, gzip, and gzip revalidated with If-None-Match (the
+frontend's api_client on a rerun). Run from the project root:
+
+    python -m backend.benchmarks.bench_http_transfer --requests 300
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.gzip import GZipMiddleware
+
+from backend.api.responses import conditional_response
+from backend.benchmarks.bench_json_responses import make_courses, make_plan, text
+
+
+def make_app(courses, plan, chats, minimum_size, level):
+    app = FastAPI()
+
+    @app.post("/courses")
+    def role_courses(request: Request):
+        return conditional_response(request, courses)
+
+    @app.post("/transition-plan")
+    def transition_plan(request: Request):
+        return conditional_response(request, {"success": True, "has_valid_courses": True, "message": "ok", **plan})
+
+    @app.get("/chat-history/recent")
+    def recent_chats(request: Request):
+        return conditional_response(request, chats)
+
+    app.add_middleware(GZipMiddleware, minimum_size=minimum_size, compresslevel=level)
+    return app
+
+
+async def measure(app, method, path, total, encoding, revalidate):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {"Accept-Encoding": encoding}
+        first = await client.request(method, path, headers=headers)
+        if revalidate:
+            headers["If-None-Match"] = first.headers["ETag"]
+        downloaded = 0
+        start = time.process_time()
+        for _ in range(total):
+            response = await client.request(method, path, headers=headers)
+            downloaded += response.num_bytes_downloaded
+        return downloaded / total, (time.process_time() - start) / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compression and conditional requests")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--courses", type=int, default=60)
+    parser.add_argument("--plan-kb", type=int, default=120)
+    parser.add_argument("--minimum-size", type=int, default=1024)
+    parser.add_argument("--level", type=int, default=1, help="gzip compression level")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    chats = [{"user_name": "bench", "state_data": text(rng, 20000), "cur_timestamp": "2025-01-01 10:00:00",
+              "source_page": "career_transition", "role": "Data Scientist"} for _ in range(5)]
+    app = make_app(make_courses(rng, args.courses), make_plan(rng, args.plan_kb), chats,
+                   args.minimum_size, args.level)
+    modes = (("identity", "identity", False), ("gzip", "gzip", False), ("gzip + 304", "gzip", True))
+    print(f"{args.requests} requests per mode, gzip level {args.level}")
+    for method, path in (("POST", "/courses"), ("POST", "/transition-plan"), ("GET", "/chat-history/recent")):
+        cells = []
+        for label, encoding, revalidate in modes:
+            size, cpu = asyncio.run(measure(app, method, path, args.requests, encoding, revalidate))
+            cells.append(f"{label} {size / 1024:7.1f} KB {cpu * 1e3:5.2f} ms")
+        print(f"  {path:<22}" + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# File: backend/benchmarks/bench_json_responses.py
+"""
+Per-request CPU of the course and transition plan responses, before and after FastJSONResponse.
+
+Payloads are sized like production responses: --courses courses with
+descriptions of about 1 KB, and a transition plan whose four markdown
+sections total --plan-kb. Each endpoint is served twice from in-process
+FastAPI apps: once returning response_model instances / plain lists (Pydantic
+validation, jsonable_encoder, stdlib json), once returning FastJSONResponse.
+CPU time is measured with time.process_time over --requests requests driven
+through httpx's ASGI transport. Run from the project root:
+
+    python -m backend.benchmarks.bench_json_responses --requests 500
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+from backend.api.responses import FastJSONResponse, project, orjson
+from backend.api.routes.recommendations import Course
+from backend.api.routes.user_input import CareerCoursesResponse, TransitionPlanResponse
+
+WORDS = ("python data pipeline model cloud course skill learn build analysis project team "
+         "system design deploy query warehouse spark machine learning engineer").split()
+
+
+def text(rng, chars):
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def make_courses(rng, count):
+    return [{
+        "COURSE_NAME": text(rng, 60).title(),
+        "DESCRIPTION": text(rng, 1000),
+        "SKILLS": ", ".join(rng.sample(WORDS, 6)),
+        "URL": f"https://example.com/course/{i}",
+        "LEVEL": rng.choice(["Beginner", "Intermediate", "Advanced"]),
+        "PLATFORM": rng.choice(["Udemy", "edX", "Udacity"]),
+        "LEVEL_CATEGORY": rng.choice(["BEGINNER", "INTERMEDIATE", "ADVANCED"]),
+        "PLAN_ORDER": i + 1,
+        "PLAN_STAGE": i % 3,
+        "CLUSTER_ID": None,
+    } for i in range(count)]
+
+
+def make_plan(rng, kb):
+    section = kb * 1024 // 4
+    return {name: "\n".join(f"- **{text(rng, 20)}** {text(rng, 100)}" for _ in range(section // 130))
+            for name in ("introduction", "skill_assessment", "course_recommendations", "career_advice")}
+
+
+def pydantic_app(courses, plan):
+    app = FastAPI()
+
+    @app.post("/courses", response_model=List[Course])
+    def role_courses():
+        return courses
+
+    @app.post("/career-courses", response_model=CareerCoursesResponse)
+    def career_courses():
+        return CareerCoursesResponse(success=True, courses=courses, count=len(courses), message="ok")
+
+    @app.post("/transition-plan", response_model=TransitionPlanResponse)
+    def transition_plan():
+        return TransitionPlanResponse(success=True, has_valid_courses=True, message="ok", **plan)
+
+    return app
+
+
+def fast_app(courses, plan):
+    app = FastAPI()
+
+    @app.post("/courses", response_model=List[Course])
+    def role_courses():
+        return FastJSONResponse(project(courses, Course))
+
+    @app.post("/career-courses", response_model=CareerCoursesResponse)
+    def career_courses():
+        return FastJSONResponse({"success": True, "courses": courses, "count": len(courses), "message": "ok"})
+
+    @app.post("/transition-plan", response_model=TransitionPlanResponse)
+    def transition_plan():
+        return FastJSONResponse({"success": True, "has_valid_courses": True, "message": "ok", **plan})
+
+    return app
+
+
+async def cpu_per_request(app, path, total):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(20):  # warm up
+            await client.post(path)
+        size = len((await client.post(path)).content)
+        start = time.process_time()
+        for _ in range(total):
+            response = await client.post(path)
+            response.raise_for_status()
+        return (time.process_time() - start) / total, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON response serialization")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--courses", type=int, default=60, help="Courses per response")
+    parser.add_argument("--plan-kb", type=int, default=120, help="Size of the transition plan markdown")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    courses = make_courses(rng, args.courses)
+    plan = make_plan(rng, args.plan_kb)
+    before, after = pydantic_app(courses, plan), fast_app(courses, plan)
+    print(f"Encoder: {'orjson' if orjson else 'stdlib json (orjson not installed)'}; {args.requests} requests each")
+    print(f"  {'endpoint':<22}{'size':>9}  {'before':>10}  {'after':>10}  {'speedup':>7}")
+    for path in ("/courses", "/career-courses", "/transition-plan"):
+        old, size = asyncio.run(cpu_per_request(before, path, args.requests))
+        new, _ = asyncio.run(cpu_per_request(after, path, args.requests))
+        print(f"  {path:<22}{size / 1024:>6.0f} KB  {old * 1e3:>7.2f} ms  {new * 1e3:>7.2f} ms  {old / new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# File: backend/benchmarks/bench_resume_extraction.py
+"""
+Compare pooled, page-parallel resume extraction with the previous inline parser.
+
+Without --corpus a synthetic set of PDF and DOCX resumes is generated (text
+PDFs of 1-2, 5 and 30 pages plus a DOCX). Point --corpus at a directory of
+real resumes to benchmark those instead. Run from the project root:
+
+    python -m backend.benchmarks.bench_resume_extraction
+    python -m backend.benchmarks.bench_resume_extraction --corpus ~/resumes --repeat 3
+"""
+import argparse
+import os
+import random
+import time
+import zipfile
+from io import BytesIO
+
+from backend.services import resume_parser
+
+WORDS = (
+    "python sql spark airflow docker kubernetes aws azure data pipelines models dashboards "
+    "stakeholders designed built led improved reduced latency migrated warehouse analytics "
+    "machine learning tableau react java testing reliability mentoring roadmap"
+).split()
+
+
+def _line(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_pdf(pages, rng, lines_per_page=45):
+    """A text PDF with Helvetica lines on every page, written without a PDF library."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(pages):
+        stream = "BT /F1 10 Tf 50 760 Td 13 TL " + " ".join(
+            f"({_line(rng)}) Tj T*" for _ in range(lines_per_page)
+        ) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(paragraphs, rng):
+    """A minimal DOCX with one run per paragraph."""
+    body = "".join(f"<w:p><w:r><w:t>{_line(rng)}</w:t></w:r></w:p>" for _ in range(paragraphs))
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    out = BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            "</Types>"
+        ))
+        archive.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>'
+        ))
+        archive.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+def synthetic_corpus(rng):
+    return [
+        ("resume_1p.pdf", make_pdf(1, rng)),
+        ("resume_2p.pdf", make_pdf(2, rng)),
+        ("resume_5p.pdf", make_pdf(5, rng)),
+        ("portfolio_30p.pdf", make_pdf(30, rng)),
+        ("resume.docx", make_docx(80, rng)),
+    ]
+
+
+def load_corpus(directory):
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(resume_parser.SUPPORTED_EXTENSIONS):
+            with open(os.path.join(directory, name), "rb") as handle:
+                corpus.append((name, handle.read()))
+    return corpus
+
+
+def legacy_extract(content, filename):
+    """The previous implementation: inline, two extract_text() calls per page."""
+    import docx2txt
+    import pdfplumber
+
+    file_obj = BytesIO(content)
+    if filename.endswith(".pdf"):
+        with pdfplumber.open(file_obj) as pdf:
+            return "\n".join([page.extract_text() for page in pdf.pages if page.extract_text()])
+    elif filename.endswith(".docx"):
+        return docx2txt.process(file_obj)
+    return ""
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume text extraction")
+    parser.add_argument("--corpus", help="Directory of PDF/DOCX resumes (default: synthetic)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(random.Random(args.seed))
+
+    # Start the pool outside the timings; workers are long-lived in the API
+    started = time.perf_counter()
+    resume_parser.extract_resume(corpus[0][1], corpus[0][0])
+    print(f"Pool of {resume_parser.WORKERS} workers warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    pooled_s = {}
+    print(f"\n{'file':<22}{'KB':>8}{'pages':>7}{'legacy ms':>11}{'pooled ms':>11}{'speedup':>9}  same text")
+    for name, content in corpus:
+        old_s, old_text = timed(lambda: legacy_extract(content, name), args.repeat)
+        new_s, result = timed(lambda: resume_parser.extract_resume(content, name, timeout=120), args.repeat)
+        pooled_s[name] = new_s
+        print(f"{name:<22}{len(content) / 1024:>8.1f}{result['pages']:>7}{old_s * 1000:>11.1f}"
+              f"{new_s * 1000:>11.1f}{old_s / new_s:>8.1f}x  {(old_text or '') == result['text']}")
+
+    # Partial text on timeout: half the time the longest file needs
+    name, content = max(corpus, key=lambda item: len(item[1]))
+    deadline = pooled_s[name] / 2
+    result = resume_parser.extract_resume(content, name, timeout=deadline)
+    print(f"\nWith a {deadline * 1000:.0f} ms deadline, {name}: timed_out={result['timed_out']}, "
+          f"{result['pages_extracted']}/{result['pages']} pages, {len(result['text']):,} chars")
+    resume_parser.shutdown_extraction_pool()
+
+
+if __name__ == "__main__":
+    main()
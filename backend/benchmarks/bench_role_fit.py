@@ -0,0 +1,100 @@
+# File: backend/benchmarks/bench_role_fit.py
+"""
+Latency of scoring a user's skills against every role in the role fit matrix.
+
+Synthetic job postings are generated for --roles titles, each drawing skills
+from its own pool plus a shared pool of common skills, and the matrix is
+built with build_role_fit_matrix. Vectorized scoring is compared with a
+per-role loop computing the same fit and missing skills in Python, which is
+the cost floor of scoring roles one at a time (before any LLM call).
+Run from the project root:
+
+    python -m backend.benchmarks.bench_role_fit --roles 500
+"""
+import argparse
+import random
+import statistics
+import time
+
+from backend.services.role_fit import HAVE_THRESHOLD, build_role_fit_matrix
+from backend.services.skill_normalizer import get_skill_normalizer
+
+
+def make_postings(roles, postings_per_role, vocabulary, rng):
+    common = [f"Common Skill {i}" for i in range(30)]
+    skills = [f"Skill {i}" for i in range(vocabulary)]
+    rows = []
+    for r in range(roles):
+        pool = rng.sample(skills, 60)
+        for _ in range(postings_per_role):
+            hard = rng.sample(pool, rng.randint(5, 15))
+            soft = rng.sample(common, 3)
+            rows.append({"TITLE_REPORTED": f"Role {r}", "HARD_SKILLS": ", ".join(hard),
+                         "SOFT_SKILLS": ", ".join(soft)})
+    return rows
+
+
+def loop_score(matrix, skills, limit=10, missing_limit=5):
+    """The same scores computed role by role."""
+    normalizer = get_skill_normalizer()
+    have = normalizer.ids(skills)
+    scored = []
+    for row, role in enumerate(matrix.roles):
+        begin, end = int(matrix.indptr[row]), int(matrix.indptr[row + 1])
+        total = matched = 0.0
+        hits, missing = 0, []
+        for k in range(begin, end):
+            name = matrix.skills[int(matrix.indices[k])]
+            weight = float(matrix.weights[k])
+            total += weight
+            if normalizer.skill_id(name) in have:
+                matched += weight
+                hits += 1
+            elif len(missing) < missing_limit:
+                missing.append(name)
+        scored.append((matched / total if total else 0.0, hits / max(end - begin, 1), role, missing))
+    scored.sort(key=lambda x: (-x[0], -x[1]))
+    return scored[:limit]
+
+
+def timed(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized role fit scoring")
+    parser.add_argument("--roles", type=int, default=500, help="Number of roles")
+    parser.add_argument("--postings", type=int, default=40, help="Postings per role")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Distinct skills")
+    parser.add_argument("--user-skills", type=int, default=25, help="Skills on the user's resume")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = make_postings(args.roles, args.postings, args.vocabulary, rng)
+    start = time.perf_counter()
+    matrix = build_role_fit_matrix(rows, min_postings=1)
+    print(f"Built {len(matrix)} roles x {len(matrix.skills)} skills ({matrix.nnz} weights) "
+          f"from {len(rows)} postings in {time.perf_counter() - start:.2f} s")
+
+    user = rng.sample(matrix.skills, min(args.user_skills, len(matrix.skills)))
+    vectorized = matrix.score(user, limit=10)
+    looped = loop_score(matrix, user)
+    same = [r["role"] for r in vectorized["roles"]][:3] == [r[2] for r in looped][:3]
+    print(f"Top roles agree: {same} (threshold {HAVE_THRESHOLD})")
+
+    fast = timed(lambda: matrix.score(user, limit=10), args.repeat)
+    slow = timed(lambda: loop_score(matrix, user), max(1, args.repeat // 10))
+    print(f"\n  {'vectorized score':<24}{fast * 1000:>9.2f} ms")
+    print(f"  {'per-role loop':<24}{slow * 1000:>9.2f} ms")
+    print(f"  speedup: {slow / fast:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
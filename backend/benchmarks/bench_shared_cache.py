@@ -0,0 +1,94 @@
+# File: backend/benchmarks/bench_shared_cache.py
+"""
+Shared cache latency and how much repeated work it saves across API workers.
+
+First the get/set latency of the SQLite backend in /dev/shm for a role
+skills list and a resume analysis entry. Then --workers processes each serve
+--requests lookups of resume hashes drawn with repeats from --resumes
+distinct resumes, as requests spread over gunicorn workers would be. A miss
+costs one "analysis" (the count is what matters). The run is repeated with
+per-worker ResumeCache only and with the shared tier behind it. Run from the
+project root:
+
+    python -m backend.benchmarks.bench_shared_cache --workers 4 --requests 2000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+SKILLS = ["Python", "SQL", "Spark", "Airflow", "Docker", "Kubernetes", "AWS", "dbt", "Kafka", "Tableau"]
+
+
+def latency(cache, key, value, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cache.set(key, value)
+    write = (time.perf_counter() - start) / rounds
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cache.get(key)
+    read = (time.perf_counter() - start) / rounds
+    return write, read
+
+
+def worker(shared, seed, requests, resumes, results):
+    from backend.services.resume_cache import ResumeCache
+
+    rng = random.Random(seed)
+    cache = ResumeCache(shared=shared)
+    analyses = 0
+    for _ in range(requests):
+        # Popular resumes are looked up again and again (Zipf-like)
+        resume_hash = f"{int(rng.paretovariate(1.2) * 1000) % resumes:064x}"
+        if cache.get_skills(resume_hash) is None:
+            analyses += 1
+            cache.put_skills(resume_hash, rng.sample(SKILLS, 5), resume_text="x" * 4000)
+    results.put(analyses)
+
+
+def run(shared, args):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(shared, seed, args.requests, args.resumes, results))
+                 for seed in range(args.workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    analyses = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return analyses, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cross-worker shared cache")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000, help="Lookups per worker")
+    parser.add_argument("--resumes", type=int, default=2000, help="Distinct resumes")
+    parser.add_argument("--rounds", type=int, default=5000, help="Rounds of the latency test")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        os.environ["SHARED_CACHE_PATH"] = os.path.join(directory, "cache.sqlite3")
+        from backend.services.shared_cache import SQLiteCache
+
+        cache = SQLiteCache(os.environ["SHARED_CACHE_PATH"])
+        entry = {"text": "x" * 20000, "skills": SKILLS, "skills_mode": "llm", "missing": {}}
+        print(f"SQLite shared cache in {directory}")
+        for label, value in (("role skills (5 names)", SKILLS[:5]), ("resume entry (20 KB)", entry)):
+            write, read = latency(cache, "bench", value, args.rounds)
+            print(f"  {label:<24} set {write * 1e6:7.1f} us   get {read * 1e6:7.1f} us")
+
+        print(f"{args.workers} workers x {args.requests} lookups over {args.resumes} resumes")
+        for shared in (False, True):
+            cache.clear()
+            analyses, elapsed = run(shared, args)
+            label = "per-worker LRU + shared" if shared else "per-worker LRU only"
+            print(f"  {label:<24} {analyses:6d} analyses   ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# File: backend/benchmarks/bench_skill_matcher.py
+"""
+Compare the compiled skill matcher with the previous per-skill regex scan.
+
+Run from the project root:
+
+    python -m backend.benchmarks.bench_skill_matcher
+    python -m backend.benchmarks.bench_skill_matcher --terms 100000 --repeat 3
+"""
+import argparse
+import random
+import re
+import time
+
+from backend.services.skill_taxonomy import DEFAULT_SKILLS, SkillMatcher, default_taxonomy
+
+FILLER = (
+    "Led a cross-functional team delivering data products for enterprise customers. "
+    "Designed APIs and pipelines, improved reliability, mentored junior engineers, "
+    "and worked closely with stakeholders on planning and reporting. "
+)
+
+
+def legacy_extract(text, all_skills):
+    """The previous implementation: one freshly built word-boundary regex per skill."""
+    extracted_skills = []
+    for skill in all_skills:
+        pattern = r'\b' + skill + r'\b'
+        if re.search(pattern, text, re.IGNORECASE):
+            extracted_skills.append(skill)
+    return extracted_skills
+
+
+def make_resume(skills, size_chars, rng):
+    parts = []
+    while sum(len(p) for p in parts) < size_chars:
+        parts.append(FILLER)
+        parts.append(f"Skills: {', '.join(rng.sample(skills, min(6, len(skills))))}. ")
+    return "".join(parts)
+
+
+def synthetic_taxonomy(n_terms, rng):
+    """DEFAULT_SKILLS plus n_terms generated one- to three-word terms."""
+    taxonomy = default_taxonomy()
+    syllables = ["data", "cloud", "net", "graph", "stream", "quant", "lab", "core", "flow", "ops", "ml", "sec"]
+    for i in range(n_terms):
+        words = [rng.choice(syllables) + str(i)] + rng.sample(syllables, rng.randint(0, 2))
+        taxonomy.add(" ".join(words), "Synthetic")
+    return taxonomy
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run_case(name, taxonomy, text, repeat, legacy_repeat):
+    started = time.perf_counter()
+    matcher = SkillMatcher(taxonomy)
+    build_s = time.perf_counter() - started
+
+    # The legacy scan took regex source, so escape terms the way the old dictionary did
+    legacy_skills = [re.escape(skill) for skill in taxonomy.categories]
+    new_s, new_result = timed(lambda: matcher.extract(text), repeat)
+
+    print(f"\n{name}: {len(taxonomy)} skills, {len(text):,} chars")
+    print(f"  compiled matcher: {new_s * 1000:9.3f} ms/call  (built once in {build_s * 1000:.1f} ms)")
+    if not legacy_repeat:
+        print(f"  skills found:     compiled={len(new_result)} (legacy skipped)")
+        return
+    old_s, old_result = timed(lambda: legacy_extract(text, legacy_skills), legacy_repeat)
+    print(f"  legacy regex:     {old_s * 1000:9.3f} ms/call")
+    print(f"  speedup:          {old_s / new_s:9.1f}x")
+    print(f"  skills found:     compiled={len(new_result)} legacy={len(old_result)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction")
+    parser.add_argument("--terms", type=int, default=100000, help="Synthetic taxonomy size for the large case")
+    parser.add_argument("--resume-chars", type=int, default=6000, help="Size of the synthetic resume")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base_skills = [skill for skills in DEFAULT_SKILLS.values() for skill in skills]
+
+    resume = make_resume(base_skills, args.resume_chars, rng)
+    run_case("Resume, default taxonomy", default_taxonomy(), resume, args.repeat, args.repeat)
+
+    large = synthetic_taxonomy(args.terms, rng)
+    large_resume = make_resume(list(large.categories), args.resume_chars, rng)
+    # The legacy scan is far slower here; time it once
+    run_case("Resume, large taxonomy", large, large_resume, args.repeat, 1)
+
+    # 100x a resume: the legacy scan would take minutes, so only the compiled matcher runs
+    long_text = make_resume(list(large.categories), 100 * args.resume_chars, rng)
+    run_case("Long document, large taxonomy", large, long_text, max(1, args.repeat // 10), 0)
+
+
+if __name__ == "__main__":
+    main()
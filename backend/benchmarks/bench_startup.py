@@ -0,0 +1,146 @@
+# File: backend/benchmarks/bench_startup.py
+"""
+API cold start and per-request service construction overhead.
+
+Cold start: --runs fresh interpreters each import backend.api.main, then run
+the application lifespan (warmup) and serve /health/ready. The median times
+are reported, along with the heavy libraries already loaded after the import.
+Warmup steps that need Snowflake fail fast without credentials, so set them
+up to time a real warmup.
+
+Construction: the routes used to build a ChatService per request, which
+opened a Snowflake connection and probed it with SELECT 1 before every LLM
+call. Connections are replaced by a stand-in that takes --connect-ms to open
+and --roundtrip-ms per statement, and the overhead before the LLM statement
+is compared with the shared, lazily connected instance. Run from the
+project root:
+
+    python -m backend.benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY = ("snowflake.connector", "pandas", "boto3", "pdfplumber", "docx2txt", "pypdfium2", "streamlit", "numpy")
+
+COLD_START = """
+import json, sys, time
+started = time.perf_counter()
+import backend.api.main as main
+imported = time.perf_counter()
+# Heavy modules the import alone loaded, before the lifespan imports more
+LOADED = set(sys.modules)
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    status = client.get("/health/ready").status_code
+ready = time.perf_counter()
+print(json.dumps({"import": imported - started, "ready": ready - started, "status": status,
+                  "heavy": [m for m in %r if m in sys.modules and m in LOADED]}))
+"""
+
+
+def cold_start(runs):
+    script = COLD_START % (HEAVY,)
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                env={**os.environ, "LOG_LEVEL": "ERROR", "LOG_DIR": tempfile.gettempdir(),
+                                     "ACCESS_LOG_FILE": os.path.join(tempfile.gettempdir(), "bench_access.log")})
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return results
+
+
+class FakeConnection:
+    """Stand-in for a Snowflake connection with fixed connect and statement latency."""
+
+    def __init__(self, connect_s, roundtrip_s):
+        time.sleep(connect_s)
+        self.roundtrip_s = roundtrip_s
+
+    def cursor(self):
+        roundtrip_s = self.roundtrip_s
+
+        class Cursor:
+            def execute(self, query, params=None, timeout=None):
+                time.sleep(roundtrip_s)
+
+            def fetchone(self):
+                return ("ok",)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        pass
+
+
+def request_overhead(total, connect_s, roundtrip_s):
+    from backend.database import SnowflakeConnectionPool
+    from backend.services.chat_service import ChatService
+
+    def connect():
+        return FakeConnection(connect_s, roundtrip_s)
+
+    def legacy_request():
+        # The previous ChatService: connect in __init__, SELECT 1 before each call
+        conn = connect()
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.close()
+
+    service = ChatService(pool=SnowflakeConnectionPool(connect=connect))
+
+    def shared_request():
+        with service.pool.connection():
+            pass
+
+    timings = {}
+    for label, handler in (("new ChatService per request", legacy_request),
+                           ("shared ChatService", shared_request)):
+        handler()
+        start = time.perf_counter()
+        for _ in range(total):
+            handler()
+        timings[label] = (time.perf_counter() - start) / total
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API cold start and service construction")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to time")
+    parser.add_argument("--requests", type=int, default=20, help="Requests for the construction comparison")
+    parser.add_argument("--connect-ms", type=float, default=250, help="Stand-in Snowflake connect time")
+    parser.add_argument("--roundtrip-ms", type=float, default=40, help="Stand-in statement round trip")
+    args = parser.parse_args()
+
+    results = cold_start(args.runs)
+    print(f"Cold start over {args.runs} runs (median)")
+    print(f"  import backend.api.main      {statistics.median(r['import'] for r in results):.3f}s")
+    print(f"  lifespan done, first request {statistics.median(r['ready'] for r in results):.3f}s"
+          f"  (status {results[0]['status']})")
+    print(f"  heavy modules after import   {', '.join(results[0]['heavy']) or 'none'}")
+
+    print(f"Per-request overhead before the LLM call (connect {args.connect_ms:.0f} ms, "
+          f"round trip {args.roundtrip_ms:.0f} ms)")
+    for label, seconds in request_overhead(args.requests, args.connect_ms / 1000, args.roundtrip_ms / 1000).items():
+        print(f"  {label:<30}{seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
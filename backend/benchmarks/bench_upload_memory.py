@@ -0,0 +1,94 @@
+# File: backend/benchmarks/bench_upload_memory.py
+"""
+Peak Python memory of handling concurrent resume uploads, before and after spooling.
+
+Each upload is a Starlette UploadFile (as the multipart parser hands it to an
+endpoint) holding a synthetic PDF padded to --size-mb. The previous handler
+read the whole file and wrapped it in a BytesIO; the spooled handler copies it
+to a temporary file in 64 KB chunks. Peaks are measured with tracemalloc in
+the API process. Run from the project root:
+
+    python -m backend.benchmarks.bench_upload_memory --uploads 8 --size-mb 8
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import tracemalloc
+from io import BytesIO
+
+from starlette.datastructures import UploadFile
+
+from backend.benchmarks.bench_resume_extraction import make_pdf
+from backend.services import resume_parser
+from backend.services.upload_spool import spool_upload
+
+
+def make_upload(content, name):
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(spool, size=len(content), filename=name)
+
+
+async def legacy_intake(upload):
+    """The previous handling: full read plus a second in-memory file object."""
+    content = await upload.read()
+    file_obj = BytesIO(content)
+    return len(file_obj.getvalue())
+
+
+async def spooled_intake(upload):
+    with await spool_upload(upload, max_bytes=1 << 40) as spooled:
+        return spooled.size
+
+
+def measure(label, coroutine_factory, uploads):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    async def run():
+        return await asyncio.gather(*(coroutine_factory(u) for u in uploads))
+
+    asyncio.run(run())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<34}{peak / 1024 / 1024:>9.2f} MB peak")
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure peak memory of concurrent uploads")
+    parser.add_argument("--uploads", type=int, default=8, help="Concurrent uploads")
+    parser.add_argument("--size-mb", type=float, default=8, help="Size of each upload")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # A real 2-page PDF padded with a trailing comment, like a scanned resume's bulk
+    pdf = make_pdf(2, random.Random(args.seed))
+    content = pdf + b"%" + b"0" * max(0, int(args.size_mb * 1024 * 1024) - len(pdf) - 2) + b"\n"
+    print(f"{args.uploads} concurrent uploads of {len(content) / 1024 / 1024:.1f} MB")
+
+    print("\nIntake (upload -> parser input)")
+    old = measure("read + BytesIO (previous)", legacy_intake,
+                  [make_upload(content, f"r{i}.pdf") for i in range(args.uploads)])
+    new = measure("spool_upload (64 KB chunks)", spooled_intake,
+                  [make_upload(content, f"r{i}.pdf") for i in range(args.uploads)])
+    print(f"  reduction: {old / max(new, 1):.0f}x")
+
+    print("\nExtraction of one upload, API process only")
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as handle:
+        handle.write(content)
+        handle.flush()
+        resume_parser.extract_resume(handle.name, "warmup.pdf")  # start the pool outside the measurement
+        for label, source in (("bytes passed to the pool", content), ("path passed to the pool", handle.name)):
+            tracemalloc.start()
+            resume_parser.extract_resume(source, "resume.pdf", timeout=120)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {label:<34}{peak / 1024 / 1024:>9.2f} MB peak")
+    resume_parser.shutdown_extraction_pool()
+
+
+if __name__ == "__main__":
+    main()
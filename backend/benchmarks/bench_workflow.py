@@ -0,0 +1,87 @@
+# File: backend/benchmarks/bench_workflow.py
+"""
+Career analysis as separate page calls versus one server-side workflow.
+
+The analysis steps are stand-ins that sleep: missing skills (--llm-ms, an LLM
+call), storing the analysis and the course search (--store-ms and
+--search-ms, Snowflake work) and the plan (formatting, ~0 ms). Each step the
+page called on its own also paid --call-ms for the HTTP round trip and a new
+Snowflake connection. Compared, per analysis:
+
+    page calls  missing -> store -> courses -> plan, one call each
+    workflow    run_workflow(): one call, store and courses side by side
+
+Also reported: when the first progress event arrives on the workflow stream.
+Run from the project root:
+
+    python -m backend.benchmarks.bench_workflow --runs 5
+"""
+import argparse
+import asyncio
+import time
+
+
+def make_steps(args):
+    from backend.services.workflow import Step
+
+    def sleeper(ms, value):
+        def step(results):
+            time.sleep(ms / 1000)
+            return value
+        return step
+
+    return [
+        Step("missing_skills", sleeper(args.llm_ms, ["Spark", "Airflow"])),
+        Step("resume_id", sleeper(args.store_ms, "id"), needs=["missing_skills"]),
+        Step("courses", sleeper(args.search_ms, [{"title": "Spark"}]), needs=["missing_skills"]),
+        Step("transition_plan", sleeper(0, {}), needs=["missing_skills", "courses"]),
+    ]
+
+
+def page_calls(args):
+    results = {}
+    for step in make_steps(args):
+        time.sleep(args.call_ms / 1000)
+        results[step.name] = step.fn(results)
+    return results
+
+
+async def workflow(args):
+    from backend.services.workflow import run_workflow
+
+    started = time.perf_counter()
+    first = None
+    await asyncio.sleep(args.call_ms / 1000)
+    async for _ in run_workflow("bench", make_steps(args)):
+        if first is None:
+            first = time.perf_counter() - started
+    return first
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the career analysis workflow")
+    parser.add_argument("--runs", type=int, default=5, help="Analyses per variant")
+    parser.add_argument("--llm-ms", type=float, default=1500, help="Missing skills LLM call")
+    parser.add_argument("--store-ms", type=float, default=400, help="Storing the analysis")
+    parser.add_argument("--search-ms", type=float, default=600, help="Course search")
+    parser.add_argument("--call-ms", type=float, default=150, help="HTTP round trip and Snowflake connect per call")
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        page_calls(args)
+        timings.append(time.perf_counter() - start)
+    print(f"  page calls  {sum(timings) / len(timings) * 1000:7.0f} ms per analysis")
+
+    timings, firsts = [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        firsts.append(asyncio.run(workflow(args)))
+        timings.append(time.perf_counter() - start)
+    print(f"  workflow    {sum(timings) / len(timings) * 1000:7.0f} ms per analysis  "
+          f"(first event after {sum(firsts) / len(firsts) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,21 @@
 import os
-import snowflake.connector
 from dotenv import load_dotenv
 import logging
 import json
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 # Load environment variables
 load_dotenv()
 
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on any statement of a session, in seconds (0 keeps the account default);
+# requests cap their own statements further (backend/services/deadline.py)
+STATEMENT_TIMEOUT = int(os.getenv("SNOWFLAKE_STATEMENT_TIMEOUT", "300"))
+
 def get_snowflake_connection():
     """Establish a connection to Snowflake using .env credentials."""
     try:
@@ -21,6 +28,10 @@ def get_snowflake_connection():
         database = os.getenv("SNOWFLAKE_DATABASE")
         schema = os.getenv("SNOWFLAKE_SCHEMA")
         
+        # Imported on first connection: the connector (and the pandas/boto it pulls in)
+        # takes most of a second to import, which API startup shouldn't pay for
+        import snowflake.connector
+
         # Log connection attempt (without sensitive info)
         logger.info(f"Connecting to Snowflake: account={account}, user={user}, warehouse={warehouse}, database={database}, schema={schema}")
         
@@ -32,6 +43,7 @@ def get_snowflake_connection():
             warehouse=warehouse,
             database=database,
             schema=schema,
+            session_parameters={"STATEMENT_TIMEOUT_IN_SECONDS": STATEMENT_TIMEOUT} if STATEMENT_TIMEOUT else None,
         )
         logger.info("✅ Successfully connected to Snowflake")
         return conn
@@ -39,6 +51,204 @@ def get_snowflake_connection():
         logger.error(f"❌ Error connecting to Snowflake: {e}")
         return None
 
+# Connection pool settings (per API worker process)
+POOL_SIZE = int(os.getenv("SNOWFLAKE_POOL_SIZE", "8"))
+POOL_TIMEOUT = float(os.getenv("SNOWFLAKE_POOL_TIMEOUT", "30"))
+POOL_MAX_IDLE = float(os.getenv("SNOWFLAKE_POOL_MAX_IDLE", "900"))
+
+
+class PoolTimeoutError(Exception):
+    """No pooled connection became free within the pool timeout."""
+
+
+def _is_closed(conn) -> bool:
+    try:
+        return conn.is_closed()
+    except Exception:
+        return True
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class SnowflakeConnectionPool:
+    """
+    Bounded pool of open Snowflake connections for the shared services.
+
+    A connection is checked out by one thread at a time, so a commit or
+    rollback in one request never lands in another's transaction, and no
+    request pays for a connect once the pool is warm. Connections are opened
+    on demand up to size; further callers wait up to timeout for one to be
+    returned. Connections that are closed, or idle longer than max_idle
+    (Snowflake expires idle sessions), are replaced on checkout.
+
+    After a fork the child starts with an empty pool: the inherited
+    connections are the parent's sessions and are dropped without closing.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, connect=None, timeout: float = POOL_TIMEOUT,
+                 max_idle: float = POOL_MAX_IDLE):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._connect = connect or get_snowflake_connection
+        self._reset()
+        _pools.add(self)
+
+    def _reset(self):
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, returned_at), most recently returned last
+        self._open = 0
+        self._created = 0
+        self._reused = 0
+        self._waits = 0
+
+    def acquire(self):
+        """
+        Check out a connection, opening one if the pool has room.
+
+        Returns:
+            Connection: An open Snowflake connection; give it back with release()
+
+        Raises:
+            PoolTimeoutError: If every connection stays checked out for timeout seconds
+            ConnectionError: If a new connection could not be opened
+        """
+        deadline = time.monotonic() + self.timeout
+        stale = []
+        conn = None
+        try:
+            with self._cond:
+                while conn is None:
+                    if self._idle:
+                        candidate, returned_at = self._idle.pop()
+                        if time.monotonic() - returned_at > self.max_idle or _is_closed(candidate):
+                            self._open -= 1
+                            stale.append(candidate)
+                            continue
+                        self._reused += 1
+                        return candidate
+                    if self._open < self.size:
+                        self._open += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(f"No Snowflake connection free after {self.timeout:g}s "
+                                               f"(pool size {self.size})")
+                    self._waits += 1
+                    self._cond.wait(remaining)
+        finally:
+            for candidate in stale:
+                _close_quietly(candidate)
+
+        try:
+            conn = self._connect()
+            if conn is None:
+                raise ConnectionError("Failed to connect to Snowflake")
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return conn
+
+    def release(self, conn):
+        """Return a checked-out connection; a closed one frees its slot instead."""
+        if _is_closed(conn):
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out for the duration of the block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def cursor(self):
+        """
+        Context manager for a cursor on a pooled connection.
+
+        The statements of the block are committed when it exits normally and
+        rolled back when it raises; the connection goes back to the pool either way.
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+            finally:
+                cursor.close()
+
+    def close(self):
+        """Close the idle connections (on shutdown); checked-out ones close on release."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"size": self.size, "open": self._open, "idle": len(self._idle),
+                    "created": self._created, "reused": self._reused, "waits": self._waits}
+
+
+_pools = weakref.WeakSet()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _reset_pools_after_fork():
+    # Runs in the child only: the parent keeps using its sessions, so nothing is closed
+    for pool in list(_pools):
+        pool._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+def get_connection_pool() -> SnowflakeConnectionPool:
+    """Return the process-wide Snowflake connection pool, created on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SnowflakeConnectionPool()
+    return _pool
+
+
+def pooled_cursor():
+    """Cursor on a connection from the shared pool (see SnowflakeConnectionPool.cursor)."""
+    return get_connection_pool().cursor()
+
+
+def close_connection_pool():
+    """Close the shared pool's idle connections (on application shutdown)."""
+    if _pool is not None:
+        _pool.close()
+
 def create_resumes_table():
     """Ensure the resumes table exists before inserting data."""
     conn = get_snowflake_connection()
@@ -53,6 +263,7 @@ def create_resumes_table():
                 extracted_skills ARRAY,
                 target_role VARCHAR(255),
                 missing_skills ARRAY,
+                resume_hash VARCHAR(64),  -- SHA-256 of the uploaded file
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
             );
             """
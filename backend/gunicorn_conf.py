@@ -0,0 +1,54 @@
+# File: backend/gunicorn_conf.py
+"""
+Production serving: gunicorn supervising uvicorn workers.
+
+    cd backend && gunicorn -c gunicorn_conf.py api.main:app
+
+The app is imported once in the master (preload) and warmed up there, so
+workers fork with the course index, skill matcher and artifacts already in
+memory (shared copy-on-write) and start serving at once. A worker that
+crashes or reaches max_requests is replaced without dropping the others.
+Because the app is preloaded, deploy new code with a full restart or USR2
+rather than HUP.
+
+Settings (environment):
+    WEB_CONCURRENCY            worker processes (2 x CPUs, at most 8)
+    BIND / PORT                listen address (0.0.0.0:8000)
+    GUNICORN_PRELOAD           0 imports and warms the app in each worker instead (1)
+    GUNICORN_TIMEOUT           seconds before a silent worker is killed (120)
+    GUNICORN_GRACEFUL_TIMEOUT  seconds a stopping worker gets to finish its requests (30)
+    GUNICORN_MAX_REQUESTS      requests before a worker is recycled; 0 disables (2000)
+"""
+import multiprocessing
+import os
+
+_cpus = multiprocessing.cpu_count()
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", max(2, min(2 * _cpus, 8))))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+
+# Requests are logged by backend.api.access_log; gunicorn only reports worker lifecycle
+accesslog = None
+errorlog = "-"
+
+# Each worker starts its own resume extraction pool; split the CPUs between them
+os.environ.setdefault("RESUME_EXTRACT_WORKERS", str(max(1, _cpus // workers)))
+
+
+def when_ready(server):
+    """Warm up the preloaded app in the master so every worker forks warm."""
+    if preload_app:
+        from backend.api.warmup import run_warmup
+        state = run_warmup()
+        server.log.info(f"Master warmed up in {state['seconds']}s; degraded: {state['degraded'] or 'none'}")
+
+
+def post_fork(server, worker):
+    server.log.info(f"Worker {worker.pid} forked")
@@ -0,0 +1,202 @@
+# File: backend/logging_config.py
+"""
+Process-wide logging setup shared by the API, the Streamlit frontend and jobs.
+
+Every record goes through a QueueHandler into an in-process queue; one
+QueueListener thread formats it and writes it to the console and a rotating
+file, so callers never block on disk or terminal I/O. Records are enqueued
+unformatted: %-style arguments are only interpolated on the listener thread,
+and not at all when the level is disabled. A call site that keeps repeating
+(same logger, file and line) is rate limited, and the number of dropped
+records is reported once it is allowed through again.
+
+Call setup_logging() once at process start; later calls are no-ops. A
+forked child (a gunicorn worker of a preloaded app) gets fresh queues and
+listener threads, since threads do not survive fork.
+
+Settings (environment):
+    LOG_LEVEL              root level (INFO)
+    LOG_LEVELS             per-logger levels, e.g. "backend.services.resume_parser=DEBUG,snowflake.connector=ERROR"
+    LOG_DIR                directory of the log files (logs)
+    LOG_RATE_LIMIT_BURST   records per call site per window before dropping (20; 0 disables)
+    LOG_RATE_LIMIT_WINDOW  window in seconds (10)
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DETAILED_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(pathname)s:%(lineno)d - %(message)s"
+
+# Chatty third-party loggers, unless LOG_LEVELS says otherwise
+DEFAULT_LEVELS = {
+    "snowflake.connector": "WARNING",
+    "urllib3": "WARNING",
+    "httpx": "WARNING",
+    "httpcore": "WARNING",
+    "botocore": "WARNING",
+    "uvicorn": "INFO",
+    "uvicorn.error": "INFO",
+    # Requests are recorded by backend.api.access_log
+    "uvicorn.access": "WARNING",
+}
+
+RATE_LIMIT_BURST = int(os.environ.get("LOG_RATE_LIMIT_BURST", "20"))
+RATE_LIMIT_WINDOW = float(os.environ.get("LOG_RATE_LIMIT_WINDOW", "10"))
+
+_listeners: List[Tuple[logging.handlers.QueueListener, logging.handlers.QueueHandler]] = []
+_configured = False
+_setup_lock = threading.Lock()
+
+
+def parse_levels(spec: Optional[str]) -> Dict[str, str]:
+    """Parse "logger=LEVEL,..." into a dict; invalid entries are ignored."""
+    levels = {}
+    for part in (spec or "").split(","):
+        name, _, level = part.strip().partition("=")
+        level = level.strip().upper()
+        if name.strip() and isinstance(logging.getLevelName(level), int):
+            levels[name.strip()] = level
+    return levels
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records without formatting them.
+
+    The stock QueueHandler merges msg and args on the calling thread; here the
+    listener's handlers do it. The queue is in-process, so nothing is pickled.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most `burst` records per call site every `window` seconds."""
+
+    def __init__(self, burst: int = RATE_LIMIT_BURST, window: float = RATE_LIMIT_WINDOW):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._sites: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record) -> bool:
+        if self.burst <= 0 or record.levelno >= logging.ERROR:
+            return True
+        site = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None or now - state[0] >= self.window:
+                dropped = state[2] if state else 0
+                self._sites[site] = [now, 1, 0]
+                if len(self._sites) > 10000:
+                    self._sites.clear()
+                if dropped:
+                    record.msg = f"{record.msg} [{dropped} similar messages suppressed]"
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+def start_queue_listener(*handlers: logging.Handler, rate_limit: bool = False) -> logging.Handler:
+    """
+    Start a listener thread feeding the given handlers.
+
+    Args:
+        handlers (logging.Handler): Handlers that format and write records
+        rate_limit (bool): Drop bursts from a single call site before they are queued
+
+    Returns:
+        logging.Handler: The queue handler to attach to loggers
+    """
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    handler = DeferredQueueHandler(records)
+    if rate_limit:
+        handler.addFilter(RateLimitFilter())
+    _listeners.append((listener, handler))
+    return handler
+
+
+def stop_logging():
+    """Flush and stop all listener threads (registered to run at exit)."""
+    while _listeners:
+        _listeners.pop()[0].stop()
+
+
+def _restart_after_fork():
+    """Give each queue handler of a forked child a new queue and listener thread."""
+    for listener, handler in _listeners:
+        # Records still queued belong to the parent, which writes them itself
+        listener.queue = handler.queue = queue.SimpleQueue()
+        listener._thread = None
+        listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def setup_logging(service: str, level: Optional[str] = None, log_file: Optional[str] = None,
+                  detailed: bool = False) -> logging.Logger:
+    """
+    Configure the root logger for this process, once.
+
+    Args:
+        service (str): Process name, used for the default log file (logs/<service>.log)
+        level (str, optional): Root level; defaults to LOG_LEVEL or INFO
+        log_file (str, optional): Log file path; "" disables the file handler
+        detailed (bool): Include module, path and line number in each line
+
+    Returns:
+        logging.Logger: The root logger
+    """
+    global _configured
+    root = logging.getLogger()
+    with _setup_lock:
+        if _configured:
+            return root
+
+        formatter = logging.Formatter(DETAILED_FORMAT if detailed else LOG_FORMAT)
+        handlers: List[logging.Handler] = [logging.StreamHandler()]
+        if log_file is None:
+            log_file = os.path.join(os.environ.get("LOG_DIR", "logs"), f"{service}.log")
+        if log_file:
+            os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+            handlers.append(logging.handlers.RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        # Replace whatever an earlier basicConfig or library installed
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(start_queue_listener(*handlers, rate_limit=True))
+        root.setLevel(level or os.environ.get("LOG_LEVEL", "INFO").upper())
+
+        levels = dict(DEFAULT_LEVELS)
+        levels.update(parse_levels(os.environ.get("LOG_LEVELS")))
+        for name, name_level in levels.items():
+            logging.getLogger(name).setLevel(name_level)
+        # Library loggers that were given their own handlers (uvicorn) write through the queue instead
+        for name in DEFAULT_LEVELS:
+            named = logging.getLogger(name)
+            for handler in named.handlers[:]:
+                named.removeHandler(handler)
+            named.propagate = True
+
+        atexit.register(stop_logging)
+        _configured = True
+    logging.getLogger(__name__).info(f"Logging configured for {service} (level {logging.getLevelName(root.level)})")
+    return root
@@ -0,0 +1,284 @@
+# File: backend/services/admission.py
+"""
+Admission control for the expensive dependencies of the API.
+
+Two layers keep a burst from queueing unbounded warehouse work:
+
+- Per-user token buckets (get_rate_limiter) on the LLM-heavy endpoints. A
+  user who spends the burst gets a 429 with Retry-After, so one client
+  cannot fill the queues below.
+- A concurrency limiter per dependency (get_limiter): Cortex COMPLETE
+  ("complete"), Cortex SEARCH_PREVIEW ("search") and resume parsing ("pdf").
+  At most `concurrency` calls run at once; the next `queue` callers wait up
+  to ADMISSION_QUEUE_TIMEOUT seconds (or the rest of the request's deadline)
+  for a slot, and beyond that they are rejected at once instead of piling up.
+
+Both raise AdmissionRejected, which the API answers with 429 and a
+Retry-After header (backend/api/main.py). Limits apply per worker process.
+Waiting callers block a threadpool thread each, so the API sizes its
+threadpool beyond admission_threads() at startup (backend/api/throttling.py);
+otherwise a burst on one dependency could take every thread and stall the
+endpoints that never touch it.
+
+Settings (environment):
+    RATE_LIMIT_PER_MINUTE             requests per user and minute on the LLM endpoints (30; 0 disables)
+    RATE_LIMIT_BURST                  requests a user may send at once (10)
+    ADMISSION_<NAME>_CONCURRENCY      concurrent calls per dependency (complete 4, search 8, pdf as RESUME_EXTRACT_WORKERS)
+    ADMISSION_<NAME>_QUEUE            callers waiting for a slot per dependency (4 x concurrency)
+    ADMISSION_QUEUE_TIMEOUT           seconds a caller waits for a slot (30)
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from backend.services.deadline import remaining
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+RATE_PER_MINUTE = float(os.environ.get("RATE_LIMIT_PER_MINUTE", "30"))
+RATE_BURST = float(os.environ.get("RATE_LIMIT_BURST", "10"))
+RATE_MAX_KEYS = 10000
+QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "30"))
+
+DEFAULT_CONCURRENCY = {
+    "complete": 4,
+    "search": 8,
+    "pdf": int(os.environ.get("RESUME_EXTRACT_WORKERS", min(4, os.cpu_count() or 1))),
+}
+
+
+class AdmissionRejected(Exception):
+    """A request was turned away by a rate limit or a full queue; retry after retry_after seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    """Refills rate tokens per second up to burst; each request takes one."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, cost: float = 1.0) -> float:
+        """
+        Take cost tokens if available.
+
+        Returns:
+            float: 0 if the tokens were taken, else seconds until they will be
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token bucket per key (user), for the least recently seen max_keys keys."""
+
+    def __init__(self, per_minute: float = RATE_PER_MINUTE, burst: float = RATE_BURST,
+                 max_keys: int = RATE_MAX_KEYS):
+        self.rate = per_minute / 60.0
+        self.burst = max(1.0, burst)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def check(self, key: str, cost: float = 1.0):
+        """
+        Count one request of key against its bucket.
+
+        Raises:
+            AdmissionRejected: If the bucket is empty
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            wait = bucket.take(cost)
+            if not wait:
+                self._allowed += 1
+                return
+            self._rejected += 1
+        logger.warning(f"Rate limit reached for {key}; retry in {wait:.1f}s")
+        raise AdmissionRejected("Too many requests, please slow down", wait)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"per_minute": self.rate * 60, "burst": self.burst, "users": len(self._buckets),
+                    "allowed": self._allowed, "rejected": self._rejected}
+
+
+class ConcurrencyLimiter:
+    """
+    At most concurrency callers hold a slot; up to queue more wait for one.
+
+    Callers are blocking threads (the API threadpool), so waiting is a
+    condition variable wait, not an event loop task.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int, timeout: float = QUEUE_TIMEOUT):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue = max(0, queue)
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._running = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_seconds = 0.0
+        self._hold_seconds = 2.0  # running average of how long a slot is held
+
+    def _retry_after(self) -> float:
+        # Time for the queue ahead of a new caller to drain
+        return self._hold_seconds * (self._waiting + self.concurrency) / self.concurrency
+
+    def acquire(self):
+        """
+        Take a slot, waiting in the queue if all are busy.
+
+        Raises:
+            AdmissionRejected: If the queue is full, or no slot frees up within timeout
+        """
+        with self._cond:
+            if self._running < self.concurrency and not self._waiting:
+                self._running += 1
+                self._admitted += 1
+                return
+            if self._waiting >= self.queue:
+                self._rejected += 1
+                retry_after = self._retry_after()
+                logger.warning(f"{self.name} queue full ({self._waiting} waiting); rejecting")
+                raise AdmissionRejected(f"Server busy ({self.name}), please retry", retry_after)
+            self._waiting += 1
+            self._queued += 1
+            self._max_waiting = max(self._max_waiting, self._waiting)
+            started = time.monotonic()
+            # No point waiting past the request's own deadline
+            budget = remaining()
+            deadline = started + (self.timeout if budget is None else max(0.0, min(self.timeout, budget)))
+            try:
+                while self._running >= self.concurrency:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        self._timed_out += 1
+                        logger.warning(f"{self.name} slot not free after {time.monotonic() - started:.1f}s; rejecting")
+                        raise AdmissionRejected(f"Server busy ({self.name}), please retry", self._retry_after())
+                    self._cond.wait(left)
+                self._running += 1
+                self._admitted += 1
+                self._wait_seconds += time.monotonic() - started
+            finally:
+                self._waiting -= 1
+
+    def release(self, held: float = None):
+        with self._cond:
+            self._running -= 1
+            if held is not None:
+                self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        """Context manager holding a slot for the duration of the block."""
+        self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run fn(*args, **kwargs) in a slot."""
+        with self.slot():
+            return fn(*args, **kwargs)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "concurrency": self.concurrency,
+                "queue_size": self.queue,
+                "running": self._running,
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._max_waiting,
+                "admitted": self._admitted,
+                "queued": self._queued,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "avg_wait_ms": round(self._wait_seconds / self._queued * 1000, 1) if self._queued else 0.0,
+                "avg_hold_ms": round(self._hold_seconds * 1000, 1),
+            }
+
+
+_limiters: Dict[str, ConcurrencyLimiter] = {}
+_rate_limiter: Optional[RateLimiter] = None
+_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> ConcurrencyLimiter:
+    """Return the process-wide limiter of a dependency ("complete", "search" or "pdf")."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                key = name.upper()
+                concurrency = int(os.environ.get(f"ADMISSION_{key}_CONCURRENCY", DEFAULT_CONCURRENCY.get(name, 4)))
+                queue = int(os.environ.get(f"ADMISSION_{key}_QUEUE", 4 * concurrency))
+                limiter = _limiters[name] = ConcurrencyLimiter(name, concurrency, queue)
+    return limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide per-user rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+def admission_threads() -> int:
+    """Most threads the limiters can hold at once: running plus queued callers of every dependency."""
+    return sum(limiter.concurrency + limiter.queue for limiter in map(get_limiter, DEFAULT_CONCURRENCY))
+
+
+def admission_stats() -> Dict:
+    """Queue depth, rejections and wait times per dependency, and rate limit counters, of this worker."""
+    for name in DEFAULT_CONCURRENCY:
+        get_limiter(name)
+    return {
+        "pid": os.getpid(),
+        "rate_limit": get_rate_limiter().stats(),
+        "dependencies": {name: limiter.stats() for name, limiter in sorted(_limiters.items())},
+    }
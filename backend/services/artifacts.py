@@ -0,0 +1,13 @@
+# File: backend/services/artifacts.py
+"""Locations of the artifacts built offline by the backend's batch jobs."""
+import os
+
+ARTIFACT_DIR = os.environ.get(
+    "SKILLPATH_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts"),
+)
+
+
+def artifact_path(filename: str, env_var: str) -> str:
+    """Path of an artifact, overridable through its own environment variable."""
+    return os.environ.get(env_var, os.path.join(ARTIFACT_DIR, filename))
@@ -0,0 +1,150 @@
+# File: backend/services/batch_recommendations.py
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.services import deadline
+from backend.services.learning_path_materializer import canonical_role
+from backend.services.skill_normalizer import get_skill_normalizer
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", "8"))
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "5000"))
+# Budget of each unit of work; a cohort batch streams for far longer than one request deadline
+BATCH_ITEM_DEADLINE = float(os.environ.get("BATCH_ITEM_DEADLINE", "30"))
+
+KIND_COURSES = "courses"
+KIND_TOP_SKILLS = "top_skills"
+
+
+def work_key(item: Dict) -> Tuple:
+    """
+    Key identifying the work an item needs, so identical items run only once.
+
+    Roles are compared in canonical form, ratings and missing skills as unordered sets
+    of canonical skill IDs.
+    """
+    kind = item.get("kind") or KIND_COURSES
+    role = canonical_role(item.get("role", ""))
+    if kind == KIND_TOP_SKILLS:
+        return (kind, role)
+    normalizer = get_skill_normalizer()
+    ratings = frozenset((normalizer.skill_id(k), int(v)) for k, v in (item.get("skill_ratings") or {}).items())
+    missing = normalizer.ids(item.get("missing_skills") or [])
+    return (kind, role, ratings, missing, item.get("limit") or 6)
+
+
+def run_item(item: Dict):
+    """
+    Execute one unit of batch work synchronously.
+
+    Args:
+        item (dict): kind, role and optionally skill_ratings, missing_skills, limit
+
+    Returns:
+        list: Top skills or course dictionaries
+    """
+    kind = item.get("kind") or KIND_COURSES
+    role = item["role"]
+
+    if kind == KIND_TOP_SKILLS:
+        from backend.services.skill_service import get_top_skills_for_role
+        return get_top_skills_for_role(role)
+
+    if kind != KIND_COURSES:
+        raise ValueError(f"Unknown batch item kind: {kind}")
+
+    if item.get("missing_skills"):
+        from backend.services.career_transition_service import get_career_transition_courses
+        result = get_career_transition_courses(role, item["missing_skills"], item.get("limit") or 6)
+        return result.get("courses", [])
+
+    from backend.services.course_service import get_course_recommendations
+    return get_course_recommendations(role, skill_ratings=item.get("skill_ratings"))
+
+
+def _run_budgeted(item: Dict) -> Tuple[List, List[str]]:
+    """run_item in a fresh BATCH_ITEM_DEADLINE budget; returns (result, degraded reasons)."""
+    with deadline.nested(BATCH_ITEM_DEADLINE) as budget:
+        result = run_item(item)
+        return result, list(budget.degraded)
+
+
+async def stream_batch(items: List[Dict], max_concurrency: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Run batch items with deduplication and bounded concurrency.
+
+    Yields one NDJSON line per input item as soon as its work completes (in
+    completion order, not input order), then a final summary line. Each unit
+    of work runs in its own BATCH_ITEM_DEADLINE budget rather than the rest of
+    the request's, and its line lists the fallbacks it took in "degraded".
+    """
+    started = time.perf_counter()
+    concurrency = max(1, min(max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    groups: Dict[Tuple, List[int]] = {}
+    errors = 0
+    degraded = 0
+    for index, item in enumerate(items):
+        try:
+            groups.setdefault(work_key(item), []).append(index)
+        except Exception as e:
+            errors += 1
+            yield _line({"index": index, "id": item.get("id"), "status": "error", "error": f"Invalid item: {e}"})
+
+    async def run_group(key: Tuple, indices: List[int]):
+        async with semaphore:
+            try:
+                result, reasons = await run_in_threadpool(_run_budgeted, items[indices[0]])
+                return key, indices, result, reasons, None
+            except Exception as e:
+                logger.error(f"Batch item failed for {key[:2]}: {e}")
+                return key, indices, None, [], str(e)
+
+    tasks = [asyncio.ensure_future(run_group(key, indices)) for key, indices in groups.items()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            key, indices, result, reasons, error = await next_done
+            for position, index in enumerate(indices):
+                item = items[index]
+                record = {
+                    "index": index,
+                    "id": item.get("id"),
+                    "user_id": item.get("user_id"),
+                    "kind": item.get("kind") or KIND_COURSES,
+                    "role": item.get("role"),
+                    "deduplicated": position > 0,
+                }
+                if error is None:
+                    record.update({"status": "ok", "result": result, "degraded": reasons})
+                    degraded += bool(reasons)
+                else:
+                    errors += 1
+                    record.update({"status": "error", "error": error})
+                yield _line(record)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    yield _line({
+        "summary": {
+            "items": len(items),
+            "unique_work": len(groups),
+            "errors": errors,
+            "degraded": degraded,
+            "concurrency": concurrency,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        }
+    })
+
+
+def _line(record: Dict) -> str:
+    return json.dumps(record, default=str) + "\n"
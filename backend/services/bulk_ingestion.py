@@ -0,0 +1,552 @@
+# File: backend/services/bulk_ingestion.py
+"""
+Bulk resume ingestion for enterprise customers.
+
+Takes a directory or zip archive of PDF / DOCX resumes, extracts text and
+matches skills in a process pool, resolves each resume's target role (role
+skills are looked up once per canonical role, not once per resume), and
+writes the results to RESUMES in batched multi-row inserts. Every finished
+file is appended to a JSONL manifest after its batch commits, so an
+interrupted run picks up where it stopped. Identical files (same SHA-256)
+are analyzed once.
+
+Run it from the project root:
+
+    python -m backend.services.bulk_ingestion resumes.zip --target-role "Data Engineer"
+    python -m backend.services.bulk_ingestion ./resumes --roles roles.csv --workers 8
+
+roles.csv maps files to roles and (optionally) user names with the columns
+file, target_role, user_name.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from backend.services.learning_path_materializer import canonical_role
+from backend.services.resume_parser import MAX_BYTES, SUPPORTED_EXTENSIONS
+from backend.services.upload_settings import BULK_API_WORKERS
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 200
+IN_FLIGHT_PER_WORKER = 4
+PROGRESS_EVERY = 100
+
+# Manifest statuses that mean "do not process this file again"
+DONE_STATUSES = {"stored", "empty"}
+
+STAGES = ("read", "extract", "skills", "roles", "insert")
+
+
+class BulkSource(NamedTuple):
+    """One resume in a directory or archive."""
+    name: str
+    size: int
+    fingerprint: str
+    path: Optional[str] = None
+    member: Optional[zipfile.ZipInfo] = None
+
+
+def list_sources(root: str) -> List[BulkSource]:
+    """Supported resumes under a directory or inside a zip archive, in name order."""
+    sources = []
+    if os.path.isdir(root):
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                if not filename.lower().endswith(SUPPORTED_EXTENSIONS) or filename.startswith("."):
+                    continue
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+                name = os.path.relpath(path, root)
+                sources.append(BulkSource(name, stat.st_size, f"{stat.st_size}:{int(stat.st_mtime)}", path=path))
+    elif zipfile.is_zipfile(root):
+        with zipfile.ZipFile(root) as archive:
+            for info in archive.infolist():
+                base = os.path.basename(info.filename)
+                if info.is_dir() or base.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                if info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    sources.append(BulkSource(info.filename, info.file_size, f"{info.file_size}:{info.CRC}",
+                                              member=info))
+    else:
+        raise ValueError(f"{root} is neither a directory nor a zip archive")
+    return sorted(sources, key=lambda s: s.name)
+
+
+class Manifest:
+    """
+    Append-only JSONL record of finished files, keyed by name and fingerprint.
+
+    With persist=False (dry runs) existing entries are honored but nothing is written.
+    """
+
+    def __init__(self, path: str, persist: bool = True):
+        self.path = path
+        self.persist = persist
+        self.done: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    if entry.get("status") in DONE_STATUSES:
+                        self.done[entry["file"]] = entry.get("fingerprint")
+
+    def is_done(self, source: BulkSource) -> bool:
+        return self.done.get(source.name) == source.fingerprint
+
+    def record(self, entries: List[Dict]):
+        if not entries or not self.persist:
+            return
+        with open(self.path, "a", encoding="utf-8") as handle:
+            for entry in entries:
+                handle.write(json.dumps(entry) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        for entry in entries:
+            if entry["status"] in DONE_STATUSES:
+                self.done[entry["file"]] = entry["fingerprint"]
+
+
+def load_roles(path: str) -> Dict[str, Dict[str, str]]:
+    """Read a roles CSV (file, target_role[, user_name]) keyed by file name."""
+    roles = {}
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            name = (row.get("file") or "").strip()
+            if name:
+                roles[name] = {k: (v or "").strip() for k, v in row.items() if k != "file"}
+    return roles
+
+
+class RoleResolver:
+    """Missing skills per resume from role skills fetched once per canonical role."""
+
+    def __init__(self, skills_for_role: Optional[Callable[[str], List[str]]] = None):
+        self._skills_for_role = skills_for_role or _default_role_skills
+        self._roles: Dict[str, List[str]] = {}
+
+    def role_skills(self, role: str) -> List[str]:
+        key = canonical_role(role)
+        if key not in self._roles:
+            self._roles[key] = self._skills_for_role(role)
+            logger.info(f"Resolved {len(self._roles[key])} skills for role '{key}'")
+        return self._roles[key]
+
+    def missing_skills(self, role: str, skills: List[str]) -> List[str]:
+        from backend.services.skill_normalizer import get_skill_normalizer
+
+        return get_skill_normalizer().difference(self.role_skills(role), skills)
+
+    @property
+    def roles(self) -> int:
+        return len(self._roles)
+
+
+def _default_role_skills(role: str) -> List[str]:
+    from backend.services.career_transition_service import get_default_skills_for_role
+    from backend.services.skill_service import get_top_skills_for_role
+
+    try:
+        skills = get_top_skills_for_role(role)
+        if skills:
+            return skills
+    except Exception as e:
+        logger.warning(f"Falling back to default skills for {role}: {e}")
+    return get_default_skills_for_role(role)
+
+
+def _analyze_file(path: str, filename: str, skills_mode: str) -> Dict:
+    """Worker: extract text and match skills for one file."""
+    from backend.services.resume_parser import extract_resume_inline
+    from backend.services.skill_extraction import extract_skills
+
+    started = time.perf_counter()
+    extraction = extract_resume_inline(path, filename)
+    extracted = time.perf_counter()
+    skills = extract_skills(extraction["text"], mode=skills_mode)[0] if extraction["text"] else []
+    return {
+        "text": extraction["text"],
+        "skills": skills,
+        "pages": extraction["pages_extracted"],
+        "truncated": extraction["truncated"],
+        "extract_s": extracted - started,
+        "skills_s": time.perf_counter() - extracted,
+    }
+
+
+class SnowflakeWriter:
+    """Batched multi-row inserts into RESUMES over one connection."""
+
+    COLUMNS = ("id", "user_name", "resume_text", "extracted_skills", "target_role", "missing_skills", "resume_hash")
+
+    def __init__(self):
+        from backend.database import get_snowflake_connection
+        from backend.services.resume_cache import ensure_hash_column
+
+        self.conn = get_snowflake_connection()
+        if not self.conn:
+            raise RuntimeError("Could not connect to Snowflake")
+        self.cur = self.conn.cursor()
+        ensure_hash_column(self.cur)
+
+    def write(self, rows: List[Dict]):
+        from backend.services.resume_cache import RESUMES_TABLE
+
+        # PARSE_JSON is not allowed inside VALUES, so select from an inline VALUES table
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(rows))
+        params = []
+        for row in rows:
+            params.extend((row["id"], row["user_name"], row["resume_text"], json.dumps(row["extracted_skills"]),
+                           row["target_role"], json.dumps(row["missing_skills"]), row["resume_hash"]))
+        self.cur.execute(f"""
+        INSERT INTO {RESUMES_TABLE} ({', '.join(self.COLUMNS)})
+        SELECT column1, column2, column3, PARSE_JSON(column4), column5, PARSE_JSON(column6), column7
+        FROM VALUES {placeholders}
+        """, params)
+        self.conn.commit()
+
+    def close(self):
+        self.cur.close()
+        self.conn.close()
+
+
+class DryRunWriter:
+    """Writer that only counts rows."""
+
+    def __init__(self):
+        self.rows = 0
+
+    def write(self, rows: List[Dict]):
+        self.rows += len(rows)
+
+    def close(self):
+        pass
+
+
+def new_report() -> Dict:
+    return {
+        "status": "running", "files": 0, "processed": 0, "stored": 0, "skipped": 0, "duplicates": 0,
+        "empty": 0, "errors": 0, "pages": 0, "bytes": 0, "roles": 0,
+        "stage_seconds": {stage: 0.0 for stage in STAGES}, "elapsed_s": 0.0,
+        "files_per_s": None, "mb_per_s": None,
+    }
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _materialize(source: BulkSource, archive: Optional[zipfile.ZipFile], workdir: str) -> str:
+    """Path of a source file on disk, extracting archive members into workdir."""
+    if source.path:
+        return source.path
+    target = os.path.join(workdir, f"{uuid.uuid4().hex}{os.path.splitext(source.name)[1].lower()}")
+    with archive.open(source.member) as member, open(target, "wb") as handle:
+        # file_size comes from the archive; cap the bytes actually inflated too
+        copied = 0
+        for chunk in iter(lambda: member.read(1024 * 1024), b""):
+            copied += len(chunk)
+            if copied > MAX_BYTES:
+                raise ValueError(f"{source.name} inflates past {MAX_BYTES} bytes")
+            handle.write(chunk)
+    return target
+
+
+def ingest(root: str, manifest_path: Optional[str] = None, target_role: Optional[str] = None,
+           roles: Optional[Dict[str, Dict[str, str]]] = None, workers: Optional[int] = None,
+           skills_mode: str = "dictionary", batch_size: int = INSERT_BATCH_SIZE, writer=None,
+           resolver: Optional[RoleResolver] = None, report: Optional[Dict] = None,
+           dry_run: bool = False) -> Dict:
+    """
+    Ingest every resume under a directory or zip archive.
+
+    Args:
+        root (str): Directory or zip archive
+        manifest_path (str, optional): JSONL manifest; defaults to <root>.manifest.jsonl
+        target_role (str, optional): Role for files not listed in roles
+        roles (dict, optional): Per-file target_role / user_name from load_roles
+        workers (int, optional): Process pool size, defaults to the CPU count
+        skills_mode (str): Skill extraction mode; "dictionary" makes no LLM calls
+        batch_size (int): Rows per insert statement
+        writer: Object with write(rows) and close(); defaults to SnowflakeWriter
+        resolver (RoleResolver, optional): Role skill lookup
+        report (dict, optional): Report to update in place (for progress polling)
+        dry_run (bool): Analyze without writing rows or manifest entries
+
+    Returns:
+        dict: Counts, per-stage seconds and throughput
+    """
+    started = time.perf_counter()
+    report = report if report is not None else new_report()
+    stages = report["stage_seconds"]
+    roles = roles or {}
+    resolver = resolver or RoleResolver()
+    manifest = Manifest(manifest_path or f"{root.rstrip(os.sep)}.manifest.jsonl", persist=not dry_run)
+    workers = workers or os.cpu_count() or 1
+
+    sources = list_sources(root)
+    report["files"] = len(sources)
+    logger.info(f"Bulk ingestion of {len(sources)} files from {root} with {workers} workers")
+
+    analyses: Dict[str, Dict] = {}
+    waiting: Dict[str, List[BulkSource]] = {}
+    batch: List[Dict] = []
+    batch_entries: List[Dict] = []
+    manifest_pending: List[Dict] = []
+
+    def flush():
+        if batch:
+            t = time.perf_counter()
+            writer.write(batch)
+            stages["insert"] += time.perf_counter() - t
+            report["stored"] += len(batch)
+        manifest.record(batch_entries + manifest_pending)
+        batch.clear()
+        batch_entries.clear()
+        manifest_pending.clear()
+
+    def emit(source: BulkSource, resume_hash: str, analysis: Dict):
+        report["processed"] += 1
+        entry = {"file": source.name, "fingerprint": source.fingerprint, "sha256": resume_hash}
+        if not analysis["text"]:
+            report["empty"] += 1
+            manifest_pending.append({**entry, "status": "empty"})
+            return
+        assigned = roles.get(source.name, {})
+        role = assigned.get("target_role") or target_role
+        t = time.perf_counter()
+        missing = resolver.missing_skills(role, analysis["skills"]) if role else []
+        stages["roles"] += time.perf_counter() - t
+        report["roles"] = resolver.roles
+        record_id = str(uuid.uuid4())
+        batch.append({
+            "id": record_id,
+            "user_name": assigned.get("user_name") or os.path.splitext(os.path.basename(source.name))[0],
+            "resume_text": analysis["text"],
+            "extracted_skills": analysis["skills"],
+            "target_role": role,
+            "missing_skills": missing,
+            "resume_hash": resume_hash,
+        })
+        batch_entries.append({**entry, "status": "stored", "resume_id": record_id, "skills": len(analysis["skills"])})
+        if len(batch) >= batch_size:
+            flush()
+        if report["processed"] % PROGRESS_EVERY == 0:
+            _update_throughput(report, started)
+            logger.info(f"Bulk ingestion: {report['processed']}/{report['files']} files, "
+                        f"{report['files_per_s']} files/s")
+
+    def fail(source: BulkSource, error: Exception):
+        report["processed"] += 1
+        report["errors"] += 1
+        logger.error(f"Bulk ingestion failed for {source.name}: {error}")
+        manifest_pending.append({"file": source.name, "fingerprint": source.fingerprint,
+                                 "status": "error", "error": str(error)})
+
+    writer = writer or (DryRunWriter() if dry_run else SnowflakeWriter())
+    workdir = tempfile.mkdtemp(prefix="bulk-ingest-")
+    archive = None if os.path.isdir(root) else zipfile.ZipFile(root)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    futures = {}
+
+    def collect(done):
+        for future in done:
+            source, resume_hash, path = futures.pop(future)
+            if path.startswith(workdir):
+                os.unlink(path)
+            try:
+                analysis = future.result()
+            except Exception as e:
+                for src in [source] + waiting.pop(resume_hash, []):
+                    fail(src, e)
+                continue
+            stages["extract"] += analysis["extract_s"]
+            stages["skills"] += analysis["skills_s"]
+            report["pages"] += analysis["pages"]
+            analyses[resume_hash] = analysis
+            emit(source, resume_hash, analysis)
+            for duplicate in waiting.pop(resume_hash, []):
+                emit(duplicate, resume_hash, analysis)
+
+    try:
+        for source in sources:
+            if manifest.is_done(source):
+                report["skipped"] += 1
+                continue
+            if source.size > MAX_BYTES:
+                fail(source, ValueError(f"{source.size} bytes exceeds the limit of {MAX_BYTES}"))
+                continue
+            t = time.perf_counter()
+            try:
+                path = _materialize(source, archive, workdir)
+                resume_hash = _hash_file(path)
+            except Exception as e:
+                fail(source, e)
+                continue
+            finally:
+                stages["read"] += time.perf_counter() - t
+            report["bytes"] += source.size
+
+            if resume_hash in analyses or resume_hash in waiting:
+                report["duplicates"] += 1
+                if path.startswith(workdir):
+                    os.unlink(path)
+                if resume_hash in analyses:
+                    emit(source, resume_hash, analyses[resume_hash])
+                else:
+                    waiting[resume_hash].append(source)
+                continue
+
+            waiting[resume_hash] = []
+            futures[pool.submit(_analyze_file, path, source.name, skills_mode)] = (source, resume_hash, path)
+            # Bound the files materialized on disk and queued in the pool
+            if len(futures) >= workers * IN_FLIGHT_PER_WORKER:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            collect(done)
+        flush()
+        report["status"] = "completed"
+    except BaseException:
+        report["status"] = "failed"
+        # Batches already written are in the manifest; unwritten rows are simply redone
+        manifest.record(manifest_pending)
+        raise
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        if archive:
+            archive.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+        writer.close()
+        _update_throughput(report, started)
+
+    logger.info(f"Bulk ingestion finished: {format_report(report)}")
+    return report
+
+
+def _update_throughput(report: Dict, started: float):
+    elapsed = time.perf_counter() - started
+    report["elapsed_s"] = round(elapsed, 3)
+    worked = report["processed"] - report["errors"]
+    report["files_per_s"] = round(worked / elapsed, 2) if elapsed else None
+    report["mb_per_s"] = round(report["bytes"] / 1024 / 1024 / elapsed, 2) if elapsed else None
+
+
+def format_report(report: Dict) -> str:
+    """Human-readable summary with throughput and per-stage timing."""
+    lines = [
+        f"{report['processed']}/{report['files']} files processed in {report['elapsed_s']:.1f}s "
+        f"({report['files_per_s']} files/s, {report['mb_per_s']} MB/s, {report['pages']} pages)",
+        f"stored={report['stored']} skipped={report['skipped']} duplicates={report['duplicates']} "
+        f"empty={report['empty']} errors={report['errors']} roles={report['roles']}",
+    ]
+    analyzed = max(1, report["processed"] - report["duplicates"] - report["errors"])
+    for stage in STAGES:
+        seconds = report["stage_seconds"][stage]
+        # extract and skills run in parallel workers, so they can exceed the wall time
+        lines.append(f"  {stage:<8}{seconds:>9.2f}s total {1000 * seconds / analyzed:>9.1f} ms/file")
+    return "\n".join(lines)
+
+
+# -------------------- Background jobs (API) --------------------
+
+_jobs: Dict[str, Dict] = {}
+_jobs_lock = threading.Lock()
+# One job at a time per API worker; later uploads wait as "queued"
+_job_slot = threading.Lock()
+
+
+def start_job(archive_path: str, archive_hash: str, target_role: Optional[str] = None,
+              skills_mode: str = "dictionary") -> Dict:
+    """
+    Ingest an uploaded archive in a background thread.
+
+    The job id is derived from the archive's SHA-256 and its manifest lives
+    next to the archive, so uploading the same archive again resumes it.
+    Jobs run one at a time per process with BULK_INGEST_WORKERS processes.
+    """
+    job_id = archive_hash[:16]
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job and job["report"]["status"] in ("queued", "running"):
+            os.unlink(archive_path)
+            return job
+        job = _jobs[job_id] = {"job_id": job_id, "report": {**new_report(), "status": "queued"}}
+
+    manifest_path = os.path.join(os.path.dirname(archive_path), f"bulk-{archive_hash}.manifest.jsonl")
+
+    def run():
+        try:
+            with _job_slot:
+                job["report"]["status"] = "running"
+                ingest(archive_path, manifest_path=manifest_path, target_role=target_role,
+                       workers=BULK_API_WORKERS, skills_mode=skills_mode, report=job["report"])
+        except Exception as e:
+            logger.error(f"Bulk ingestion job {job_id} failed: {e}")
+            job["report"]["error"] = str(e)
+        finally:
+            os.unlink(archive_path)
+
+    threading.Thread(target=run, name=f"bulk-ingest-{job_id}", daemon=True).start()
+    return job
+
+
+def get_job(job_id: str) -> Optional[Dict]:
+    """Snapshot of a bulk ingestion job, or None if unknown."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+    report = dict(job["report"])
+    report["stage_seconds"] = {k: round(v, 3) for k, v in report["stage_seconds"].items()}
+    return {"job_id": job_id, **report}
+
+
+if __name__ == "__main__":
+    from backend.logging_config import setup_logging
+
+    setup_logging("bulk_ingestion")
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory or zip archive of resumes")
+    parser.add_argument("source", help="Directory or .zip archive of PDF/DOCX resumes")
+    parser.add_argument("--target-role", help="Target role for files not listed in --roles")
+    parser.add_argument("--roles", help="CSV with columns file, target_role[, user_name]")
+    parser.add_argument("--manifest", help="Manifest path (default: <source>.manifest.jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--skills-mode", default="dictionary", choices=["dictionary", "hybrid", "llm"])
+    parser.add_argument("--batch-size", type=int, default=INSERT_BATCH_SIZE, help="Rows per insert")
+    parser.add_argument("--dry-run", action="store_true", help="Analyze without writing to Snowflake")
+    args = parser.parse_args()
+
+    result = ingest(
+        args.source,
+        manifest_path=args.manifest,
+        target_role=args.target_role,
+        roles=load_roles(args.roles) if args.roles else None,
+        workers=args.workers,
+        skills_mode=args.skills_mode,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    print(format_report(result))
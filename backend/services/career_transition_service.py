@@ -2,9 +2,12 @@
 import json
 import logging
 import uuid
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 from backend.database import get_snowflake_connection
-from backend.services.chat_service import ChatService
+from backend.services.admission import AdmissionRejected, get_limiter
+from backend.services.deadline import LLM_MIN_BUDGET, SEARCH_MIN_BUDGET, execute, has_budget, mark_degraded
+from backend.services.chat_service import get_chat_service
+from backend.services.skill_normalizer import get_skill_normalizer
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -69,8 +72,11 @@ def process_missing_skills(extracted_skills: List[str], target_role: str) -> Lis
     Returns:
         list: Missing skills needed for the target role
     """
+    if not has_budget(LLM_MIN_BUDGET):
+        return get_default_skills_for_role(target_role)
+    
     try:
-        chat_service = ChatService()
+        chat_service = get_chat_service()
         
         # Create a more targeted prompt with specific guidance
         prompt = (
@@ -130,6 +136,9 @@ def process_missing_skills(extracted_skills: List[str], target_role: str) -> Lis
             else:
                 return get_default_skills_for_role(target_role)
             
+    except AdmissionRejected:
+        # Overloaded: the caller gets a 429 rather than the generic defaults
+        raise
     except Exception as e:
         logger.error(f"Error identifying missing skills: {str(e)}")
         return get_default_skills_for_role(target_role)
@@ -144,6 +153,7 @@ def get_default_skills_for_role(role: str) -> List[str]:
     Returns:
         list: Default skills based on role
     """
+    mark_degraded("default_skills")
     role_lower = role.lower()
     
     if any(word in role_lower for word in ["system", "systems"]):
@@ -167,7 +177,8 @@ def get_default_skills_for_role(role: str) -> List[str]:
                 "Communication", "Problem Solving"]
 
 def store_career_analysis(username: str, resume_text: str, extracted_skills: List[str], 
-                          target_role: str, missing_skills: List[str] = None) -> str:
+                          target_role: str, missing_skills: List[str] = None,
+                          resume_hash: Optional[str] = None) -> str:
     """
     Store career transition analysis in the database with optimized approach.
     
@@ -177,45 +188,71 @@ def store_career_analysis(username: str, resume_text: str, extracted_skills: Lis
         extracted_skills (list): List of extracted skills
         target_role (str): The target role for transition
         missing_skills (list, optional): Missing skills if already identified
+        resume_hash (str, optional): SHA-256 of the uploaded file; an existing row for the
+            same user, resume and role is updated instead of inserting another copy
         
     Returns:
         str: The ID of the stored record
     """
     try:
+        from backend.services.resume_cache import (
+            RESUMES_TABLE, ensure_hash_column, find_stored_analysis, get_resume_cache
+        )
+
         conn = get_snowflake_connection()
         cursor = conn.cursor()
         
-        # Generate ID
-        record_id = str(uuid.uuid4())
-        
         # If missing skills not provided, identify them
         if not missing_skills:
             missing_skills = process_missing_skills(extracted_skills, target_role)
         
-        # Clean resume text for SQL insertion
-        cleaned_resume_text = resume_text.replace("'", "''")
-        
-        # Insert with optimized query using PARSE_JSON
-        query = """
-        INSERT INTO SKILLPATH_DB.PUBLIC.RESUMES 
-        (id, user_name, resume_text, extracted_skills, target_role, missing_skills)
-        SELECT %s, %s, %s, PARSE_JSON(%s), %s, PARSE_JSON(%s)
-        """
-        
-        cursor.execute(
-            query,
-            (
+        record_id = None
+        if resume_hash:
+            # No-op once warmup (or an earlier store in this process) migrated the table
+            ensure_hash_column(cursor)
+            record_id = find_stored_analysis(cursor, resume_hash, username, target_role)
+        
+        if record_id:
+            cursor.execute(
+                f"""
+                UPDATE {RESUMES_TABLE}
+                SET extracted_skills = PARSE_JSON(%s), missing_skills = PARSE_JSON(%s)
+                WHERE id = %s
+                """,
+                (json.dumps(extracted_skills), json.dumps(missing_skills), record_id)
+            )
+            logger.info(f"Updated stored career analysis {record_id} for {username}")
+        else:
+            # Generate ID
+            record_id = str(uuid.uuid4())
+            
+            # Insert with optimized query using PARSE_JSON; the text is a bound
+            # parameter, so it is stored as-is
+            query = f"""
+            INSERT INTO {RESUMES_TABLE} 
+            (id, user_name, resume_text, extracted_skills, target_role, missing_skills, resume_hash)
+            SELECT %s, %s, %s, PARSE_JSON(%s), %s, PARSE_JSON(%s), %s
+            """ if resume_hash else f"""
+            INSERT INTO {RESUMES_TABLE} 
+            (id, user_name, resume_text, extracted_skills, target_role, missing_skills)
+            SELECT %s, %s, %s, PARSE_JSON(%s), %s, PARSE_JSON(%s)
+            """
+            params = (
                 record_id,
                 username,
-                cleaned_resume_text,
+                resume_text,
                 json.dumps(extracted_skills),
                 target_role,
                 json.dumps(missing_skills)
             )
-        )
+            cursor.execute(query, params + ((resume_hash,) if resume_hash else ()))
+            logger.info(f"Successfully stored career analysis for {username}")
         
         conn.commit()
-        logger.info(f"Successfully stored career analysis for {username}")
+        if resume_hash:
+            cache = get_resume_cache()
+            cache.put_skills(resume_hash, extracted_skills, resume_text=resume_text)
+            cache.put_missing(resume_hash, target_role, extracted_skills, missing_skills)
         return record_id
         
     except Exception as e:
@@ -241,6 +278,10 @@ def get_career_transition_courses(target_role: str, missing_skills: List[str], l
     cursor = None
     conn = None
     
+    if not has_budget(SEARCH_MIN_BUDGET):
+        basic_courses = get_fallback_courses(target_role)
+        return {"count": len(basic_courses), "courses": basic_courses}
+    
     try:
         # Validate missing_skills to prevent SQL errors
         valid_missing_skills = []
@@ -308,7 +349,8 @@ def get_career_transition_courses(target_role: str, missing_skills: List[str], l
           LEVEL_CATEGORY;
         """
         
-        cursor.execute(query)
+        with get_limiter("search").slot():
+            execute(cursor, query)
         rows = cursor.fetchall()
         
         # Process results
@@ -319,6 +361,10 @@ def get_career_transition_courses(target_role: str, missing_skills: List[str], l
             course_dict = dict(zip(columns, row))
             courses.append(course_dict)
         
+        # Don't spend recommendation slots on re-uploads and yearly editions
+        from backend.services.course_dedup import collapse_clusters
+        courses = collapse_clusters(courses)
+        
         # Distribute "ALL_LEVELS" courses among the three difficulty levels
         all_levels_courses = [c for c in courses if c.get("LEVEL_CATEGORY") == "ALL_LEVELS"]
         if all_levels_courses:
@@ -412,6 +458,7 @@ def get_fallback_courses(role: str) -> List[Dict]:
     Returns:
         list: List of course dictionaries
     """
+    mark_degraded("fallback_courses")
     role_lower = role.lower()
     
     # Default common platforms
@@ -509,6 +556,53 @@ def get_fallback_courses(role: str) -> List[Dict]:
     
     return courses
 
+PLAN_STAGE_HEADINGS = [
+    "📚 Beginner Level (Month 1-2)",
+    "🔄 Intermediate Level (Month 3-4)",
+    "🔥 Advanced Level (Month 5-6)",
+]
+
+
+def _format_plan_course(course: Dict) -> str:
+    """Format one course of the transition plan as markdown."""
+    course_msg = f"### {course.get('PLAN_ORDER')}. {course.get('COURSE_NAME')}\n\n"
+    
+    # Format platform and level
+    platform_text = ""
+    if course.get('PLATFORM'):
+        platform_text = f"**🏢 Platform**: {course.get('PLATFORM')}"
+    if course.get('LEVEL'):
+        if platform_text:
+            platform_text += f" | **📊 Level**: {course.get('LEVEL')}"
+        else:
+            platform_text = f"**📊 Level**: {course.get('LEVEL')}"
+    
+    course_msg += f"> {platform_text}\n\n"
+    
+    # Add description
+    if course.get('DESCRIPTION'):
+        desc = course.get('DESCRIPTION')
+        course_msg += f"**What you'll learn**: {desc}\n\n"
+    
+    # Prerequisites not covered by the user's skills or an earlier course
+    if course.get('UNMET_PREREQUISITES'):
+        course_msg += f"**Before you start**: {', '.join(course.get('UNMET_PREREQUISITES'))}\n\n"
+    
+    # Format skills
+    if course.get('SKILLS'):
+        skills = course.get('SKILLS').split(', ')
+        course_msg += f"**Key skills**:\n\n"
+        for skill in skills:
+            course_msg += f"- {skill}\n"
+        course_msg += "\n"
+    
+    # Add URL
+    if course.get('URL'):
+        course_msg += f"**[➡️ Enroll in this course]({course.get('URL')})**\n\n"
+    
+    return course_msg + "---\n\n"
+
+
 def format_transition_plan(username: str, current_skills: List[str], target_role: str, 
                           missing_skills: List[str], courses: List[Dict]) -> Dict[str, str]:
     """
@@ -528,24 +622,30 @@ def format_transition_plan(username: str, current_skills: List[str], target_role
     transferable_skills = []
     strong_skills = []
     
-    # Identify some key terms for the target role to categorize skills
-    role_keywords = []
+    # Identify some key terms for the target role to categorize skills. Terms are
+    # matched against the tokens of each skill, its canonical name and its taxonomy
+    # category, so "MySQL" counts for data roles through "Databases".
+    role_keywords = frozenset()
     if "data" in target_role.lower():
-        role_keywords = ["data", "sql", "analysis", "analytics", "visualization", "python", "statistics"]
+        role_keywords = frozenset(["data", "sql", "databases", "analysis", "analytics", "visualization", "python", "statistics"])
     elif "system" in target_role.lower() or "systems" in target_role.lower():
-        role_keywords = ["system", "architecture", "engineering", "integration", "design", "documentation"]
+        role_keywords = frozenset(["system", "systems", "architecture", "engineering", "integration", "design", "documentation"])
     elif "software" in target_role.lower() or "developer" in target_role.lower():
-        role_keywords = ["software", "development", "code", "programming", "api", "testing"]
+        role_keywords = frozenset(["software", "development", "code", "programming", "api", "apis", "testing"])
     elif "engineer" in target_role.lower():
-        role_keywords = ["engineering", "technical", "design", "architecture", "development", "system"]
+        role_keywords = frozenset(["engineering", "technical", "design", "architecture", "development", "system", "systems"])
     
-    # Categorize skills
-    for skill in current_skills:
-        if any(keyword in skill.lower() for keyword in role_keywords):
+    # Categorize skills, once per canonical skill
+    normalizer = get_skill_normalizer()
+    for skill in normalizer.dedupe(current_skills):
+        if normalizer.terms(skill) & role_keywords:
             transferable_skills.append(skill)
         else:
             strong_skills.append(skill)
     
+    # Skills already on the resume are not gaps
+    missing_skills = normalizer.difference(missing_skills, current_skills)
+    
     # Limit to top skills
     transferable_skills = transferable_skills[:8]
     strong_skills = strong_skills[:8]
@@ -582,8 +682,11 @@ Based on your current profile, these critical skills will help you succeed in yo
 
 """
     
-    for skill in missing_skills:
-        skill_assessment += f"- **{skill}** ⭐ (High Priority)\n"
+    if missing_skills:
+        for skill in missing_skills:
+            skill_assessment += f"- **{skill}** ⭐ (High Priority)\n"
+    else:
+        skill_assessment += "- Your resume already covers the core skills for this role; focus on deepening them\n"
     
     # Create introduction for course recommendations
     intro = f"""
@@ -592,7 +695,7 @@ Based on your current profile, these critical skills will help you succeed in yo
 Based on your background and the skills you need to develop, I've curated this learning path to help you transition into a **{target_role}** role successfully. This plan focuses on:
 
 - Building on your existing expertise in {', '.join(transferable_skills[:3] if transferable_skills else ['your current field'])}
-- Developing critical skills in {', '.join(missing_skills[:3])}
+- Developing critical skills in {', '.join(missing_skills[:3] if missing_skills else ['your target role'])}
 - Creating a strategic approach to your career transition
 
 The courses below are organized into a structured learning path you can complete in 3-6 months.
@@ -662,116 +765,16 @@ The courses below are organized into a structured learning path you can complete
         
         has_valid_courses = True
         
-        # Beginner courses (Month 1-2)
-        if beginner_courses:
-            course_msg += f"# 📚 Beginner Level (Month 1-2)\n\n"
-            for course in beginner_courses[:2]:
-                course_msg += f"### {course.get('COURSE_NAME')}\n\n"
-                
-                # Format platform and level
-                platform_text = ""
-                if course.get('PLATFORM'):
-                    platform_text = f"**🏢 Platform**: {course.get('PLATFORM')}"
-                if course.get('LEVEL'):
-                    if platform_text:
-                        platform_text += f" | **📊 Level**: {course.get('LEVEL')}"
-                    else:
-                        platform_text = f"**📊 Level**: {course.get('LEVEL')}"
-                
-                course_msg += f"> {platform_text}\n\n"
-                
-                # Add description
-                if course.get('DESCRIPTION'):
-                    desc = course.get('DESCRIPTION')
-                    course_msg += f"**What you'll learn**: {desc}\n\n"
-                
-                # Format skills
-                if course.get('SKILLS'):
-                    skills = course.get('SKILLS').split(', ')
-                    course_msg += f"**Key skills**:\n\n"
-                    for skill in skills:
-                        course_msg += f"- {skill}\n"
-                    course_msg += "\n"
-                
-                # Add URL
-                if course.get('URL'):
-                    course_msg += f"**[➡️ Enroll in this course]({course.get('URL')})**\n\n"
-                
-                course_msg += "---\n\n"
-        
-        # Intermediate courses (Month 3-4)
-        if intermediate_courses:
-            course_msg += f"# 🔄 Intermediate Level (Month 3-4)\n\n"
-            for course in intermediate_courses[:2]:
-                course_msg += f"### {course.get('COURSE_NAME')}\n\n"
-                
-                # Format platform and level
-                platform_text = ""
-                if course.get('PLATFORM'):
-                    platform_text = f"**🏢 Platform**: {course.get('PLATFORM')}"
-                if course.get('LEVEL'):
-                    if platform_text:
-                        platform_text += f" | **📊 Level**: {course.get('LEVEL')}"
-                    else:
-                        platform_text = f"**📊 Level**: {course.get('LEVEL')}"
-                
-                course_msg += f"> {platform_text}\n\n"
-                
-                # Add description
-                if course.get('DESCRIPTION'):
-                    desc = course.get('DESCRIPTION')
-                    course_msg += f"**What you'll learn**: {desc}\n\n"
-                
-                # Format skills
-                if course.get('SKILLS'):
-                    skills = course.get('SKILLS').split(', ')
-                    course_msg += f"**Key skills**:\n\n"
-                    for skill in skills:
-                        course_msg += f"- {skill}\n"
-                    course_msg += "\n"
-                
-                # Add URL
-                if course.get('URL'):
-                    course_msg += f"**[➡️ Enroll in this course]({course.get('URL')})**\n\n"
-                
-                course_msg += "---\n\n"
+        # Order courses so that anything teaching a prerequisite comes first
+        from backend.services.prerequisite_graph import plan_learning_order
+        planned = plan_learning_order(beginner_courses + intermediate_courses + advanced_courses, current_skills)
         
-        # Advanced courses (Month 5-6)
-        if advanced_courses:
-            course_msg += f"# 🔥 Advanced Level (Month 5-6)\n\n"
-            for course in advanced_courses[:2]:
-                course_msg += f"### {course.get('COURSE_NAME')}\n\n"
-                
-                # Format platform and level
-                platform_text = ""
-                if course.get('PLATFORM'):
-                    platform_text = f"**🏢 Platform**: {course.get('PLATFORM')}"
-                if course.get('LEVEL'):
-                    if platform_text:
-                        platform_text += f" | **📊 Level**: {course.get('LEVEL')}"
-                    else:
-                        platform_text = f"**📊 Level**: {course.get('LEVEL')}"
-                
-                course_msg += f"> {platform_text}\n\n"
-                
-                # Add description
-                if course.get('DESCRIPTION'):
-                    desc = course.get('DESCRIPTION')
-                    course_msg += f"**What you'll learn**: {desc}\n\n"
-                
-                # Format skills
-                if course.get('SKILLS'):
-                    skills = course.get('SKILLS').split(', ')
-                    course_msg += f"**Key skills**:\n\n"
-                    for skill in skills:
-                        course_msg += f"- {skill}\n"
-                    course_msg += "\n"
-                
-                # Add URL
-                if course.get('URL'):
-                    course_msg += f"**[➡️ Enroll in this course]({course.get('URL')})**\n\n"
-                
-                course_msg += "---\n\n"
+        for stage, heading in enumerate(PLAN_STAGE_HEADINGS):
+            stage_courses = [c for c in planned if c["PLAN_STAGE"] == stage]
+            if stage_courses:
+                course_msg += f"# {heading}\n\n"
+                for course in stage_courses[:2]:
+                    course_msg += _format_plan_course(course)
     
     # Format career advice similar to learning path
     career_advice = f"""
@@ -779,7 +782,7 @@ The courses below are organized into a structured learning path you can complete
 
 Follow this step-by-step roadmap to maximize your chances of a successful career transition:
 
-1. **Build transferable skills** - Focus first on {', '.join(missing_skills[:3])} through the recommended courses above
+1. **Build transferable skills** - Focus first on {', '.join(missing_skills[:3] if missing_skills else ['deepening your core skills'])} through the recommended courses above
 2. **Create a transition portfolio** - Develop 2-3 projects that showcase your new {target_role} skills while leveraging your existing expertise in {', '.join(transferable_skills[:2] if transferable_skills else ['your field'])}
 3. **Bridge your experience** - Reframe your resume to highlight how your background in {strong_skills[0] if strong_skills else 'your current role'} is relevant to {target_role} positions
 4. **Network strategically** - Connect with current {target_role}s on LinkedIn and professional communities to understand the industry's needs
@@ -330,9 +330,11 @@
 
 import json
 import logging
+import threading
 from datetime import datetime
-from contextlib import contextmanager
-from backend.database import get_snowflake_connection
+from backend.database import get_connection_pool
+from backend.services.admission import AdmissionRejected, get_limiter
+from backend.services.deadline import LLM_MIN_BUDGET, execute, has_budget, mark_degraded
 
 logger = logging.getLogger(__name__)
 
@@ -347,8 +349,7 @@ class ChatService:
         "If a user asks anything outside this scope, respond with: "
         "I'm sorry, but I can only answer questions about your personalized learning path based on the conversation history."
     )
-    # Hardcoded conversation history
-    CONVERSATION_HISTORY = []
+    # Example conversation history, as sent per call in user_context['chat_history']
     # CONVERSATION_HISTORY = [
     #     {"role": "assistant", "content": "👋 Hello! I'll help you create a personalized learning path. What's your name?"},
     #     {"role": "user", "content": "Ram"},
@@ -372,64 +373,52 @@ class ChatService:
     #     {"role": "assistant", "content": "# 💼 Next Steps After Completing Your Learning Path\n\nOnce you've completed these courses, consider:\n1. **Building a portfolio**: 2-3 projects with cloud data pipelines and big data tech.\n2. **Certifications**: Google Cloud Professional Data Engineer, AWS Data Analytics Specialty.\n3. **Community**: Engage on Stack Overflow, Reddit's r/dataengineering, Meetup groups.\n4. **Open source**: Contribute to data engineering repos for visibility.\n\nAny questions about your learning path or next steps?"}
     # ]
 
-    def __init__(self):
-        self.conn = None
-        self._connect()
-
-    def _connect(self, retry_count=0):
-        try:
-            if self.conn:
-                self.conn.close()
-        except:
-            pass
-        self.conn = get_snowflake_connection()
-        logger.info("Connected to Snowflake for Chat Service")
+    def __init__(self, pool=None):
+        """
+        Args:
+            pool (SnowflakeConnectionPool, optional): Connections to run statements on;
+                defaults to the process-wide pool (backend.database.get_connection_pool)
+        """
+        # Nothing per request is kept on the instance, so one shared instance
+        # (get_chat_service) serves concurrent requests; each statement checks a
+        # connection out of the pool for its own duration
+        self.pool = pool or get_connection_pool()
 
-    @contextmanager
     def get_cursor(self):
-        cursor = self.conn.cursor()
-        try:
-            yield cursor
-            self.conn.commit()
-        except:
-            self.conn.rollback()
-            raise
-        finally:
-            cursor.close()
-
-    def _ensure_connection(self):
-        try:
-            with self.get_cursor() as cur:
-                cur.execute("SELECT 1")
-        except:
-            self._connect()
+        """Cursor on a pooled connection, committed on success and rolled back on error."""
+        return self.pool.cursor()
 
     def _sanitize(self, text: str) -> str:
         return (text or "").replace("'", "''")
 
     def get_llm_response(self, prompt: str, context: str = None):
-        self._ensure_connection()
         full = prompt
         if context:
             ctx = self._sanitize(context)
             full = f"{ctx}\n\n{prompt}"
-        for model in ['llama3.1-70b','llama3.1-8b','snowflake-llama-3.1-405b']:
-            try:
-                with self.get_cursor() as cur:
-                    query = f"SELECT SNOWFLAKE.CORTEX.COMPLETE('{model}', $${full}$$) AS response;"
-                    cur.execute(query)
-                    resp = cur.fetchone()[0]
-                    if resp and resp.strip():
-                        return True, resp
-            except Exception as e:
-                logger.warning(f"Model {model} failed: {e}")
+        # One COMPLETE slot for the whole fallback chain; a full queue raises AdmissionRejected
+        with get_limiter("complete").slot():
+            for model in ['llama3.1-70b','llama3.1-8b','snowflake-llama-3.1-405b']:
+                # Each attempt runs within what is left of the request's deadline
+                if not has_budget(LLM_MIN_BUDGET):
+                    mark_degraded("llm_deadline")
+                    break
+                try:
+                    with self.get_cursor() as cur:
+                        query = f"SELECT SNOWFLAKE.CORTEX.COMPLETE('{model}', $${full}$$) AS response;"
+                        execute(cur, query)
+                        resp = cur.fetchone()[0]
+                        if resp and resp.strip():
+                            return True, resp
+                except Exception as e:
+                    logger.warning(f"Model {model} failed: {e}")
         return False, "Sorry, I'm having trouble generating a response right now."
 
-    def _build_prompt(self, question: str) -> str:
+    def _build_prompt(self, question: str, history=None) -> str:
         # Insert system instruction first
         prompt_lines = [f"system: {self.SYSTEM_INSTRUCTION}"]
-        # Add conversation history
-        for m in self.CONVERSATION_HISTORY:
+        # Add this user's conversation history
+        for m in history or []:
             line = m['content'].replace("\n", " ")
             prompt_lines.append(f"{m['role']}: {line}")
         # Append user question
@@ -438,8 +427,9 @@ class ChatService:
         return "\n".join(prompt_lines)
 
     def answer_career_question(self, question: str, user_context=None):
-        self.CONVERSATION_HISTORY = user_context.get('chat_history', [])
-        prompt = self._build_prompt(question)
+        # The history comes with each call and never touches the shared instance
+        history = (user_context or {}).get('chat_history') or []
+        prompt = self._build_prompt(question, history)
         return self.get_llm_response(prompt)
     
     def generate_career_advice(self, current_skills, target_role, missing_skills=None):
@@ -490,9 +480,27 @@ class ChatService:
                 f"4. Update your resume to highlight relevant experience\n"
             )
         
-    def extract_skills(self, resume_text):
+    def extract_skills(self, resume_text, mode=None):
         """
-        Use LLM to extract skills from resume text.
+        Extract skills from resume text.
+        
+        In the default hybrid mode the skill dictionary scans the whole resume and
+        only sections it cannot explain are sent to the LLM (see skill_extraction).
+        
+        Args:
+            resume_text (str): The resume text to analyze
+            mode (str): "hybrid", "dictionary" or "llm"; defaults to SKILL_EXTRACTION_MODE
+            
+        Returns:
+            list: Extracted skills 
+        """
+        from backend.services.skill_extraction import extract_skills
+        skills, _ = extract_skills(resume_text, mode=mode, llm_extract=self.extract_skills_llm)
+        return skills
+    
+    def extract_skills_llm(self, resume_text):
+        """
+        Use LLM to extract skills from resume text (or a section of it).
         
         Args:
             resume_text (str): The resume text to analyze
@@ -510,6 +518,10 @@ class ChatService:
         
         try:
             flag, response = self.get_llm_response(prompt)
+            if not flag:
+                # The apology is not a skill list; the dictionary skills stand on their own
+                logger.warning("No LLM response for skill extraction")
+                return []
             
             # Extract JSON list from response 
             # (handles cases where model might add explanatory text)
@@ -530,6 +542,8 @@ class ChatService:
                         skills.append(line)
                 return skills
                 
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error(f"❌ Error extracting skills with LLM: {str(e)}")
             # Extract skills dynamically from resume text using contextual patterns
@@ -552,4 +566,19 @@ class ChatService:
             seen = set()
             unique_skills = [skill for skill in extracted_skills if not (skill in seen or seen.add(skill))]
             
-            return unique_skills
\ No newline at end of file
+            return unique_skills
+
+
+_chat_service = None
+_chat_service_lock = threading.Lock()
+
+
+def get_chat_service() -> ChatService:
+    """Return the process-wide ChatService, created on first use."""
+    global _chat_service
+    if _chat_service is None:
+        with _chat_service_lock:
+            if _chat_service is None:
+                _chat_service = ChatService()
+    return _chat_service
+
@@ -2,80 +2,50 @@
 import json
 import uuid
 import logging
-import re
+import threading
 from datetime import datetime
-from contextlib import contextmanager
-from backend.database import get_snowflake_connection, create_resumes_table
+from backend.database import get_connection_pool, create_resumes_table
+from backend.services.admission import get_limiter
+from backend.services.deadline import LLM_MIN_BUDGET, execute, has_budget, mark_degraded
 
 logger = logging.getLogger(__name__)
 
 class ResumeSearchService:
-    MAX_RETRIES = 3
-
-    def __init__(self):
-        """Initialize the Snowflake connection and ensure the resumes table exists."""
-        self.conn = None
-        self._connect()
-        self._initialize_search()
-
-    def _connect(self, retry_count=0):
-        """Establish connection to Snowflake with retry logic."""
-        try:
-            if self.conn:
-                try:
-                    self.conn.close()
-                except Exception:
-                    pass
-
-            self.conn = get_snowflake_connection()
-            if self.conn:
-                logger.info("✅ Successfully connected to Snowflake")
-            else:
-                raise Exception("❌ Failed to connect to Snowflake")
-        except Exception as e:
-            logger.error(f"❌ Error connecting to Snowflake: {e}")
-            if retry_count < self.MAX_RETRIES:
-                logger.info(f"🔄 Retrying connection (attempt {retry_count + 1}/{self.MAX_RETRIES})")
-                self._connect(retry_count + 1)
-            else:
-                raise
+    def __init__(self, pool=None):
+        """
+        Args:
+            pool (SnowflakeConnectionPool, optional): Connections to run statements on;
+                defaults to the process-wide pool (backend.database.get_connection_pool)
+        """
+        # Safe to share between requests: statements run on pooled connections
+        # and the search service is set up once, on the first search
+        self.pool = pool or get_connection_pool()
+        self._search_ready = False
+        self._search_lock = threading.Lock()
 
-    @contextmanager
     def get_cursor(self):
-        """Provide a context manager for Snowflake cursors."""
-        cursor = None
-        try:
-            cursor = self.conn.cursor()
-            yield cursor
-            self.conn.commit()
-        except Exception as e:
-            self.conn.rollback()
-            raise e
-        finally:
-            if cursor:
-                cursor.close()
+        """Cursor on a pooled connection, committed on success and rolled back on error."""
+        return self.pool.cursor()
 
-    def _ensure_connection(self):
-        """Ensure the Snowflake connection is active before executing any query."""
-        try:
-            with self.get_cursor() as cursor:
-                cursor.execute("SELECT CURRENT_DATABASE(), CURRENT_SCHEMA();")  # Check active DB
-                db_info = cursor.fetchone()
-                print(f"🔹 Connected to Snowflake DB: {db_info}")  # DEBUG Log
-        except Exception:
-            logger.info("🔄 Reconnecting to Snowflake...")
-            self._connect()
+    def _ensure_search_service(self):
+        if not self._search_ready:
+            with self._search_lock:
+                if not self._search_ready:
+                    self._initialize_search()
+                    self._search_ready = True
 
     def _initialize_search(self):
-        """Create the database and table for Cortex Search."""
-        with self.get_cursor() as cursor:
-            try:
-                logger.info("🔄 Ensuring resumes table exists...")
-                create_resumes_table()
+        """Create the resumes table and the Cortex Search service over it, if missing."""
+        try:
+            logger.info("🔄 Ensuring resumes table exists...")
+            create_resumes_table()
 
-                logger.info("🔄 Creating Cortex Search Service for resumes...")
+            # IF NOT EXISTS rather than OR REPLACE: replacing the service rebuilds
+            # its index and takes it away from every other worker in the meantime
+            logger.info("🔄 Ensuring Cortex Search Service for resumes exists...")
+            with self.get_cursor() as cursor:
                 cursor.execute("""
-                CREATE OR REPLACE CORTEX SEARCH SERVICE RESUME_SEARCH_SERVICE
+                CREATE CORTEX SEARCH SERVICE IF NOT EXISTS RESUME_SEARCH_SERVICE
                 ON resume_text
                 ATTRIBUTES user_name, target_role, extracted_skills
                 WAREHOUSE = SKILLPATH_WH
@@ -89,26 +59,21 @@ class ResumeSearchService:
                     FROM resumes
                 )
                 """)
-                self.conn.commit()
-                logger.info("✅ Resume Search Service initialized successfully")
-            except Exception as e:
-                self.conn.rollback()
-                logger.error(f"❌ Error initializing resume search: {e}")
-                raise
+            logger.info("✅ Resume Search Service initialized successfully")
+        except Exception as e:
+            logger.error(f"❌ Error initializing resume search: {e}")
+            raise
 
     def clean_resume_text(self, resume_text: str):
-        """Cleans resume text by removing personal details and unnecessary characters."""
-        # Remove email addresses
-        resume_text = re.sub(r'\S+@\S+', '', resume_text)
-        # Remove phone numbers (formats like 123-456-7890, (123) 456-7890, 123 456 7890)
-        resume_text = re.sub(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', '', resume_text)
-        # Remove common address patterns
-        resume_text = re.sub(r'\d{1,5}\s\w+(\s\w+)*,\s?\w+\s?\w*', '', resume_text)
-        # Remove special characters except useful ones
-        resume_text = re.sub(r'[^a-zA-Z0-9.,!?;:\'\-\s]', '', resume_text)
-        # Normalize spaces
-        resume_text = re.sub(r'\s+', ' ', resume_text).strip()
-        return resume_text
+        """
+        Cleans resume text by removing personal details and unnecessary characters.
+
+        Emails, phone numbers and street addresses are found in one linear-time
+        pass (see backend.services.pii_scrubber) and handled per the configured
+        redaction policy; special characters and extra whitespace are then removed.
+        """
+        from backend.services.pii_scrubber import clean_text
+        return clean_text(resume_text)
     
     def _calculate_missing_skills(self, extracted_skills, target_role):
         """
@@ -122,9 +87,9 @@ class ResumeSearchService:
             list: Missing skills for the target role
         """
         try:
-            # Try to initialize ChatService dynamically
-            from backend.services.chat_service import ChatService
-            chat_service = ChatService()
+            # Shared ChatService, imported lazily
+            from backend.services.chat_service import get_chat_service
+            chat_service = get_chat_service()
             
             # Use the ChatService to identify missing skills
             missing_skills = chat_service.identify_missing_skills(extracted_skills, target_role)
@@ -168,7 +133,8 @@ class ResumeSearchService:
                 )['results'] as results;
                 """
                 
-                cursor.execute(query)
+                with get_limiter("search").slot():
+                    execute(cursor, query)
                 result = cursor.fetchone()[0]
                 
                 if not result:
@@ -180,8 +146,9 @@ class ResumeSearchService:
                     if 'skill_name' in item and item['skill_name']:
                         required_skills.append(item['skill_name'])
                 
-                # Find missing skills
-                missing_skills = [skill for skill in required_skills if skill not in extracted_skills]
+                # Find missing skills by canonical skill ID, so "JS" on the resume covers "JavaScript"
+                from backend.services.skill_normalizer import get_skill_normalizer
+                missing_skills = get_skill_normalizer().difference(required_skills, extracted_skills)
                 
                 # If no skills are found missing, provide some generic ones based on the role name
                 if not missing_skills:
@@ -196,11 +163,11 @@ class ResumeSearchService:
     
     def store_resume(self, user_name: str, resume_text: str, extracted_skills: list, target_role: str):
         """Store resume details in the Snowflake table with proper array formatting."""
-        self._ensure_connection()
+        # Worked out before checking a connection out: the LLM call takes its own
+        missing_skills = self._calculate_missing_skills(extracted_skills, target_role)
         with self.get_cursor() as cursor:
             try:
                 resume_id = str(uuid.uuid4())
-                missing_skills = self._calculate_missing_skills(extracted_skills, target_role)
 
                 # Clean resume text for SQL insertion (escape single quotes)
                 cleaned_resume_text = resume_text.replace("'", "''")
@@ -225,7 +192,6 @@ class ResumeSearchService:
                  ),
                 )
 
-                self.conn.commit()
                 logger.info(f"✅ Successfully stored resume for {user_name} in Snowflake.")
 
             except Exception as e:
@@ -235,7 +201,7 @@ class ResumeSearchService:
 
     def search_resumes(self, resume_text: str, target_role: str = None, limit: int = 5):
         """Search resumes using Cortex Search with cleaned text."""
-        self._ensure_connection()
+        self._ensure_search_service()
         with self.get_cursor() as cursor:
             try:
                 cleaned_text = self.clean_resume_text(resume_text)
@@ -255,7 +221,8 @@ class ResumeSearchService:
                     )
                 )['results'] as results;
                 """
-                cursor.execute(search_query)
+                with get_limiter("search").slot():
+                    execute(cursor, search_query)
                 results = cursor.fetchone()[0]
                 return results if results else []
             except Exception as e:
@@ -264,7 +231,6 @@ class ResumeSearchService:
 
     def generate_career_path(self, search_results, target_role):
         """Use Snowflake Cortex LLMs to generate career transition recommendations."""
-        self._ensure_connection()
         with self.get_cursor() as cursor:
             try:
             # Create a detailed prompt for the LLM
@@ -287,6 +253,9 @@ class ResumeSearchService:
             ]
             
                 for model in models:
+                    # Not enough time left for another attempt: use the generic plan
+                    if not has_budget(LLM_MIN_BUDGET):
+                        break
                     try:
                         logger.info(f"🔄 Attempting to use model: {model}")
                     
@@ -297,7 +266,8 @@ class ResumeSearchService:
                     ) AS response;
                     """
                     
-                        cursor.execute(query)
+                        with get_limiter("complete").slot():
+                            execute(cursor, query)
                         response = cursor.fetchone()[0]
                     
                         logger.info(f"✅ Successfully generated response with model: {model}")
@@ -312,6 +282,7 @@ class ResumeSearchService:
             
             except Exception as e:
                 logger.error(f"❌ Error generating career path with LLM: {str(e)}")
+                mark_degraded("generic_plan")
             
             # Return a fallback response instead of None for better UX
                 fallback_response = (
@@ -327,4 +298,18 @@ class ResumeSearchService:
                 f"With consistent effort, you could transition within 3-6 months."
              )
             
-                return fallback_response
\ No newline at end of file
+                return fallback_response
+
+
+_resume_search_service = None
+_resume_search_service_lock = threading.Lock()
+
+
+def get_resume_search_service() -> ResumeSearchService:
+    """Return the process-wide ResumeSearchService, created on first use."""
+    global _resume_search_service
+    if _resume_search_service is None:
+        with _resume_search_service_lock:
+            if _resume_search_service is None:
+                _resume_search_service = ResumeSearchService()
+    return _resume_search_service
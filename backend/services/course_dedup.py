@@ -0,0 +1,314 @@
+# File: backend/services/course_dedup.py
+"""
+Near-duplicate course detection with MinHash and locality-sensitive hashing.
+
+Courses are shingled into word 3-grams of their name and the start of their
+description (years and edition words removed, so "Data Science 2022" and
+"Data Science 2023" look the same), each shingle set is reduced to a MinHash
+signature, and signatures that collide in any LSH band and agree on at least
+SIMILARITY_THRESHOLD of their positions are merged into one cluster. The whole
+pass is linear in the number of courses. Tokens are Unicode words, so courses in
+any script are compared; a course with no tokens at all has nothing to compare
+on and stays in a cluster of its own.
+
+Run it from the project root after all_courses_combined is rebuilt:
+
+    python -m backend.services.course_dedup
+"""
+import argparse
+import hashlib
+import logging
+import re
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.services.course_index import COURSES_TABLE
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+CLUSTERS_TABLE = "SKILLPATH_DB.PROCESSED_DATA.COURSE_CLUSTERS"
+
+NUM_PERM = 128
+BANDS = 16  # 8 rows per band: collision probability is 50% at a similarity of ~0.7
+SIMILARITY_THRESHOLD = 0.7
+SHINGLE_SIZE = 3
+MAX_DESCRIPTION_WORDS = 120
+
+# Shingles hashed per vectorized MinHash step (bounds memory to NUM_PERM x CHUNK)
+_CHUNK = 32768
+_EMPTY = np.uint64(np.iinfo(np.uint32).max)
+_SHINGLE_MIX = np.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93],
+    dtype=np.uint64,
+)
+
+_TOKEN = re.compile(r"[\w+#]+")
+_EDITION_WORDS = {"edition", "updated", "update", "latest", "new", "version"}
+_YEAR = re.compile(r"^(?:19|20)\d\d$")
+
+
+def course_tokens(name: Optional[str], description: Optional[str]) -> List[str]:
+    """Tokens a course is compared on, with years and edition words removed."""
+    tokens = _TOKEN.findall((name or "").casefold())
+    tokens += _TOKEN.findall((description or "").casefold())[:MAX_DESCRIPTION_WORDS]
+    return [t for t in tokens if t not in _EDITION_WORDS and not _YEAR.match(t)]
+
+
+def shingle_hashes(tokens: List[str]) -> np.ndarray:
+    """Unique 32-bit hashes of the word shingles of a token list."""
+    size = min(SHINGLE_SIZE, len(tokens))
+    if not size:
+        return np.zeros(0, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64, count=len(tokens))
+    # Combine each window of token hashes positionally (wrapping multiply), keep the top 32 bits
+    count = len(tokens) - size + 1
+    combined = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        combined += hashes[offset:offset + count] * _SHINGLE_MIX[offset]
+    return np.unique(combined >> np.uint64(32))
+
+
+class MinHasher:
+    """
+    MinHash with multiply-shift hashing: h_k(x) = ((a_k * x + b_k) mod 2**64) >> 32
+    for NUM_PERM random odd a_k, which avoids a slow 64-bit modulo per element.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = (rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+        self.b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)[:, None]
+
+    def signatures(self, shingle_sets: List[np.ndarray]) -> np.ndarray:
+        """
+        Compute signatures for many shingle sets at once.
+
+        Args:
+            shingle_sets (list): One uint64 hash array per course
+
+        Returns:
+            ndarray: (len(shingle_sets), num_perm) uint32 signatures
+        """
+        n = len(shingle_sets)
+        signatures = np.full((n, self.num_perm), _EMPTY, dtype=np.uint64)
+        lengths = np.fromiter((s.size for s in shingle_sets), dtype=np.int64, count=n)
+        start = 0
+        while start < n:
+            # Take whole courses until the chunk is full
+            end = start + max(1, int(np.searchsorted(np.cumsum(lengths[start:]), _CHUNK, side="right")))
+            members = [i for i in range(start, end) if lengths[i]]
+            if members:
+                values = np.concatenate([shingle_sets[i] for i in members])
+                hashed = (self.a * values + self.b) >> np.uint64(32)
+                offsets = np.concatenate(([0], np.cumsum(lengths[members])[:-1]))
+                signatures[members] = np.minimum.reduceat(hashed, offsets, axis=1).T
+            start = end
+        return signatures.astype(np.uint32)
+
+
+def lsh_clusters(signatures: np.ndarray, bands: int = BANDS,
+                 threshold: float = SIMILARITY_THRESHOLD) -> np.ndarray:
+    """
+    Group signatures whose estimated Jaccard similarity reaches the threshold.
+
+    Within each band, courses with the same band hash are compared against the
+    first course of that bucket only, which keeps the pass linear even for huge
+    buckets; the other bands catch pairs a bucket head misses.
+
+    Returns:
+        ndarray: Cluster label (smallest member index) for every row
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    parent = np.arange(n)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    multipliers = np.random.default_rng(7).integers(1, 2 ** 63, rows, dtype=np.uint64)
+    for band in range(bands):
+        block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (block * multipliers).sum(axis=1, dtype=np.uint64)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        heads = order[np.repeat(starts, np.diff(np.r_[starts, n]))]
+        candidates = np.flatnonzero(heads != order)
+        if not candidates.size:
+            continue
+        members, leaders = order[candidates], heads[candidates]
+        similarity = (signatures[members] == signatures[leaders]).mean(axis=1)
+        for member, leader in zip(members[similarity >= threshold], leaders[similarity >= threshold]):
+            root_a, root_b = find(int(member)), find(int(leader))
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    return np.array([find(i) for i in range(n)])
+
+
+def _cluster_labels(courses: List[Dict]) -> np.ndarray:
+    shingle_sets = [
+        shingle_hashes(course_tokens(c.get("COURSE_NAME"), c.get("DESCRIPTION"))) for c in courses
+    ]
+    labels = np.arange(len(courses))
+    # An empty shingle set has an all-_EMPTY signature that would match every other
+    # empty one; such courses stay singletons and are kept out of the LSH bands
+    shingled = np.flatnonzero([s.size > 0 for s in shingle_sets])
+    if shingled.size:
+        signatures = MinHasher().signatures([shingle_sets[i] for i in shingled])
+        labels[shingled] = shingled[lsh_clusters(signatures)]
+    return labels
+
+
+def _cluster_id(url: str) -> str:
+    return hashlib.sha1(url.encode()).hexdigest()[:16]
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def cluster_courses(rows: List[Dict]) -> List[Dict]:
+    """
+    Assign every course to a near-duplicate cluster with a canonical representative.
+
+    The canonical course of a cluster is the highest rated one, then the one with
+    the longest description, then the first in table order.
+
+    Args:
+        rows (list): Dicts with COURSE_NAME, DESCRIPTION, URL and optionally RATING
+
+    Returns:
+        list: One dict per course with URL, CLUSTER_ID, CANONICAL_URL, IS_CANONICAL, CLUSTER_SIZE
+    """
+    rows = [r for r in rows if r.get("URL")]
+    labels = _cluster_labels(rows)
+
+    members: Dict[int, List[int]] = {}
+    for i, label in enumerate(labels):
+        members.setdefault(int(label), []).append(i)
+
+    assignments = []
+    for indices in members.values():
+        canonical = max(indices, key=lambda i: (
+            _to_float(rows[i].get("RATING")), len(rows[i].get("DESCRIPTION") or ""), -i,
+        ))
+        canonical_url = rows[canonical]["URL"]
+        for i in indices:
+            assignments.append({
+                "URL": rows[i]["URL"],
+                "CLUSTER_ID": _cluster_id(canonical_url),
+                "CANONICAL_URL": canonical_url,
+                "IS_CANONICAL": i == canonical,
+                "CLUSTER_SIZE": len(indices),
+            })
+    return assignments
+
+
+def collapse_clusters(courses: List[Dict]) -> List[Dict]:
+    """
+    Keep only the first course of each near-duplicate cluster, preserving order.
+
+    Courses carrying a CLUSTER_ID (from COURSE_CLUSTERS) are grouped by it;
+    otherwise the small result list is clustered on the fly.
+    """
+    if len(courses) < 2:
+        return courses
+    if all(c.get("CLUSTER_ID") for c in courses):
+        labels = [c["CLUSTER_ID"] for c in courses]
+    else:
+        labels = _cluster_labels(courses).tolist()
+
+    seen = set()
+    collapsed = []
+    for course, label in zip(courses, labels):
+        if label not in seen:
+            seen.add(label)
+            collapsed.append(course)
+    if len(collapsed) < len(courses):
+        logger.info(f"Collapsed {len(courses) - len(collapsed)} near-duplicate courses")
+    return collapsed
+
+
+def load_course_clusters() -> Dict[str, str]:
+    """Map course URL to CLUSTER_ID from the COURSE_CLUSTERS table."""
+    from backend.database import get_snowflake_connection
+
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT URL, CLUSTER_ID FROM {CLUSTERS_TABLE}")
+        return dict(cur.fetchall())
+    finally:
+        cur.close()
+        conn.close()
+
+
+def write_course_clusters(assignments: List[Dict], batch_size: int = 10000):
+    """Replace the contents of COURSE_CLUSTERS with new assignments."""
+    from backend.database import get_snowflake_connection
+
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CLUSTERS_TABLE} (
+            URL VARCHAR,
+            CLUSTER_ID VARCHAR(16),
+            CANONICAL_URL VARCHAR,
+            IS_CANONICAL BOOLEAN,
+            CLUSTER_SIZE INTEGER
+        );
+        """)
+        cur.execute(f"TRUNCATE TABLE {CLUSTERS_TABLE}")
+        columns = ["URL", "CLUSTER_ID", "CANONICAL_URL", "IS_CANONICAL", "CLUSTER_SIZE"]
+        for start in range(0, len(assignments), batch_size):
+            cur.executemany(
+                f"INSERT INTO {CLUSTERS_TABLE} ({', '.join(columns)}) VALUES (%s, %s, %s, %s, %s)",
+                [tuple(a[c] for c in columns) for a in assignments[start:start + batch_size]],
+            )
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+
+
+def load_dedup_rows() -> List[Dict]:
+    """Fetch the fields the dedup pass compares from ALL_COURSES_COMBINED."""
+    from backend.database import get_snowflake_connection
+
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT COURSE_NAME, DESCRIPTION, URL, RATING FROM {COURSES_TABLE}")
+        columns = [desc[0] for desc in cur.description]
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    from backend.logging_config import setup_logging
+
+    setup_logging("course_dedup")
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate courses into COURSE_CLUSTERS")
+    parser.add_argument("--dry-run", action="store_true", help="Report clusters without writing them")
+    args = parser.parse_args()
+
+    assignments = cluster_courses(load_dedup_rows())
+    clusters = sum(1 for a in assignments if a["IS_CANONICAL"])
+    print(f"{len(assignments)} courses in {clusters} clusters "
+          f"({len(assignments) - clusters} near-duplicates)")
+    if not args.dry_run:
+        write_course_clusters(assignments)
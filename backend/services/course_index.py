@@ -0,0 +1,362 @@
+# File: backend/services/course_index.py
+import logging
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from backend.database import get_snowflake_connection
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+COURSES_TABLE = "SKILLPATH_DB.PROCESSED_DATA.ALL_COURSES_COMBINED"
+
+# Skills taught by at least 1/DENSE_SKILL_RATIO of all courses keep a precomputed
+# bitmap; rarer skills are stored as sorted postings and expanded on demand.
+DENSE_SKILL_RATIO = 64
+
+_SKILL_SPLIT = re.compile(r"[,;\n]+")
+
+
+def normalize_skill(skill: str) -> str:
+    """Normalize a skill surface form into the key used by the index vocabulary."""
+    return " ".join(str(skill).strip(" \t\"'[]()-•*.").casefold().split())
+
+
+def split_skills(raw: Optional[str]) -> List[str]:
+    """Split a free-text comma separated SKILLS value into normalized skill keys."""
+    if not raw:
+        return []
+    skills = []
+    for part in _SKILL_SPLIT.split(str(raw)):
+        key = normalize_skill(part)
+        if key and key not in skills:
+            skills.append(key)
+    return skills
+
+
+def _popcount(bitmap: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return int(np.bitwise_count(bitmap).sum(dtype=np.int64))
+    return int(np.count_nonzero(np.unpackbits(bitmap.view(np.uint8))))
+
+
+def level_category(level: Optional[str]) -> str:
+    """Bucket a raw LEVEL label the same way the Cortex course queries do."""
+    level = (level or "").lower()
+    if "advanced" in level or "expert" in level:
+        return "ADVANCED"
+    if "beginner" in level or "introductory" in level:
+        return "BEGINNER"
+    if "intermediate" in level or level in ("all levels", "fluency"):
+        return "INTERMEDIATE"
+    return "UNKNOWN"
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class CourseIndex:
+    """
+    In-memory inverted index over ALL_COURSES_COMBINED.
+
+    Every course gets a dense integer ID (its row position). Skills are mapped to
+    vocabulary IDs, and each skill, level and platform owns a bitmap of the courses
+    it covers, packed 64 courses per uint64 word. Boolean queries are evaluated
+    with word-wise AND/OR/NOT and facet counts are popcounts over the result.
+
+    When near-duplicate clusters (URL -> CLUSTER_ID, see course_dedup) are
+    supplied, searches can collapse each cluster to its best-rated match.
+    """
+
+    def __init__(self, rows: Iterable[Dict], clusters: Optional[Dict[str, str]] = None):
+        clusters = clusters or {}
+        self.courses: List[Dict] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+
+        course_skill_ids = []
+        ratings = []
+        for row in rows:
+            course = {
+                "COURSE_NAME": row.get("COURSE_NAME") or "",
+                "DESCRIPTION": row.get("DESCRIPTION") or "",
+                "SKILLS": row.get("SKILLS") or "",
+                "URL": row.get("URL") or "",
+                "LEVEL": row.get("LEVEL"),
+                "PLATFORM": row.get("PLATFORM"),
+                "LEVEL_CATEGORY": level_category(row.get("LEVEL")),
+                "CLUSTER_ID": clusters.get(row.get("URL")),
+            }
+            if not course["COURSE_NAME"] or not course["URL"]:
+                continue
+            ids = []
+            for key in split_skills(course["SKILLS"]):
+                skill_id = self.vocabulary.get(key)
+                if skill_id is None:
+                    skill_id = len(self.skill_names)
+                    self.vocabulary[key] = skill_id
+                    self.skill_names.append(key)
+                ids.append(skill_id)
+            self.courses.append(course)
+            course_skill_ids.append(ids)
+            ratings.append(_to_float(row.get("RATING")))
+
+        self.size = len(self.courses)
+        self.n_words = max(1, (self.size + 63) // 64)
+        self.ratings = np.array(ratings, dtype=np.float32)
+
+        # Dense cluster code per course; unclustered courses are singletons
+        cluster_codes: Dict[str, int] = {}
+        self.cluster_codes = np.fromiter(
+            (cluster_codes.setdefault(c["CLUSTER_ID"] or f"#{i}", len(cluster_codes))
+             for i, c in enumerate(self.courses)),
+            dtype=np.int32, count=self.size,
+        )
+        self.cluster_count = len(cluster_codes)
+
+        # Course -> skills (CSR)
+        lengths = np.fromiter((len(ids) for ids in course_skill_ids), dtype=np.int64, count=self.size)
+        self.course_offsets = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.course_offsets[1:])
+        self.course_skills = np.fromiter(
+            (skill_id for ids in course_skill_ids for skill_id in ids),
+            dtype=np.int32, count=int(self.course_offsets[-1]),
+        )
+
+        # Skill -> courses (CSR postings, course IDs ascending)
+        self._entry_course = np.repeat(np.arange(self.size, dtype=np.int32), lengths)
+        order = np.argsort(self.course_skills, kind="stable")
+        self.skill_postings = self._entry_course[order]
+        self.skill_counts = np.bincount(self.course_skills, minlength=len(self.skill_names)).astype(np.int64)
+        self.skill_offsets = np.zeros(len(self.skill_names) + 1, dtype=np.int64)
+        np.cumsum(self.skill_counts, out=self.skill_offsets[1:])
+
+        dense_threshold = max(1, self.size // DENSE_SKILL_RATIO)
+        self._dense_skills = {
+            int(skill_id): self._bitmap_from_ids(self._postings(int(skill_id)))
+            for skill_id in np.flatnonzero(self.skill_counts >= dense_threshold)
+        }
+
+        # Levels are faceted by category, so "intermediate" also finds "Intermediate Level" and "All Levels"
+        self.level_bitmaps = self._facet_bitmaps(c["LEVEL_CATEGORY"] for c in self.courses)
+        self.platform_bitmaps = self._facet_bitmaps(c["PLATFORM"] for c in self.courses)
+        self._facet_keys = {name.casefold(): name for name in self.platform_bitmaps}
+        self._universe = self._bitmap_from_ids(np.arange(self.size, dtype=np.int32))
+
+        logger.info(
+            f"Built course index: {self.size} courses, {len(self.skill_names)} skills, "
+            f"{len(self._dense_skills)} dense skill bitmaps, {self.cluster_count} course clusters"
+        )
+
+    # -------------------- Bitmap helpers --------------------
+
+    def _bitmap_from_ids(self, ids: np.ndarray) -> np.ndarray:
+        bits = np.zeros(self.n_words * 64, dtype=bool)
+        bits[ids] = True
+        return np.packbits(bits, bitorder="little").view(np.uint64)
+
+    def _ids_from_bitmap(self, bitmap: np.ndarray) -> np.ndarray:
+        words = np.flatnonzero(bitmap)
+        if words.size * 8 > self.n_words:
+            bits = np.unpackbits(bitmap.view(np.uint8), bitorder="little")[:self.size]
+            return np.flatnonzero(bits)
+        # Sparse result: only unpack the non-zero words
+        positions = np.flatnonzero(np.unpackbits(bitmap[words].view(np.uint8), bitorder="little"))
+        return words[positions >> 6] * 64 + (positions & 63)
+
+    def _empty(self) -> np.ndarray:
+        return np.zeros(self.n_words, dtype=np.uint64)
+
+    def _postings(self, skill_id: int) -> np.ndarray:
+        return self.skill_postings[self.skill_offsets[skill_id]:self.skill_offsets[skill_id + 1]]
+
+    def _facet_bitmaps(self, values: Iterable[Optional[str]]) -> Dict[str, np.ndarray]:
+        groups: Dict[str, List[int]] = {}
+        for course_id, value in enumerate(values):
+            groups.setdefault(value or "Other", []).append(course_id)
+        return {
+            value: self._bitmap_from_ids(np.array(ids, dtype=np.int32))
+            for value, ids in groups.items()
+        }
+
+    def skill_bitmap(self, skill: str) -> Optional[np.ndarray]:
+        """Return the bitmap of courses teaching a skill, or None if the skill is unknown."""
+        skill_id = self.vocabulary.get(normalize_skill(skill))
+        if skill_id is None:
+            # Aliases ("JS", "Postgres") resolve to the canonical name courses are tagged with
+            from backend.services.skill_normalizer import get_skill_normalizer
+            skill_id = self.vocabulary.get(normalize_skill(get_skill_normalizer().canonical(skill)))
+        if skill_id is None:
+            return None
+        dense = self._dense_skills.get(skill_id)
+        if dense is not None:
+            return dense
+        return self._bitmap_from_ids(self._postings(skill_id))
+
+    def _union(self, bitmaps: Dict[str, np.ndarray], keys: List[str]) -> np.ndarray:
+        result = self._empty()
+        for key in keys:
+            bitmap = bitmaps.get(self._facet_keys.get(key.casefold(), key))
+            if bitmap is not None:
+                result |= bitmap
+        return result
+
+    # -------------------- Queries --------------------
+
+    def match(self, all_skills: List[str] = None, any_skills: List[str] = None,
+              exclude_skills: List[str] = None) -> np.ndarray:
+        """
+        Evaluate a boolean skill query.
+
+        Args:
+            all_skills (list): Skills every course must teach (AND)
+            any_skills (list): Skills of which a course must teach at least one (OR)
+            exclude_skills (list): Skills a course must not teach (NOT)
+
+        Returns:
+            ndarray: Bitmap of matching courses
+        """
+        result = self._universe.copy()
+        for skill in all_skills or []:
+            bitmap = self.skill_bitmap(skill)
+            if bitmap is None:
+                return self._empty()
+            result &= bitmap
+        if any_skills:
+            union = self._empty()
+            for skill in any_skills:
+                bitmap = self.skill_bitmap(skill)
+                if bitmap is not None:
+                    union |= bitmap
+            result &= union
+        for skill in exclude_skills or []:
+            bitmap = self.skill_bitmap(skill)
+            if bitmap is not None:
+                result &= ~bitmap
+        return result
+
+    def search(self, all_skills: List[str] = None, any_skills: List[str] = None,
+               exclude_skills: List[str] = None, levels: List[str] = None,
+               platforms: List[str] = None, limit: int = 10, offset: int = 0,
+               top_skill_facets: int = 10, collapse: bool = False) -> Dict:
+        """
+        Run a boolean course query with level/platform filters and facet counts.
+
+        Levels filter and facet by category (BEGINNER, INTERMEDIATE, ADVANCED,
+        UNKNOWN; see level_category). Facets are disjunctive: level counts ignore the level filter and platform
+        counts ignore the platform filter, so the UI can show alternatives.
+        With collapse, total and the result page count each near-duplicate
+        cluster once (its best-rated match); facets still count every course.
+
+        Returns:
+            dict: total, courses (highest rated first), facets and elapsed_us
+        """
+        started = time.perf_counter()
+
+        skill_match = self.match(all_skills, any_skills, exclude_skills)
+        # Requested levels may be categories or raw labels; both map to a category
+        level_mask = (self._union(self.level_bitmaps, [level_category(level) for level in levels])
+                      if levels else self._universe)
+        platform_mask = self._union(self.platform_bitmaps, platforms) if platforms else self._universe
+
+        result = skill_match & level_mask & platform_mask
+        level_base = skill_match & platform_mask
+        platform_base = skill_match & level_mask
+
+        facets = {
+            "LEVEL": {name: _popcount(level_base & bm) for name, bm in self.level_bitmaps.items()},
+            "PLATFORM": {name: _popcount(platform_base & bm) for name, bm in self.platform_bitmaps.items()},
+        }
+
+        ids = self._ids_from_bitmap(result)
+        total = int(ids.size)
+
+        if top_skill_facets and total:
+            if total <= 256:
+                entries = np.concatenate([
+                    self.course_skills[self.course_offsets[i]:self.course_offsets[i + 1]] for i in ids
+                ])
+            else:
+                selected = np.zeros(self.size, dtype=bool)
+                selected[ids] = True
+                entries = self.course_skills[selected[self._entry_course]]
+            if entries.size > len(self.skill_names):
+                skill_ids = np.arange(len(self.skill_names))
+                counts = np.bincount(entries, minlength=len(self.skill_names))
+            else:
+                skill_ids, counts = np.unique(entries, return_counts=True)
+            top = np.argsort(-counts, kind="stable")[:top_skill_facets]
+            facets["SKILLS"] = {
+                self.skill_names[skill_ids[i]]: int(counts[i]) for i in top if counts[i] > 0
+            }
+
+        # Highest rated first; stable so equal ratings keep table order
+        window = offset + limit
+        if collapse and self.cluster_count < self.size and total:
+            ranked = ids[np.argsort(-self.ratings[ids], kind="stable")]
+            _, first = np.unique(self.cluster_codes[ranked], return_index=True)
+            ranked = ranked[np.sort(first)]
+            total = int(ranked.size)
+        elif total > window:
+            candidates = ids[np.argpartition(-self.ratings[ids], window - 1)[:window]]
+            ranked = candidates[np.argsort(-self.ratings[candidates], kind="stable")]
+        else:
+            ranked = ids[np.argsort(-self.ratings[ids], kind="stable")]
+        page = [self.courses[i] for i in ranked[offset:window]]
+
+        return {
+            "total": total,
+            "courses": page,
+            "facets": facets,
+            "elapsed_us": int((time.perf_counter() - started) * 1_000_000),
+        }
+
+
+def load_course_rows() -> List[Dict]:
+    """Fetch the course catalogue used to build the index from Snowflake."""
+    conn = None
+    cur = None
+    try:
+        conn = get_snowflake_connection()
+        if not conn:
+            raise ConnectionError("Could not connect to Snowflake")
+        cur = conn.cursor()
+        cur.execute(f"""
+        SELECT COURSE_NAME, DESCRIPTION, SKILLS, URL, LEVEL, PLATFORM, RATING
+        FROM {COURSES_TABLE}
+        """)
+        columns = [desc[0] for desc in cur.description]
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        if cur: cur.close()
+        if conn: conn.close()
+
+
+_index: Optional[CourseIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_course_index(refresh: bool = False) -> CourseIndex:
+    """Return the process-wide course index, building it on first use."""
+    global _index
+    if _index is not None and not refresh:
+        return _index
+    with _index_lock:
+        if _index is None or refresh:
+            started = time.perf_counter()
+            try:
+                from backend.services.course_dedup import load_course_clusters
+                clusters = load_course_clusters()
+            except Exception as e:
+                logger.warning(f"Course clusters unavailable, near-duplicates will not be collapsed: {e}")
+                clusters = {}
+            _index = CourseIndex(load_course_rows(), clusters)
+            logger.info(f"Course index ready in {time.perf_counter() - started:.2f}s")
+    return _index
@@ -3,14 +3,54 @@ import json
 import logging
 import pandas as pd
 from backend.database import get_snowflake_connection
+from backend.services.admission import get_limiter
+from backend.services.deadline import SEARCH_MIN_BUDGET, execute, has_budget, mark_degraded
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
-def get_course_recommendations(target_role, user_id=None, resume_id=None):
+RATING_SCALE = "Rating scale: 1 = No experience, 2 = Basic knowledge, 3 = Intermediate, 4 = Advanced, 5 = Expert."
+
+# What to ask Cortex Search for, per coarse rating profile (see learning_path_materializer.rating_profile)
+PROFILE_GUIDANCE = {
+    "beginner": (
+        "Most of my skills are rated 1 or 2, so I am just starting out. "
+        "Please recommend beginner-level, foundational courses that build the core concepts first, "
+        "followed by a few intermediate courses to grow into."
+    ),
+    "intermediate": (
+        "Most of my skills are rated around 3, indicating a working knowledge. "
+        "Please recommend intermediate-level courses that strengthen practical skills, "
+        "plus some advanced courses to stretch into, and only the beginner courses needed to fill gaps."
+    ),
+    "advanced": (
+        "All my skills are rated 4 or 5, indicating a strong foundation. "
+        "Please recommend advanced-level, expert-level, or specialized courses. "
+        "Include degree-level, Nanodegree, or professional certificate programs if available. "
+        "Focus on deepening expertise, advanced projects, and real-world applications."
+    ),
+}
+
+
+def rating_value(value) -> float:
+    """A 1-5 rating as a number; unparseable values ("", "n/a", None) count as 0."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def rating_guidance(ratings_dict):
+    """Query guidance for a set of 1-5 skill ratings, by the coarse profile they fall into."""
+    from backend.services.learning_path_materializer import rating_profile
+    return PROFILE_GUIDANCE[rating_profile(ratings_dict)]
+
+
+def get_course_recommendations(target_role, user_id=None, resume_id=None, skill_ratings=None):
     """
     Get recommended courses using the Snowflake Cortex Search query with specific service,
     taking into account either missing skills or skill ratings for query focus.
+    Ratings passed in skill_ratings are used directly instead of being looked up by user_id.
     """
     logger.info(f"Getting recommended courses for role: {target_role}")
     conn = None
@@ -34,11 +74,11 @@ def get_course_recommendations(target_role, user_id=None, resume_id=None):
         # 1) Use missing skills if provided
         if resume_id:
             try:
-                cur.execute(f"""
+                cur.execute("""
                 SELECT TARGET_ROLE, MISSING_SKILLS
                 FROM SKILLPATH_DB.PUBLIC.RESUMES
-                WHERE ID = '{resume_id}'
-                """)
+                WHERE ID = %s
+                """, (resume_id,))
                 tgt, raw_missing = cur.fetchone() or (None, None)
                 if raw_missing:
                     missing_skills = json.loads(raw_missing) if isinstance(raw_missing, str) else raw_missing
@@ -46,59 +86,65 @@ def get_course_recommendations(target_role, user_id=None, resume_id=None):
                         skill_query_text = (
                             f". My main skill gaps are: {', '.join(missing_skills[:5])}. Please recommend beginner, intermediate, and advanced-level courses that cover these skills, including practical and degree-level options where available."
                         )
-                        logger.debug(f"Using missing skills for query: {skill_query_text}")
+                        logger.debug("Using missing skills for query: %s", skill_query_text)
             except Exception:
                 logger.error("Error fetching missing skills", exc_info=True)
 
-        # 2) If no missing skills, fetch skill ratings
+        # 2) Use skill ratings supplied by the caller
+        elif skill_ratings:
+            ratings_dict = dict(skill_ratings)
+            formatted = ", ".join([f"{skill} ({rating})" for skill, rating in ratings_dict.items()])
+            skill_query_text = f". My self-assessed skill ratings are: {formatted}. {RATING_SCALE} {rating_guidance(ratings_dict)}"
+            logger.debug("Using supplied skill ratings for query: %s", skill_query_text)
+
+        # 3) If no missing skills, fetch skill ratings
         elif user_id:
             try:
-                cur.execute(f"""
+                cur.execute("""
                 SELECT SKILL_RATINGS
                 FROM SKILLPATH_DB.PROCESSED_DATA.LEARNING_PATHS
-                WHERE ID = '{user_id}'
+                WHERE ID = %s
                 ORDER BY CREATED_AT DESC
                 LIMIT 1
-                """)
+                """, (user_id,))
                 raw = cur.fetchone()[0] if cur.rowcount else None
                 if raw:
                     ratings_dict = json.loads(raw) if isinstance(raw, str) else raw
-                    logger.debug(f"Skill ratings fetched: {ratings_dict}")
+                    logger.debug("Skill ratings fetched: %s", ratings_dict)
 
                     formatted = ", ".join([f"{skill} ({rating})" for skill, rating in ratings_dict.items()])
-                    skill_query_text = (
-                        f". My self-assessed skill ratings are: {formatted}. "
-                        "Rating scale: 1 = No experience, 2 = Basic knowledge, 3 = Intermediate, 4 = Advanced, 5 = Expert. "
-                        "If most of my skills are rated 1–2, please recommend beginner and intermediate-level courses to build a solid foundation. "
-                        "If I have some skills rated 3–5, include advanced-level, Nanodegree, or specialized courses to deepen my expertise."
-                    )
-                    logger.debug(f"Using skill ratings for query: {skill_query_text}")
+                    skill_query_text = f". My self-assessed skill ratings are: {formatted}. {RATING_SCALE} {rating_guidance(ratings_dict)}"
+                    logger.debug("Using skill ratings for query: %s", skill_query_text)
                 else:
                     logger.warning("No skill ratings found for the given user ID")
             except Exception:
                 logger.error("Error fetching skill ratings", exc_info=True)
 
-        # 3) Fallback if neither missing_skills nor user_id provided
+        # 4) Fallback if neither missing_skills nor user_id provided
         if not skill_query_text:
             skill_query_text = (
                 ". Recommend courses across beginner, intermediate, and advanced levels "
                 "to help users at any stage of their learning journey."
             )
-            logger.debug(f"Using default query focus: {skill_query_text}")
+            logger.debug("Using default query focus: %s", skill_query_text)
 
-        # Prepare a skill ratings string for the query
-        skill_ratings_str = ""
-        if ratings_dict:
-            skill_ratings_str = ", ".join([f"{skill} ({rating})" for skill, rating in ratings_dict.items()])
-        else:
-            skill_ratings_str = "Python (4), SQL (4), Machine Learning (4), Data Visualization (4), Cloud Computing (4)"
+        # The query focus follows the missing skills or the rating profile, so beginner,
+        # intermediate and advanced users get different plans
+        query_text = f"I am targeting a career as a {target_role}{skill_query_text}"
         
         # Log what we're using for the query
         logger.info(f"Using target_role: {target_role}")
-        logger.info(f"Using skill_ratings: {skill_ratings_str}")
+        logger.debug("Using query text: %s", query_text)
             
-        # Build and execute Cortex Search query - using the exact format that works in Snowflake
-        query = f"""
+        # Build and execute Cortex Search query. Skill names and the role come from the
+        # caller, so the search request is built with json.dumps and bound as a parameter
+        # (with parameters, a literal % in the statement is written %%)
+        search_request = json.dumps({
+            "query": query_text,
+            "columns": ["COURSE_NAME", "DESCRIPTION", "SKILLS", "URL", "LEVEL", "PREREQUISITES", "PLATFORM"],
+            "limit": 20,
+        })
+        query = """
 WITH results AS (
   SELECT 
     course.value:"COURSE_NAME"::string       AS COURSE_NAME,
@@ -110,14 +156,7 @@ WITH results AS (
     course.value:"PLATFORM"::string          AS PLATFORM,
     course.value                             AS RAW_JSON
   FROM TABLE(
-    FLATTEN(INPUT => PARSE_JSON(SNOWFLAKE.CORTEX.SEARCH_PREVIEW(
-      '{service_name}',
-      CONCAT('{{
-        "query": "I am targeting a career as a {target_role}. My self-assessed skill ratings are: {skill_ratings_str}. Rating scale: 1 = No experience, 2 = Basic knowledge, 3 = Intermediate, 4 = Advanced, 5 = Expert. All my skills are rated 4 or 5, indicating a strong foundation. Please recommend advanced-level, expert-level, or specialized courses. Include degree-level, Nanodegree, or professional certificate programs if available. Focus on deepening expertise, advanced projects, and real-world applications.",
-        "columns": ["COURSE_NAME", "DESCRIPTION", "SKILLS", "URL", "LEVEL", "PREREQUISITES", "PLATFORM"],
-        "limit": 20
-      }}')
-    )))
+    FLATTEN(INPUT => PARSE_JSON(SNOWFLAKE.CORTEX.SEARCH_PREVIEW(%s, %s)))
   ) AS result,
   LATERAL FLATTEN(INPUT => result.value) AS course
 ),
@@ -126,9 +165,9 @@ WITH results AS (
 tagged AS (
   SELECT *,
     CASE 
-      WHEN LOWER(LEVEL) LIKE '%advanced%' THEN 'ADVANCED'
+      WHEN LOWER(LEVEL) LIKE '%%advanced%%' THEN 'ADVANCED'
       WHEN LOWER(LEVEL) IN ('intermediate', 'fluency') THEN 'INTERMEDIATE'
-      WHEN LOWER(LEVEL) LIKE '%beginner%' THEN 'BEGINNER'
+      WHEN LOWER(LEVEL) LIKE '%%beginner%%' THEN 'BEGINNER'
       WHEN LOWER(LEVEL) = 'all levels' THEN 'INTERMEDIATE'
       ELSE 'UNKNOWN'
     END AS LEVEL_CATEGORY
@@ -156,8 +195,9 @@ WHERE rn <= 2 AND LEVEL_CATEGORY IN ('BEGINNER', 'INTERMEDIATE', 'ADVANCED')
 ORDER BY LEVEL_CATEGORY;
 """
 
-        logger.debug(f"Executing search query with service {service_name}")
-        cur.execute(query)
+        logger.debug("Executing search query with service %s", service_name)
+        with get_limiter("search").slot():
+            execute(cur, query, (service_name, search_request))
         rows = cur.fetchall()
         cols = [d[0] for d in cur.description]
         df = pd.DataFrame(rows, columns=cols)
@@ -170,7 +210,7 @@ ORDER BY LEVEL_CATEGORY;
             # No filtering for high skill ratings - just logging
             if ratings_dict:
                 # Count how many skills are rated highly (3 or above)
-                high_rated_skills = sum(1 for r in ratings_dict.values() if int(r) >= 3)
+                high_rated_skills = sum(1 for r in ratings_dict.values() if rating_value(r) >= 3)
                 total_skills = len(ratings_dict)
                 logger.info(f"User has {high_rated_skills}/{total_skills} skills rated 3 or higher")
                 
@@ -194,10 +234,19 @@ ORDER BY LEVEL_CATEGORY;
                 logger.warning(f"Missing courses for levels: {missing_levels}")
                 
                 # Special case for ADVANCED courses - try to find some with an advanced-specific query if needed
-                if "ADVANCED" in missing_levels and ratings_dict and any(int(r) >= 3 for r in ratings_dict.values()):
+                wants_advanced = "ADVANCED" in missing_levels and ratings_dict and any(rating_value(r) >= 3 for r in ratings_dict.values())
+                if wants_advanced and not has_budget(SEARCH_MIN_BUDGET):
+                    # A second search would overrun the request's deadline
+                    mark_degraded("advanced_courses_skipped")
+                elif wants_advanced:
                     try:
                         logger.info("Attempting to retrieve ADVANCED courses with specialized query")
-                        advanced_query = f"""
+                        advanced_request = json.dumps({
+                            "query": f"I need ADVANCED level courses for {target_role}. ONLY return courses that are explicitly labeled as ADVANCED level. Focus only on advanced courses.",
+                            "columns": ["COURSE_NAME", "DESCRIPTION", "SKILLS", "URL", "LEVEL", "PREREQUISITES", "PLATFORM"],
+                            "limit": 4,
+                        })
+                        advanced_query = """
                         WITH results AS (
                           SELECT 
                             course.value:"COURSE_NAME"::string       AS COURSE_NAME,
@@ -209,14 +258,7 @@ ORDER BY LEVEL_CATEGORY;
                             course.value:"PLATFORM"::string          AS PLATFORM,
                             course.value                             AS RAW_JSON
                           FROM TABLE(
-                            FLATTEN(INPUT => PARSE_JSON(SNOWFLAKE.CORTEX.SEARCH_PREVIEW(
-                              '{service_name}',
-                              '{{
-                                "query": "I need ADVANCED level courses for {target_role}. ONLY return courses that are explicitly labeled as ADVANCED level. Focus only on advanced courses.",
-                                "columns": ["COURSE_NAME", "DESCRIPTION", "SKILLS", "URL", "LEVEL", "PREREQUISITES", "PLATFORM"],
-                                "limit": 4
-                              }}'
-                            )))
+                            FLATTEN(INPUT => PARSE_JSON(SNOWFLAKE.CORTEX.SEARCH_PREVIEW(%s, %s)))
                           ) AS result,
                           LATERAL FLATTEN(INPUT => result.value) AS course
                         )
@@ -230,12 +272,13 @@ ORDER BY LEVEL_CATEGORY;
                           PLATFORM,
                           'ADVANCED' as LEVEL_CATEGORY
                         FROM results
-                        WHERE LOWER(LEVEL) LIKE '%advanced%'
+                        WHERE LOWER(LEVEL) LIKE '%%advanced%%'
                         LIMIT 2;
                         """
                         
                         # Execute the advanced-specific query
-                        cur.execute(advanced_query)
+                        with get_limiter("search").slot():
+                            execute(cur, advanced_query, (service_name, advanced_request))
                         advanced_rows = cur.fetchall()
                         
                         if advanced_rows:
@@ -251,7 +294,12 @@ ORDER BY LEVEL_CATEGORY;
         except Exception as e:
             logger.error(f"Error analyzing course levels: {e}", exc_info=True)
 
-        return df.to_dict('records')
+        # Collapse near-duplicate courses, then order by prerequisites;
+        # skills the user rated 4+ count as already known
+        from backend.services.course_dedup import collapse_clusters
+        from backend.services.prerequisite_graph import plan_learning_order
+        known_skills = [skill for skill, rating in ratings_dict.items() if rating_value(rating) >= 4]
+        return plan_learning_order(collapse_clusters(df.to_dict('records')), known_skills)
 
     except Exception:
         logger.error("Error in get_course_recommendations", exc_info=True)
@@ -0,0 +1,140 @@
+# File: backend/services/deadline.py
+"""
+Per-request time budgets.
+
+The API sets a deadline for each request (backend/api/deadlines.py) in a
+context variable, which follows the request into the threadpool. Code that
+talks to Snowflake asks how much time is left:
+
+- execute() passes the remaining budget as the statement timeout, so a
+  slow statement is cancelled instead of outliving the request.
+- has_budget() tells a caller whether an LLM attempt or a search still
+  fits; if not, it takes its existing fallback (default skills, fallback
+  courses, the generic plan) at once and calls mark_degraded().
+
+Degraded requests are flagged in the response (X-Degraded header and a
+"degraded" field) and their results are not cached. Parts of a request that
+run side by side (workflow steps) can each run in a nested() budget to learn
+which of them degraded; items of a long stream (batch recommendations) get a
+fresh nested(seconds) budget each, since the stream outlives any one deadline. Outside a request (jobs,
+scripts, benchmarks) there is no deadline: has_budget() is always true and
+statements keep the session timeout.
+
+Settings (environment):
+    LLM_MIN_BUDGET     seconds an LLM attempt needs to be worth starting (5)
+    SEARCH_MIN_BUDGET  seconds a Cortex search needs to be worth starting (2)
+"""
+import contextvars
+import logging
+import math
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+LLM_MIN_BUDGET = float(os.environ.get("LLM_MIN_BUDGET", "5"))
+SEARCH_MIN_BUDGET = float(os.environ.get("SEARCH_MIN_BUDGET", "2"))
+
+
+class RequestBudget:
+    """Deadline of one request (or part of one, with a parent), and the degraded paths it took."""
+
+    def __init__(self, seconds: float, parent: Optional["RequestBudget"] = None):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        self.parent = parent
+        self.degraded: List[str] = []
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+
+_budget: "contextvars.ContextVar[Optional[RequestBudget]]" = contextvars.ContextVar("request_budget", default=None)
+
+
+def start(seconds: float) -> contextvars.Token:
+    """Give the current context a budget of seconds; undo with reset(token)."""
+    return _budget.set(RequestBudget(seconds))
+
+
+def reset(token: contextvars.Token):
+    _budget.reset(token)
+
+
+def current() -> Optional[RequestBudget]:
+    return _budget.get()
+
+
+@contextmanager
+def nested(seconds: Optional[float] = None):
+    """
+    Run a block within the rest of the current deadline, with its own degraded reasons.
+
+    Reasons marked inside the block are recorded on the enclosing budget too.
+    With seconds, the block gets a fresh budget of that length instead, even
+    past the request's own deadline or outside a request (each item of a long
+    stream). Yields the nested RequestBudget, or None without a deadline.
+    """
+    parent = _budget.get()
+    if seconds is None:
+        if parent is None:
+            yield None
+            return
+        seconds = parent.remaining()
+    token = _budget.set(RequestBudget(seconds, parent=parent))
+    try:
+        yield _budget.get()
+    finally:
+        _budget.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None without a deadline."""
+    budget = _budget.get()
+    return budget.remaining() if budget else None
+
+
+def has_budget(needed: float) -> bool:
+    """Whether at least needed seconds are left (always true without a deadline)."""
+    left = remaining()
+    return left is None or left >= needed
+
+
+def statement_timeout() -> Optional[int]:
+    """Statement timeout in whole seconds for the remaining budget, or None without a deadline."""
+    left = remaining()
+    if left is None:
+        return None
+    return max(1, math.floor(left))
+
+
+def execute(cursor, query, params=None):
+    """cursor.execute, cancelled by Snowflake when the request's budget runs out."""
+    timeout = statement_timeout()
+    if timeout is None:
+        return cursor.execute(query, params) if params is not None else cursor.execute(query)
+    return cursor.execute(query, params, timeout=timeout)
+
+
+def mark_degraded(reason: str):
+    """Record that the current request fell back to a degraded result (no-op outside requests)."""
+    budget = _budget.get()
+    if budget is not None and reason not in budget.degraded:
+        logger.warning(f"Degraded response ({reason}), {budget.remaining():.1f}s of {budget.seconds:g}s left")
+    while budget is not None:
+        if reason not in budget.degraded:
+            budget.degraded.append(reason)
+        budget = budget.parent
+
+
+def is_degraded() -> bool:
+    budget = _budget.get()
+    return bool(budget and budget.degraded)
+
+
+def degraded_reasons() -> List[str]:
+    budget = _budget.get()
+    return list(budget.degraded) if budget else []
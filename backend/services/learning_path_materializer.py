@@ -0,0 +1,294 @@
+# File: backend/services/learning_path_materializer.py
+"""
+Nightly job that precomputes complete beginner-to-advanced learning paths for the
+most requested target roles, one per coarse skill-rating profile, and stores them
+versioned in Snowflake so /user-input/learning-path can serve them instantly.
+
+Run it from cron (or any scheduler) once a night from the repository root:
+
+    python -m backend.services.learning_path_materializer --top-n 25
+"""
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from backend.database import get_snowflake_connection
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+MATERIALIZED_TABLE = "SKILLPATH_DB.PROCESSED_DATA.MATERIALIZED_LEARNING_PATHS"
+
+# Coarse rating profiles and the synthetic rating used to build each one
+RATING_PROFILES = {
+    "beginner": 1,
+    "intermediate": 3,
+    "advanced": 5,
+}
+
+# How long a loaded set of plans is served before checking for a newer version
+CACHE_TTL_SECONDS = 3600
+
+
+def canonical_role(role: str) -> str:
+    """Canonical key for a target role ("  Data-Engineer " -> "data engineer")."""
+    return " ".join(re.sub(r"[^\w+#]+", " ", role or "").casefold().split())
+
+
+def rating_profile(skill_ratings: Optional[Dict[str, int]]) -> str:
+    """Bucket a user's 1-5 skill ratings into one of RATING_PROFILES."""
+    ratings = []
+    for value in (skill_ratings or {}).values():
+        try:
+            ratings.append(float(value))
+        except (TypeError, ValueError):
+            continue
+    if not ratings:
+        return "beginner"
+    average = sum(ratings) / len(ratings)
+    if average < 2.5:
+        return "beginner"
+    if average < 3.75:
+        return "intermediate"
+    return "advanced"
+
+
+def create_materialized_table():
+    """Ensure the materialized learning path table exists."""
+    conn = get_snowflake_connection()
+    if conn:
+        cur = None
+        try:
+            cur = conn.cursor()
+            cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS {MATERIALIZED_TABLE} (
+                ROLE_KEY VARCHAR(255),
+                PROFILE VARCHAR(32),
+                VERSION VARCHAR(32),
+                PLAN VARIANT,
+                CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
+            );
+            """)
+            conn.commit()
+        finally:
+            if cur:
+                cur.close()
+            conn.close()
+
+
+def get_top_requested_roles(limit: int = 25) -> List[str]:
+    """
+    Get the most requested canonical target roles across learning paths and resumes.
+
+    Args:
+        limit (int): Number of roles to return
+
+    Returns:
+        list: Canonical role keys, most requested first
+    """
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+        SELECT TARGET_ROLE FROM SKILLPATH_DB.PROCESSED_DATA.LEARNING_PATHS
+        UNION ALL
+        SELECT TARGET_ROLE FROM SKILLPATH_DB.PUBLIC.RESUMES
+        """)
+        counts: Dict[str, int] = {}
+        for (role,) in cur.fetchall():
+            key = canonical_role(role)
+            if key:
+                counts[key] = counts.get(key, 0) + 1
+        return [role for role, _ in sorted(counts.items(), key=lambda x: (-x[1], x[0]))[:limit]]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def build_plan(role: str, profile: str) -> Dict:
+    """
+    Assemble a complete learning path for a role and rating profile.
+
+    This is the same work the live learning-path flow does (role skills, then a
+    Cortex Search course query), with synthetic ratings standing in for the user's.
+
+    Args:
+        role (str): Canonical target role
+        profile (str): One of RATING_PROFILES
+
+    Returns:
+        dict: Plan with skills and courses grouped by LEVEL_CATEGORY
+    """
+    from backend.services.skill_service import get_top_skills_for_role
+    from backend.services.course_service import get_course_recommendations
+    from backend.services.career_transition_service import get_default_skills_for_role
+
+    try:
+        skills = get_top_skills_for_role(role)
+    except Exception as e:
+        logger.warning(f"Falling back to default skills for {role}: {e}")
+        skills = get_default_skills_for_role(role)
+
+    ratings = {skill: RATING_PROFILES[profile] for skill in skills}
+    courses = get_course_recommendations(role, skill_ratings=ratings)
+
+    return {
+        "role": role,
+        "profile": profile,
+        "skills": skills,
+        "courses": courses,
+    }
+
+
+def run_materialization(top_n: int = 25) -> str:
+    """
+    Precompute and store plans for the top N roles and every rating profile.
+
+    Returns:
+        str: The version written
+    """
+    version = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    create_materialized_table()
+    roles = get_top_requested_roles(top_n)
+    logger.info(f"Materializing learning paths version {version} for {len(roles)} roles")
+
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        for role in roles:
+            for profile in RATING_PROFILES:
+                started = time.perf_counter()
+                try:
+                    plan = build_plan(role, profile)
+                except Exception as e:
+                    logger.error(f"Failed to build plan for {role}/{profile}: {e}")
+                    continue
+                plan["version"] = version
+                cur.execute(
+                    f"""
+                    INSERT INTO {MATERIALIZED_TABLE} (ROLE_KEY, PROFILE, VERSION, PLAN)
+                    SELECT %s, %s, %s, PARSE_JSON(%s)
+                    """,
+                    (role, profile, version, json.dumps(plan, default=str)),
+                )
+                conn.commit()
+                logger.info(f"Stored {role}/{profile} in {time.perf_counter() - started:.1f}s")
+    finally:
+        cur.close()
+        conn.close()
+    return version
+
+
+# -------------------- Serving --------------------
+
+_plans: Dict[Tuple[str, str], Dict] = {}
+_plans_loaded_at = 0.0
+_plans_lock = threading.Lock()
+
+
+def load_materialized_plans() -> Dict[Tuple[str, str], Dict]:
+    """Load the latest version of every (role, profile) plan from Snowflake."""
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"""
+        SELECT ROLE_KEY, PROFILE, PLAN
+        FROM {MATERIALIZED_TABLE}
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY ROLE_KEY, PROFILE ORDER BY VERSION DESC) = 1
+        """)
+        plans = {}
+        for role_key, profile, plan in cur.fetchall():
+            plans[(role_key, profile)] = json.loads(plan) if isinstance(plan, str) else plan
+        return plans
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_materialized_plans() -> Dict[Tuple[str, str], Dict]:
+    """Return all precomputed plans by (role key, profile), refreshing the cache when stale."""
+    global _plans, _plans_loaded_at
+    if time.monotonic() - _plans_loaded_at > CACHE_TTL_SECONDS:
+        with _plans_lock:
+            if time.monotonic() - _plans_loaded_at > CACHE_TTL_SECONDS:
+                try:
+                    _plans = load_materialized_plans()
+                    logger.info(f"Loaded {len(_plans)} materialized learning paths")
+                except Exception as e:
+                    logger.error(f"Could not load materialized learning paths: {e}")
+                _plans_loaded_at = time.monotonic()
+    return _plans
+
+
+def get_materialized_plan(role: str, profile: str) -> Optional[Dict]:
+    """Return the precomputed plan for a role/profile, refreshing the cache when stale."""
+    return get_materialized_plans().get((canonical_role(role), profile))
+
+
+def personalize_plan(plan: Dict, current_skills: List[str],
+                     skill_ratings: Optional[Dict[str, int]] = None) -> Dict:
+    """
+    Apply the per-user diff to a materialized plan.
+
+    Skills the user already has (listed in current_skills or rated 4+) are marked
+    as known, the remaining skills are ordered weakest first, and courses that only
+    teach known skills are dropped while keeping at least one course per level.
+    The remaining courses are re-ordered by prerequisites against the known skills.
+
+    Returns:
+        dict: A personalized copy of the plan
+    """
+    from backend.services.skill_normalizer import get_skill_normalizer
+
+    # Skills are compared by canonical ID, so "JS" in a rating covers "JavaScript" in the plan
+    normalizer = get_skill_normalizer()
+    ratings = {normalizer.skill_id(k): v for k, v in (skill_ratings or {}).items()}
+    known_names = list(current_skills or [])
+    known_names.extend(k for k, v in (skill_ratings or {}).items() if _as_int(v) >= 4)
+    known = normalizer.ids(known_names)
+
+    focus_skills = [s for s in plan.get("skills", []) if normalizer.skill_id(s) not in known]
+    focus_skills.sort(key=lambda s: _as_int(ratings.get(normalizer.skill_id(s), 0)))
+
+    courses = []
+    kept_levels = set()
+    for course in plan.get("courses", []):
+        course_skills = normalizer.ids((course.get("SKILLS") or "").split(","))
+        level = course.get("LEVEL_CATEGORY")
+        if course_skills and course_skills <= known and level in kept_levels:
+            continue
+        kept_levels.add(level)
+        courses.append(course)
+
+    from backend.services.prerequisite_graph import plan_learning_order
+    courses = plan_learning_order(courses, known_names)
+
+    personalized = dict(plan)
+    personalized.update({
+        "known_skills": [s for s in plan.get("skills", []) if normalizer.skill_id(s) in known],
+        "focus_skills": focus_skills,
+        "courses": courses,
+    })
+    return personalized
+
+
+def _as_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+if __name__ == "__main__":
+    from backend.logging_config import setup_logging
+
+    setup_logging("learning_path_materializer")
+    parser = argparse.ArgumentParser(description="Materialize learning paths for the most requested roles")
+    parser.add_argument("--top-n", type=int, default=25, help="Number of roles to precompute")
+    args = parser.parse_args()
+    print(f"Materialized learning paths version {run_materialization(args.top_n)}")
@@ -105,8 +105,8 @@ def store_learning_path(data):
             SELECT %s, %s, %s, PARSE_JSON(%s), CURRENT_TIMESTAMP()
             """
             
-            logger.debug(f"Executing query with ratings: {insert_query}")
-            logger.debug(f"Values: {record_id}, {name}, {target_role}, {ratings_json}")
+            logger.debug("Executing query with ratings: %s", insert_query)
+            logger.debug("Values: %s, %s, %s, %s", record_id, name, target_role, ratings_json)
             
             cursor.execute(insert_query, (record_id, name, target_role, ratings_json))
         else:
@@ -117,8 +117,8 @@ def store_learning_path(data):
             SELECT %s, %s, %s, PARSE_JSON('{}'), CURRENT_TIMESTAMP()
             """
             
-            logger.debug(f"Executing simple query: {insert_query}")
-            logger.debug(f"Values: {record_id}, {name}, {target_role}")
+            logger.debug("Executing simple query: %s", insert_query)
+            logger.debug("Values: %s, %s, %s", record_id, name, target_role)
             
             cursor.execute(insert_query, (record_id, name, target_role))
         
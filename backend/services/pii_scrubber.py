@@ -0,0 +1,370 @@
+# File: backend/services/pii_scrubber.py
+"""
+Linear-time detection and redaction of personal details in resumes.
+
+The text is split into whitespace-separated tokens once, and every detector
+looks at a bounded window of tokens from each position (an email is one
+token, a phone number at most MAX_PHONE_TOKENS, a street address at most
+MAX_ADDRESS_TOKENS). No pattern can backtrack over an unbounded span, so the
+cost of a scan is proportional to the length of the text whatever its
+content, including inputs crafted against backtracking regexes.
+
+Matches carry their kind and character offsets. What happens to each kind
+is a redaction policy: "remove", "mask" (replace with a placeholder such as
+[EMAIL]) or "keep". The default policy removes everything and can be
+overridden with PII_REDACTION_POLICY, e.g. "email=mask,phone=mask,address=remove".
+"""
+import logging
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+EMAIL = "email"
+PHONE = "phone"
+ADDRESS = "address"
+PII_KINDS = (EMAIL, PHONE, ADDRESS)
+
+REMOVE = "remove"
+MASK = "mask"
+KEEP = "keep"
+ACTIONS = (REMOVE, MASK, KEEP)
+
+PLACEHOLDERS = {EMAIL: "[EMAIL]", PHONE: "[PHONE]", ADDRESS: "[ADDRESS]"}
+
+MAX_EMAIL_CHARS = 254
+MAX_PHONE_CHARS = 24
+MAX_PHONE_TOKENS = 5
+MAX_STREET_WORDS = 6
+MAX_ADDRESS_TOKENS = 16
+
+_TOKEN = re.compile(r"\S+")
+# Removed by clean_text, as in the previous clean_resume_text
+_SPECIAL = re.compile(r"[^a-zA-Z0-9.,!?;:'\-\s]+")
+
+# Applied to single, length-capped tokens only
+_EMAIL_LOCAL = re.compile(r"[A-Za-z0-9._%+\-]{1,64}")
+_DOMAIN_LABEL = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9\-]{0,61}[A-Za-z0-9])?")
+_HOUSE_NUMBER = re.compile(r"\d{1,5}[A-Za-z]?")
+_ZIP = re.compile(r"\d{5}(?:-\d{4})?")
+_UNIT_NUMBER = re.compile(r"#?[A-Za-z0-9\-]{1,6}")
+
+_LEADING = "([{<\"'"
+_TRAILING = ".,;:!?)]}>\"'"
+_PHONE_CHARS = frozenset("0123456789()+-./")
+
+STREET_SUFFIXES = frozenset("""
+    st street ave av avenue rd road blvd boulevard ln lane dr drive way ct court pl place
+    pkwy parkway hwy highway ter terrace cir circle sq square trl trail loop row alley aly
+    crescent cres expressway expy freeway fwy pike plaza plz commons walk
+""".split())
+UNIT_WORDS = frozenset("apt apartment suite ste unit fl floor rm room bldg building".split())
+US_STATES = frozenset("""
+    AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV NH NJ
+    NM NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY DC PR
+""".split())
+
+
+class PiiMatch(NamedTuple):
+    """One detected personal detail."""
+    kind: str
+    start: int
+    end: int
+    text: str
+
+
+def parse_policy(spec: Optional[str], base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Parse "kind=action,..." into a policy, starting from base (default: remove all).
+
+    Raises:
+        ValueError: On unknown kinds or actions
+    """
+    policy = dict(base or {kind: REMOVE for kind in PII_KINDS})
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        kind, _, action = part.partition("=")
+        kind, action = kind.strip().lower(), action.strip().lower()
+        if kind not in PII_KINDS or action not in ACTIONS:
+            raise ValueError(f"Invalid PII policy entry: {part.strip()}")
+        policy[kind] = action
+    return policy
+
+
+DEFAULT_POLICY = parse_policy(os.environ.get("PII_REDACTION_POLICY"))
+
+
+def _core(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Token bounds without surrounding brackets, quotes and trailing punctuation."""
+    while start < end and text[start] in _LEADING:
+        start += 1
+    while end > start and text[end - 1] in _TRAILING:
+        end -= 1
+    return start, end
+
+
+def _email(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+    start, end = _core(text, start, end)
+    if end - start > MAX_EMAIL_CHARS + 7:
+        return None
+    token = text[start:end]
+    if token[:7].lower() == "mailto:":
+        start, token = start + 7, token[7:]
+    local, at, domain = token.partition("@")
+    if not at or "@" in domain or not _EMAIL_LOCAL.fullmatch(local):
+        return None
+    labels = domain.split(".")
+    if len(labels) < 2 or not labels[-1].isalpha() or len(labels[-1]) < 2:
+        return None
+    if not all(_DOMAIN_LABEL.fullmatch(label) for label in labels):
+        return None
+    return start, end
+
+
+def _phone_core(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """Bounds of a token made only of phone characters, allowing a "Phone:" style label."""
+    # Parentheses belong to the number, so only trailing separators are stripped
+    while end > start and text[end - 1] in ".,;:":
+        end -= 1
+    if end - start > MAX_PHONE_CHARS + 8:
+        return None
+    colon = text.rfind(":", start, end)
+    if colon != -1:
+        start = colon + 1
+    if start >= end:
+        return None
+    for ch in text[start:end]:
+        if ch not in _PHONE_CHARS:
+            return None
+    return start, end
+
+
+def _valid_phone(number: str) -> bool:
+    digits = sum(ch.isdigit() for ch in number)
+    groups = [g for g in re.split(r"\D+", number) if g]
+    if not groups:
+        return False
+    if number.startswith("+"):
+        return 8 <= digits <= 15 and len(groups[0]) <= 3 and all(len(g) <= 4 for g in groups[1:])
+    if len(groups) == 1:
+        return digits == 10
+    if not all(len(g) <= 4 for g in groups):
+        return False
+    return digits == 10 or (digits == 11 and groups[0] == "1")
+
+
+def _same_line(text: str, end: int, next_start: int) -> bool:
+    return next_start - end <= 2 and "\n" not in text[end:next_start]
+
+
+def _phone(text: str, tokens: List[Tuple[int, int]], i: int) -> Optional[Tuple[int, int, int]]:
+    """Longest phone number starting at token i: (start, end, last token index)."""
+    first = _phone_core(text, *tokens[i])
+    if first is None:
+        return None
+    cores = [first]
+    j = i
+    while len(cores) < MAX_PHONE_TOKENS and j + 1 < len(tokens) and _same_line(text, tokens[j][1], tokens[j + 1][0]):
+        core = _phone_core(text, *tokens[j + 1])
+        if core is None:
+            break
+        cores.append(core)
+        j += 1
+    # Running digit totals let spans that cannot hold 8-15 digits skip validation
+    digits = [0]
+    for start, end in cores:
+        digits.append(digits[-1] + sum(ch.isdigit() for ch in text[start:end]))
+    for count in range(len(cores), 0, -1):
+        if not 8 <= digits[count] <= 15:
+            continue
+        start, end = cores[0][0], cores[count - 1][1]
+        if _valid_phone(text[start:end]):
+            return start, end, i + count - 1
+    return None
+
+
+def _word(text: str, start: int, end: int) -> str:
+    start, end = _core(text, start, end)
+    return text[start:end]
+
+
+def _state_zip(text: str, tokens: List[Tuple[int, int]], k: int) -> Optional[int]:
+    """If tokens k, k+1 are "ST 12345", the index of the last one (ZIP optional after a state)."""
+    if k >= len(tokens) or _word(text, *tokens[k]) not in US_STATES:
+        return None
+    if k + 1 < len(tokens) and _ZIP.fullmatch(_word(text, *tokens[k + 1])):
+        return k + 1
+    return k
+
+
+def _address(text: str, tokens: List[Tuple[int, int]], i: int) -> Optional[Tuple[int, int, int]]:
+    """
+    Street address starting at token i: a house number, up to MAX_STREET_WORDS words
+    ending in a street suffix, an optional unit and an optional "City, ST 12345".
+    """
+    n = len(tokens)
+    first = _word(text, *tokens[i])
+    if first.lower() in ("po", "p.o", "p.o.") and i + 2 < n \
+            and _word(text, *tokens[i + 1]).lower() == "box" and _word(text, *tokens[i + 2]).isdigit():
+        last = i + 2
+    elif _HOUSE_NUMBER.fullmatch(first):
+        last = None
+        for k in range(i + 1, min(n, i + 1 + MAX_STREET_WORDS)):
+            word = _word(text, *tokens[k])
+            # Street names are capitalized ("5th", "Main", "Old Mill")
+            if not word or not (word[0].isupper() or word[0].isdigit()):
+                return None
+            if word.rstrip(".").lower() in STREET_SUFFIXES and k > i + 1:
+                last = k
+                break
+            if text[tokens[k][1] - 1] == ",":
+                return None
+        if last is None:
+            return None
+    else:
+        return None
+
+    # Unit: "Apt 4B", "Suite 200", "#12"
+    if last + 1 < n:
+        word = _word(text, *tokens[last + 1])
+        if word.startswith("#") and _UNIT_NUMBER.fullmatch(word):
+            last += 1
+        elif word.rstrip(".").lower() in UNIT_WORDS and last + 2 < n \
+                and _UNIT_NUMBER.fullmatch(_word(text, *tokens[last + 2])):
+            last += 2
+
+    # City, ST 12345: up to three city words, a comma, then a state
+    limit = min(n, i + MAX_ADDRESS_TOKENS)
+    k = last + 1
+    for _ in range(3):
+        if k >= limit:
+            break
+        if text[tokens[k - 1][1] - 1] == ",":
+            found = _state_zip(text, tokens, k)
+            if found is not None:
+                return tokens[i][0], _core(text, *tokens[found])[1], found
+        word = _word(text, *tokens[k])
+        if not word[:1].isupper():
+            break
+        k += 1
+    if k < limit and text[tokens[k - 1][1] - 1] == ",":
+        found = _state_zip(text, tokens, k)
+        if found is not None:
+            return tokens[i][0], _core(text, *tokens[found])[1], found
+    return tokens[i][0], _core(text, *tokens[last])[1], last
+
+
+def _city_state_zip(text: str, tokens: List[Tuple[int, int]], i: int) -> Optional[Tuple[int, int, int]]:
+    """ "Boston, MA 02115" starting at token i (a ZIP is required for a bare city)."""
+    n = len(tokens)
+    if not _word(text, *tokens[i])[:1].isupper():
+        return None
+    for k in range(i, min(n - 2, i + 3)):
+        if text[tokens[k][1] - 1] == ",":
+            found = _state_zip(text, tokens, k + 1)
+            if found is not None and found == k + 2:
+                return tokens[i][0], _core(text, *tokens[found])[1], found
+            return None
+        if not _word(text, *tokens[k])[:1].isupper():
+            return None
+    return None
+
+
+def find_pii(text: str) -> List[PiiMatch]:
+    """
+    Detect emails, phone numbers and postal addresses in one pass.
+
+    Args:
+        text (str): Resume text
+
+    Returns:
+        list: PiiMatch tuples in text order, non-overlapping
+    """
+    tokens = [m.span() for m in _TOKEN.finditer(text or "")]
+    matches = []
+    i = 0
+    while i < len(tokens):
+        start, end = tokens[i]
+        head = text[start:start + 4].lower()
+        if text.find("@", start, end) != -1:
+            span = _email(text, start, end)
+            if span:
+                matches.append(PiiMatch(EMAIL, span[0], span[1], text[span[0]:span[1]]))
+                i += 1
+                continue
+        found = None
+        kind = None
+        if head[0].isdigit() or head.startswith(("po", "p.o.")):
+            found, kind = _address(text, tokens, i), ADDRESS
+        if found is None:
+            found, kind = _phone(text, tokens, i), PHONE
+        if found is None and text[start].isupper():
+            found, kind = _city_state_zip(text, tokens, i), ADDRESS
+        if found is not None:
+            match_start, match_end, last = found
+            matches.append(PiiMatch(kind, match_start, match_end, text[match_start:match_end]))
+            i = last + 1
+            continue
+        i += 1
+    return matches
+
+
+def redact(text: str, matches: Optional[List[PiiMatch]] = None, policy: Optional[Dict[str, str]] = None) -> str:
+    """
+    Apply a redaction policy to detected matches.
+
+    Args:
+        text (str): Original text
+        matches (list, optional): Output of find_pii; detected if omitted
+        policy (dict, optional): kind -> "remove" | "mask" | "keep"; defaults to DEFAULT_POLICY
+
+    Returns:
+        str: Text with matches removed or masked
+    """
+    text = text or ""
+    policy = policy or DEFAULT_POLICY
+    matches = find_pii(text) if matches is None else matches
+    parts = []
+    position = 0
+    for match in matches:
+        action = policy.get(match.kind, REMOVE)
+        if action == KEEP:
+            continue
+        parts.append(text[position:match.start])
+        if action == MASK:
+            parts.append(PLACEHOLDERS[match.kind])
+        position = match.end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def clean_text(text: str, policy: Optional[Dict[str, str]] = None) -> str:
+    """
+    Redact personal details, drop special characters and collapse whitespace.
+
+    Placeholders of masked matches are kept intact; kept matches are cleaned
+    like the text around them.
+
+    Args:
+        text (str): Resume text
+        policy (dict, optional): Redaction policy; defaults to DEFAULT_POLICY
+
+    Returns:
+        str: Cleaned text
+    """
+    text = text or ""
+    policy = policy or DEFAULT_POLICY
+    parts = []
+    position = 0
+    for match in find_pii(text):
+        action = policy.get(match.kind, REMOVE)
+        if action == KEEP:
+            continue
+        parts.append(_SPECIAL.sub("", text[position:match.start]))
+        parts.append(f" {PLACEHOLDERS[match.kind]} " if action == MASK else " ")
+        position = match.end
+    parts.append(_SPECIAL.sub("", text[position:]))
+    return " ".join("".join(parts).split())
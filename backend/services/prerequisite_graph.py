@@ -0,0 +1,333 @@
+# File: backend/services/prerequisite_graph.py
+"""
+Skill prerequisite graph and learning-order planner.
+
+The graph is built offline from the PREREQUISITES and SKILLS columns of
+ALL_COURSES_COMBINED: every course contributes "prerequisite -> taught skill"
+votes, edges with enough support are kept, and cycles are broken by dropping the
+weakest edge. Each course's own prerequisites are kept too, keyed by URL: the
+recommendation search returns PREREQUISITES and the planner uses it directly, but
+courses from the career transition search and the course index arrive without it.
+Everything is stored as a compact CSR .npz artifact and loaded once at startup.
+
+Build it (from the project root) after the dbt enrichment models have run:
+
+    python -m backend.services.prerequisite_graph --min-support 3
+"""
+import argparse
+import heapq
+import logging
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.services.artifacts import artifact_path
+from backend.services.course_index import COURSES_TABLE, normalize_skill, split_skills
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+GRAPH_PATH = artifact_path("prerequisite_graph.npz", "PREREQ_GRAPH_PATH")
+
+# Keep at most this many prerequisites per skill (strongest first)
+MAX_PARENTS = 8
+
+LEVEL_RANK = {"BEGINNER": 0, "INTERMEDIATE": 1, "ADVANCED": 2}
+MAX_STAGE = 2
+
+_QUALIFIERS = re.compile(
+    r"^(?:basic|basics of|intermediate|advanced|some|prior|solid|strong|working|"
+    r"understanding of|knowledge of|familiarity with|experience with|experience in|"
+    r"proficiency in|fundamentals of|foundations of|introductory)\s+"
+)
+_NO_PREREQS = ("no prerequisite", "none", "no prior", "n/a")
+
+
+def normalize_prerequisite(text: str) -> str:
+    """Reduce an LLM-generated prerequisite ("Basic knowledge of Python") to a skill key."""
+    key = normalize_skill(text)
+    previous = None
+    while key and key != previous:
+        previous = key
+        key = _QUALIFIERS.sub("", key)
+    return key
+
+
+def split_prerequisites(raw: Optional[str]) -> List[str]:
+    """Split a PREREQUISITES value into skill keys, ignoring "no prerequisites" answers."""
+    if not raw or str(raw).strip().lower().startswith(_NO_PREREQS):
+        return []
+    keys = []
+    for part in split_skills(raw):
+        key = normalize_prerequisite(part)
+        if key and not key.startswith(_NO_PREREQS) and key not in keys:
+            keys.append(key)
+    return keys
+
+
+class PrerequisiteGraph:
+    """
+    Directed acyclic graph of skill -> prerequisite skills in CSR form, plus the
+    per-course prerequisite lists (course URL -> skill ids) in the same layout.
+    """
+
+    def __init__(self, vocab: List[str], indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 course_urls: Optional[List[str]] = None, course_indptr: Optional[np.ndarray] = None,
+                 course_indices: Optional[np.ndarray] = None):
+        self.vocab = list(vocab)
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.course_urls = list(course_urls or [])
+        self.course_indptr = course_indptr if course_indptr is not None else np.zeros(1, dtype=np.int64)
+        self.course_indices = course_indices if course_indices is not None else np.zeros(0, dtype=np.int32)
+        self._ids = {name: i for i, name in enumerate(self.vocab)}
+        self._course_ids = {url: i for i, url in enumerate(self.course_urls)}
+
+    @classmethod
+    def empty(cls) -> "PrerequisiteGraph":
+        return cls([], np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32))
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.indices.size)
+
+    def prerequisites(self, skill: str) -> List[str]:
+        """Direct prerequisites of a skill, strongest first."""
+        skill_id = self._ids.get(normalize_skill(skill))
+        if skill_id is None:
+            return []
+        start, end = self.indptr[skill_id], self.indptr[skill_id + 1]
+        return [self.vocab[i] for i in self.indices[start:end]]
+
+    def course_prerequisites(self, url: Optional[str]) -> List[str]:
+        """Prerequisite skill keys recorded for a course, looked up by URL."""
+        course_id = self._course_ids.get(url)
+        if course_id is None:
+            return []
+        start, end = self.course_indptr[course_id], self.course_indptr[course_id + 1]
+        return [self.vocab[i] for i in self.course_indices[start:end]]
+
+    def save(self, path: str = GRAPH_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            vocab=np.array(self.vocab, dtype=np.str_),
+            indptr=self.indptr,
+            indices=self.indices,
+            weights=self.weights,
+            course_urls=np.array(self.course_urls, dtype=np.str_),
+            course_indptr=self.course_indptr,
+            course_indices=self.course_indices,
+        )
+        logger.info(f"Saved prerequisite graph ({len(self.vocab)} skills, {self.edge_count} edges) to {path}")
+
+    @classmethod
+    def load(cls, path: str = GRAPH_PATH) -> "PrerequisiteGraph":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["vocab"].tolist(), data["indptr"], data["indices"], data["weights"],
+                data["course_urls"].tolist(), data["course_indptr"], data["course_indices"],
+            )
+
+
+def build_prerequisite_graph(rows: Iterable[Dict], min_support: int = 3) -> PrerequisiteGraph:
+    """
+    Build the skill prerequisite DAG from course rows.
+
+    Args:
+        rows (iterable): Dicts with URL, SKILLS and PREREQUISITES
+        min_support (int): Minimum number of courses voting for an edge
+
+    Returns:
+        PrerequisiteGraph: The acyclic graph
+    """
+    votes: Dict[Tuple[str, str], int] = {}
+    vocab_ids: Dict[str, int] = {}
+    course_prereqs: Dict[str, List[int]] = {}
+    for row in rows:
+        taught = split_skills(row.get("SKILLS"))
+        required = [p for p in split_prerequisites(row.get("PREREQUISITES")) if p not in taught]
+        if row.get("URL") and required:
+            course_prereqs[row["URL"]] = [vocab_ids.setdefault(p, len(vocab_ids)) for p in required]
+        for prereq in required:
+            for skill in taught:
+                votes[(skill, prereq)] = votes.get((skill, prereq), 0) + 1
+
+    parents: Dict[int, List[Tuple[int, int]]] = {}
+
+    def reaches(start: int, target: int) -> bool:
+        # Is target an (indirect) prerequisite of start?
+        stack, seen = [start], {start}
+        while stack:
+            node = stack.pop()
+            for parent, _ in parents.get(node, []):
+                if parent == target:
+                    return True
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return False
+
+    # Strongest edges first; an edge that would close a cycle loses to the stronger ones
+    for (skill, prereq), support in sorted(votes.items(), key=lambda x: (-x[1], x[0])):
+        if support < min_support:
+            break
+        skill_id = vocab_ids.setdefault(skill, len(vocab_ids))
+        prereq_id = vocab_ids.setdefault(prereq, len(vocab_ids))
+        if len(parents.get(skill_id, [])) >= MAX_PARENTS or reaches(prereq_id, skill_id):
+            continue
+        parents.setdefault(skill_id, []).append((prereq_id, support))
+
+    vocab = [None] * len(vocab_ids)
+    for name, i in vocab_ids.items():
+        vocab[i] = name
+    indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    indices, weights = [], []
+    for skill_id in range(len(vocab)):
+        edges = parents.get(skill_id, [])
+        indices.extend(p for p, _ in edges)
+        weights.extend(w for _, w in edges)
+        indptr[skill_id + 1] = len(indices)
+
+    course_urls = list(course_prereqs)
+    course_indptr = np.zeros(len(course_urls) + 1, dtype=np.int64)
+    course_indptr[1:] = np.cumsum([len(course_prereqs[url]) for url in course_urls])
+    course_indices = np.array([i for url in course_urls for i in course_prereqs[url]], dtype=np.int32)
+    return PrerequisiteGraph(
+        vocab, indptr, np.array(indices, dtype=np.int32), np.array(weights, dtype=np.int32),
+        course_urls, course_indptr, course_indices,
+    )
+
+
+_graph: Optional[PrerequisiteGraph] = None
+_graph_lock = threading.Lock()
+
+
+def get_prerequisite_graph() -> PrerequisiteGraph:
+    """Return the process-wide prerequisite graph, loading the artifact on first use."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                try:
+                    _graph = PrerequisiteGraph.load()
+                    logger.info(f"Loaded prerequisite graph with {_graph.edge_count} edges")
+                except FileNotFoundError:
+                    logger.warning(f"No prerequisite graph at {GRAPH_PATH}; ordering by course prerequisites only")
+                    _graph = PrerequisiteGraph.empty()
+    return _graph
+
+
+def plan_learning_order(courses: List[Dict], known_skills: Iterable[str] = (),
+                        graph: Optional[PrerequisiteGraph] = None) -> List[Dict]:
+    """
+    Topologically order recommended courses against what the user already knows.
+
+    Course A must come before course B when A is the course chosen to teach a
+    skill B requires (the lowest-level provider of that skill). B's requirements
+    come from its PREREQUISITES field, the artifact's per-course list and the
+    skill graph. Skills the user already knows never create an ordering constraint. Ties (and any remaining
+    cycles) are resolved by level, then by the original recommendation order.
+
+    Each returned course is a copy annotated with:
+        PLAN_ORDER: 1-based position in the learning order
+        PLAN_STAGE: 0-2, max(level rank, stage of any course it depends on + 1)
+        UNMET_PREREQUISITES: required skills neither known nor taught earlier
+
+    Returns:
+        list: Annotated courses in learning order
+    """
+    graph = graph or get_prerequisite_graph()
+    known = {normalize_skill(s) for s in known_skills}
+    n = len(courses)
+
+    teaches: List[Set[str]] = []
+    requires: List[Set[str]] = []
+    for course in courses:
+        taught = set(split_skills(course.get("SKILLS")))
+        needed = set(split_prerequisites(course.get("PREREQUISITES")))
+        needed.update(graph.course_prerequisites(course.get("URL")))
+        for skill in taught:
+            needed.update(graph.prerequisites(skill))
+        teaches.append(taught)
+        requires.append(needed - taught - known)
+
+    # One provider per skill is enough: the easiest, earliest-recommended course teaching it
+    level_rank = [LEVEL_RANK.get(c.get("LEVEL_CATEGORY"), 1) for c in courses]
+    provider: Dict[str, int] = {}
+    for i in sorted(range(n), key=lambda j: (level_rank[j], j)):
+        for skill in teaches[i]:
+            provider.setdefault(skill, i)
+
+    successors: List[Set[int]] = [set() for _ in range(n)]
+    indegree = [0] * n
+    for b in range(n):
+        for skill in requires[b]:
+            a = provider.get(skill)
+            if a is not None and a != b and b not in successors[a]:
+                successors[a].add(b)
+                indegree[b] += 1
+
+    ready = [(level_rank[i], i) for i in range(n) if indegree[i] == 0]
+    heapq.heapify(ready)
+    remaining = set(range(n))
+    stage = list(level_rank)
+    order = []
+
+    while remaining:
+        if not ready:
+            # Cycle among the remaining courses: release the easiest one
+            i = min(remaining, key=lambda j: (level_rank[j], j))
+            indegree[i] = 0
+            heapq.heappush(ready, (level_rank[i], i))
+        _, i = heapq.heappop(ready)
+        if i not in remaining:
+            continue
+        remaining.discard(i)
+        order.append(i)
+        for j in successors[i]:
+            if j in remaining:
+                stage[j] = max(stage[j], min(stage[i] + 1, MAX_STAGE))
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    heapq.heappush(ready, (level_rank[j], j))
+
+    planned = []
+    learned = set(known)
+    for position, i in enumerate(order, start=1):
+        course = dict(courses[i])
+        course["PLAN_ORDER"] = position
+        course["PLAN_STAGE"] = stage[i]
+        course["UNMET_PREREQUISITES"] = sorted(requires[i] - learned)
+        learned |= teaches[i]
+        planned.append(course)
+    return planned
+
+
+def load_prerequisite_rows() -> List[Dict]:
+    """Fetch URL, SKILLS and PREREQUISITES for every course from Snowflake."""
+    from backend.database import get_snowflake_connection
+
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT URL, SKILLS, PREREQUISITES FROM {COURSES_TABLE} WHERE PREREQUISITES IS NOT NULL")
+        return [{"URL": url, "SKILLS": skills, "PREREQUISITES": prereqs} for url, skills, prereqs in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    from backend.logging_config import setup_logging
+
+    setup_logging("prerequisite_graph")
+    parser = argparse.ArgumentParser(description="Build the skill prerequisite graph artifact")
+    parser.add_argument("--min-support", type=int, default=3, help="Minimum courses supporting an edge")
+    parser.add_argument("--output", default=GRAPH_PATH, help="Where to write the .npz artifact")
+    args = parser.parse_args()
+    build_prerequisite_graph(load_prerequisite_rows(), args.min_support).save(args.output)
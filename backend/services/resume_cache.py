@@ -0,0 +1,353 @@
+# File: backend/services/resume_cache.py
+"""
+Content-hash cache for the resume analysis pipeline.
+
+Resumes are keyed by the SHA-256 of the uploaded bytes. For each hash the
+extracted text and skills are kept, and missing skills are kept per
+(resume hash, canonical role). A bounded in-process LRU answers repeated
+uploads within a worker. Entries are also published to the shared cache
+(backend.services.shared_cache), so a follow-up request routed to another
+worker finds them. The RESUME_HASH column of RESUMES answers them across
+restarts once an analysis has been stored.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from backend.services.learning_path_materializer import canonical_role
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+RESUMES_TABLE = "SKILLPATH_DB.PUBLIC.RESUMES"
+
+MAX_ENTRIES = 2048
+
+# How long entries stay in the cache shared across workers
+SHARED_TTL = 6 * 3600
+
+_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+_hash_column_ready = False
+_hash_column_lock = threading.Lock()
+
+
+def hash_bytes(content: bytes) -> str:
+    """Hex SHA-256 of an uploaded file."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def is_resume_hash(value: Optional[str]) -> bool:
+    """True for a lowercase hex SHA-256 digest."""
+    return bool(value) and bool(_HASH.match(value))
+
+
+def _skills_key(skills: Iterable[str]) -> frozenset:
+    from backend.services.skill_normalizer import get_skill_normalizer
+    return get_skill_normalizer().ids(skills)
+
+
+class ResumeCache:
+    """
+    Thread-safe LRU of resume analysis results keyed by content hash.
+
+    An entry holds "text", "skills", "skills_mode" and "missing", where
+    "missing" maps a canonical role to (skills key, missing skills, extracted
+    skills): missing skills are only reused for the same set of extracted
+    skills. With shared=True, local misses fall back to the shared cache and
+    every write is published to it.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, shared: bool = False):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    def _load_shared(self, resume_hash: str):
+        """Install an entry another worker published, if this worker has none."""
+        if not self.shared or resume_hash in self._entries:
+            return
+        from backend.services.shared_cache import get_shared_cache
+        data = get_shared_cache().get(f"resume:{resume_hash}")
+        if not data:
+            return
+        entry = {
+            "text": data.get("text"),
+            "skills": data.get("skills"),
+            "skills_mode": data.get("skills_mode"),
+            "missing": {role: (_skills_key(extracted), missing, extracted)
+                        for role, (extracted, missing) in (data.get("missing") or {}).items()},
+        }
+        with self._lock:
+            if resume_hash not in self._entries:
+                self._entries[resume_hash] = entry
+                self.shared_hits += 1
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def _publish(self, resume_hash: str):
+        if not self.shared:
+            return
+        with self._lock:
+            entry = self._entries.get(resume_hash)
+            if entry is None:
+                return
+            data = {
+                "text": entry["text"],
+                "skills": entry["skills"],
+                "skills_mode": entry["skills_mode"],
+                "missing": {role: [extracted, missing] for role, (_, missing, extracted) in entry["missing"].items()},
+            }
+        from backend.services.shared_cache import get_shared_cache
+        get_shared_cache().set(f"resume:{resume_hash}", data, SHARED_TTL)
+
+    def _entry(self, resume_hash: str) -> Dict:
+        entry = self._entries.get(resume_hash)
+        if entry is None:
+            entry = self._entries[resume_hash] = {"text": None, "skills": None, "skills_mode": None, "missing": {}}
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(resume_hash)
+        return entry
+
+    def _get(self, resume_hash: str, field: str):
+        self._load_shared(resume_hash)
+        with self._lock:
+            entry = self._entries.get(resume_hash)
+            value = entry.get(field) if entry else None
+            if value is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(resume_hash)
+                self.hits += 1
+            return value
+
+    def get_text(self, resume_hash: str) -> Optional[str]:
+        return self._get(resume_hash, "text")
+
+    def put_text(self, resume_hash: str, text: str):
+        self._load_shared(resume_hash)
+        with self._lock:
+            self._entry(resume_hash)["text"] = text
+        self._publish(resume_hash)
+
+    def get_skills(self, resume_hash: str, resume_text: Optional[str] = None,
+                   mode: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Cached skills for a resume.
+
+        Args:
+            resume_hash (str): Content hash of the uploaded file
+            resume_text (str, optional): Text the caller has; must match the cached text
+            mode (str, optional): Requested extraction mode; must match the cached mode if given
+
+        Returns:
+            list: Skills, or None on a miss
+        """
+        self._load_shared(resume_hash)
+        with self._lock:
+            entry = self._entries.get(resume_hash)
+            usable = (
+                entry is not None and entry["skills"] is not None
+                and (resume_text is None or entry["text"] == resume_text)
+                and (not mode or entry["skills_mode"] == mode.lower())
+            )
+            if not usable:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(resume_hash)
+            self.hits += 1
+            return list(entry["skills"])
+
+    def put_skills(self, resume_hash: str, skills: List[str], mode: Optional[str] = None,
+                   resume_text: Optional[str] = None):
+        self._load_shared(resume_hash)
+        with self._lock:
+            entry = self._entry(resume_hash)
+            if resume_text is not None:
+                entry["text"] = resume_text
+            entry["skills"] = list(skills)
+            entry["skills_mode"] = mode.lower() if mode else None
+        self._publish(resume_hash)
+
+    def get_missing(self, resume_hash: str, target_role: str,
+                    extracted_skills: List[str]) -> Optional[List[str]]:
+        """Cached missing skills for (resume hash, canonical role) and the same extracted skills."""
+        self._load_shared(resume_hash)
+        with self._lock:
+            entry = self._entries.get(resume_hash)
+            cached = entry["missing"].get(canonical_role(target_role)) if entry else None
+            if cached is None or cached[0] != _skills_key(extracted_skills):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(resume_hash)
+            self.hits += 1
+            return list(cached[1])
+
+    def put_missing(self, resume_hash: str, target_role: str, extracted_skills: List[str],
+                    missing_skills: List[str]):
+        self._load_shared(resume_hash)
+        skills_key = _skills_key(extracted_skills)
+        with self._lock:
+            self._entry(resume_hash)["missing"][canonical_role(target_role)] = (
+                skills_key, list(missing_skills), list(extracted_skills)
+            )
+        self._publish(resume_hash)
+
+    def peek(self, resume_hash: str) -> Optional[Dict]:
+        """Copy of an entry without touching hit counters."""
+        self._load_shared(resume_hash)
+        with self._lock:
+            entry = self._entries.get(resume_hash)
+            if entry is None:
+                return None
+            return {
+                "text": entry["text"],
+                "skills": list(entry["skills"]) if entry["skills"] is not None else None,
+                "missing": {role: list(cached[1]) for role, cached in entry["missing"].items()},
+            }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_hits": self.shared_hits,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_cache = ResumeCache(shared=True)
+
+
+def get_resume_cache() -> ResumeCache:
+    """The process-wide resume cache."""
+    return _cache
+
+
+def _parse_array(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return [v for v in value if isinstance(v, str)] if isinstance(value, list) else []
+
+
+def load_stored_analysis(resume_hash: str) -> Optional[Dict]:
+    """
+    Load the latest stored analyses of a resume hash from RESUMES into the cache.
+
+    Returns:
+        dict: The cache entry (text, skills, missing by role), or None if the hash was never stored
+    """
+    from backend.database import get_snowflake_connection
+
+    conn = get_snowflake_connection()
+    if not conn:
+        return None
+    cur = conn.cursor()
+    try:
+        cur.execute(f"""
+        SELECT resume_text, extracted_skills, target_role, missing_skills
+        FROM {RESUMES_TABLE}
+        WHERE resume_hash = %s
+        ORDER BY created_at DESC
+        LIMIT 20
+        """, (resume_hash,))
+        rows = cur.fetchall()
+    except Exception as e:
+        # Tables created before RESUME_HASH existed simply have no stored hashes
+        logger.warning(f"Could not look up resume hash {resume_hash[:12]}: {e}")
+        return None
+    finally:
+        cur.close()
+        conn.close()
+
+    if not rows:
+        return None
+    text, skills = rows[0][0], _parse_array(rows[0][1])
+    _cache.put_skills(resume_hash, skills, resume_text=text)
+    # Oldest first so the latest analysis per role wins
+    for row_text, row_skills, target_role, missing in reversed(rows):
+        if target_role and row_text == text:
+            _cache.put_missing(resume_hash, target_role, _parse_array(row_skills), _parse_array(missing))
+    logger.info(f"Loaded {len(rows)} stored analyses for resume {resume_hash[:12]}")
+    return _cache.peek(resume_hash)
+
+
+def lookup_resume(resume_hash: str) -> Optional[Dict]:
+    """Cached analysis of a resume hash, falling back to stored analyses."""
+    entry = _cache.peek(resume_hash)
+    if entry and entry["text"] is not None:
+        return entry
+    return load_stored_analysis(resume_hash) or entry
+
+
+def ensure_hash_column(cur):
+    """
+    Add RESUME_HASH to RESUMES if the table predates it, once per process.
+
+    Warmup runs it at startup (in the gunicorn master under preload, so forked
+    workers inherit the flag); later calls return without touching Snowflake.
+    """
+    global _hash_column_ready
+    if _hash_column_ready:
+        return
+    with _hash_column_lock:
+        if not _hash_column_ready:
+            cur.execute(f"ALTER TABLE {RESUMES_TABLE} ADD COLUMN IF NOT EXISTS resume_hash VARCHAR(64)")
+            _hash_column_ready = True
+
+
+def migrate_resumes_table():
+    """Run ensure_hash_column on a pooled connection (a warmup step)."""
+    from backend.database import get_connection_pool
+
+    if _hash_column_ready:
+        return
+    with get_connection_pool().cursor() as cur:
+        ensure_hash_column(cur)
+
+
+def find_stored_analysis(cur, resume_hash: str, username: str, target_role: str) -> Optional[str]:
+    """ID of an existing RESUMES row for the same user, resume and canonical role."""
+    cur.execute(f"""
+    SELECT id, target_role FROM {RESUMES_TABLE}
+    WHERE resume_hash = %s AND user_name = %s
+    ORDER BY created_at DESC
+    """, (resume_hash, username))
+    role = canonical_role(target_role)
+    for record_id, stored_role in cur.fetchall():
+        if canonical_role(stored_role) == role:
+            return record_id
+    return None
+
+
+def normalize_hash(resume_hash: Optional[str]) -> Optional[str]:
+    """
+    Normalize an optional client-supplied hash.
+
+    Raises:
+        ValueError: If the value is not a hex SHA-256 digest
+    """
+    if resume_hash is None:
+        return None
+    resume_hash = resume_hash.strip().lower()
+    if not is_resume_hash(resume_hash):
+        raise ValueError("resume_hash must be a hex SHA-256 digest")
+    return resume_hash
@@ -1,17 +1,313 @@
 #backend/services/resume_parser.py
-import pdfplumber
-import docx2txt
+"""
+Resume text extraction.
+
+Parsing runs in a process pool so it never blocks the API event loop and a
+pathological file cannot hold the GIL for other requests. Every page is
+extracted exactly once; long PDFs are split into page ranges that are
+extracted in parallel. Byte-size, page-count and wall-clock limits apply to
+every file, and pages finished before the deadline are returned as partial
+text instead of failing the whole upload. Every task carries the request's
+deadline and stops itself when it passes (SIGALRM in the worker), so a
+pathological file only ever stops its own work and the shared pool keeps
+serving other uploads. Untrusted files are never opened in the API process:
+even the page count is taken in a worker.
+
+Files are passed as a path whenever possible (see upload_spool): workers
+open and seek the file themselves, so neither the API process nor the pool
+queue carries a copy of its bytes.
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from typing import Dict, List, Optional, Tuple, Union
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+MAX_BYTES = int(os.environ.get("RESUME_MAX_BYTES", 10 * 1024 * 1024))
+MAX_PAGES = int(os.environ.get("RESUME_MAX_PAGES", 40))
+TIMEOUT_SECONDS = float(os.environ.get("RESUME_EXTRACT_TIMEOUT", 20))
+WORKERS = int(os.environ.get("RESUME_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+
+# PDFs with more pages than this are split into PAGES_PER_TASK page ranges
+PARALLEL_MIN_PAGES = 6
+PAGES_PER_TASK = 3
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+
+# Raw file bytes, or the path of a file on disk
+Source = Union[bytes, str]
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised when a resume exceeds MAX_BYTES."""
+
+
+class _Expired(Exception):
+    """Raised in a worker when its task runs past the request's deadline."""
+
+
+def _on_alarm(signum, frame):
+    raise _Expired()
+
+
+@contextmanager
+def _time_limit(deadline: Optional[float]):
+    """Worker: raise _Expired once the wall-clock deadline (time.time()) passes."""
+    if deadline is None:
+        yield
+        return
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        # Queued behind other work until the request gave up on it
+        raise _Expired()
+    if not hasattr(signal, "setitimer"):
+        yield
+        return
+    # Pool workers run their tasks on the main thread, where signal handlers run
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _open(source: Source):
+    return BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _source_size(source: Source) -> int:
+    return len(source) if isinstance(source, bytes) else os.path.getsize(source)
+
+
+def _extract_pdf_pages(source: Source, start: int, end: int, deadline: Optional[float] = None) -> List[str]:
+    """Worker: text of pages [start, end), each page extracted once."""
+    import pdfplumber
+
+    with _time_limit(deadline), pdfplumber.open(_open(source)) as pdf:
+        texts = []
+        for page in pdf.pages[start:end]:
+            texts.append(page.extract_text() or "")
+            # Release the parsed layout of pages already done
+            page.close()
+        return texts
+
+
+def _extract_docx(source: Source, deadline: Optional[float] = None) -> str:
+    """Worker: text of a DOCX file."""
+    import docx2txt
+
+    with _time_limit(deadline):
+        return docx2txt.process(_open(source)) or ""
+
+
+def _pdf_page_count(source: Source, deadline: Optional[float] = None) -> int:
+    # pdfium (a pdfplumber dependency) counts pages in C without parsing page content
+    import pypdfium2
+
+    with _time_limit(deadline):
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """The shared extraction pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the API process is multi-threaded, so forking it is unsafe
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"Started resume extraction pool with {WORKERS} workers")
+        return _pool
+
+
+def shutdown_extraction_pool():
+    """Stop the extraction pool (on application shutdown or after a worker crash)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _discard_broken_pool():
+    """Drop the shared pool if a worker died (e.g. a crashing parser), so the next request starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        pool = _pool
+        if pool is None or not pool._broken:
+            return
+        _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(fn, *args):
+    """Submit to the shared pool, retrying once on a fresh pool if it broke meanwhile."""
+    try:
+        return get_extraction_pool().submit(fn, *args)
+    except (BrokenProcessPool, RuntimeError):
+        # Broken, or already shut down by a request that found it broken
+        _discard_broken_pool()
+        return get_extraction_pool().submit(fn, *args)
+
+
+def _page_ranges(page_count: int) -> List[Tuple[int, int]]:
+    if page_count <= PARALLEL_MIN_PAGES:
+        return [(0, page_count)]
+    return [(start, min(start + PAGES_PER_TASK, page_count)) for start in range(0, page_count, PAGES_PER_TASK)]
+
+
+def extract_resume(source: Source, filename: str, timeout: Optional[float] = None) -> Dict:
+    """
+    Extract the text of a PDF or DOCX resume within the configured limits.
+
+    Args:
+        source (bytes or str): The file's bytes, or preferably its path
+        filename (str): Original file name; its extension selects the parser
+        timeout (float, optional): Wall-clock budget in seconds, defaults to RESUME_EXTRACT_TIMEOUT
+
+    Returns:
+        dict: text, pages, pages_extracted, truncated (page limit hit), timed_out, elapsed_ms
+
+    Raises:
+        ResumeTooLargeError: If the file exceeds RESUME_MAX_BYTES
+    """
+    started = time.perf_counter()
+    budget = TIMEOUT_SECONDS if timeout is None else timeout
+    deadline = started + budget
+    # Workers compare against the wall clock; perf_counter is per process
+    worker_deadline = time.time() + budget
+    size = _source_size(source)
+    if size > MAX_BYTES:
+        raise ResumeTooLargeError(f"Resume is {size} bytes; the limit is {MAX_BYTES}")
+
+    result = {"text": "", "pages": 0, "pages_extracted": 0, "truncated": False, "timed_out": False}
+    name = (filename or "").lower()
+    try:
+        if name.endswith(".docx"):
+            futures = {_submit(_extract_docx, source, worker_deadline): None}
+        elif name.endswith(".pdf"):
+            counting = _submit(_pdf_page_count, source, worker_deadline)
+            try:
+                page_count = counting.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except (FutureTimeout, _Expired):
+                counting.cancel()
+                logger.warning(f"Counting the pages of {filename} timed out")
+                result["timed_out"] = True
+                return {**result, "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+            result["pages"] = page_count
+            if page_count > MAX_PAGES:
+                logger.warning(f"{filename} has {page_count} pages; extracting the first {MAX_PAGES}")
+                result["truncated"] = True
+                page_count = MAX_PAGES
+            futures = {_submit(_extract_pdf_pages, source, start, end, worker_deadline): (start, end)
+                       for start, end in _page_ranges(page_count)}
+        else:
+            return {**result, "elapsed_ms": 0.0}
+
+        done_ranges: Dict[Tuple[int, int], List[str]] = {}
+        docx_text = ""
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                page_range = futures[future]
+                try:
+                    value = future.result()
+                except BrokenProcessPool:
+                    raise
+                except _Expired:
+                    continue
+                except Exception as e:
+                    logger.error(f"Failed to extract {filename} pages {page_range}: {e}")
+                    continue
+                if page_range is None:
+                    docx_text = value
+                else:
+                    done_ranges[page_range] = value
+
+        if pending:
+            result["timed_out"] = True
+            # Queued ranges cancel; running ones hit the same deadline in their worker and stop
+            for future in pending:
+                future.cancel()
+            logger.warning(f"Extraction of {filename} timed out; returning {len(done_ranges)} of "
+                           f"{len(futures)} page ranges")
+    except BrokenProcessPool:
+        _discard_broken_pool()
+        raise
+
+    if name.endswith(".docx"):
+        result["text"] = docx_text
+    else:
+        pages = [text for page_range in sorted(done_ranges) for text in done_ranges[page_range]]
+        result["pages_extracted"] = len(pages)
+        result["text"] = "\n".join(text for text in pages if text)
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def extract_resume_inline(source: Source, filename: str) -> Dict:
+    """
+    Extract a resume in the calling process, within the byte and page limits.
+
+    For code that already runs in its own worker process (bulk ingestion);
+    request handlers use extract_resume instead.
+    """
+    started = time.perf_counter()
+    size = _source_size(source)
+    if size > MAX_BYTES:
+        raise ResumeTooLargeError(f"Resume is {size} bytes; the limit is {MAX_BYTES}")
+
+    result = {"text": "", "pages": 0, "pages_extracted": 0, "truncated": False, "timed_out": False}
+    name = (filename or "").lower()
+    if name.endswith(".docx"):
+        result["text"] = _extract_docx(source)
+    elif name.endswith(".pdf"):
+        result["pages"] = _pdf_page_count(source)
+        result["truncated"] = result["pages"] > MAX_PAGES
+        pages = _extract_pdf_pages(source, 0, min(result["pages"], MAX_PAGES))
+        result["pages_extracted"] = len(pages)
+        result["text"] = "\n".join(text for text in pages if text)
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def extract_text_from_bytes(content, filename):
+    """Extract text from the raw bytes of a PDF or DOCX file."""
+    return extract_resume(content, filename)["text"]
+
 
 def extract_text(file):
     """Extract text from PDF or DOCX file."""
-    # Read the file content into a BytesIO object
-    content = file.file.read()
-    file_obj = BytesIO(content)
-    
-    if file.filename.endswith('.pdf'):
-        with pdfplumber.open(file_obj) as pdf:
-            return "\n".join([page.extract_text() for page in pdf.pages if page.extract_text()])
-    elif file.filename.endswith('.docx'):
-        return docx2txt.process(file_obj)
-    return ""
+    # Spool to disk in chunks rather than reading the whole upload into memory
+    import shutil
+    import tempfile
+
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    with tempfile.NamedTemporaryFile(prefix="resume-", suffix=suffix) as handle:
+        shutil.copyfileobj(file.file, handle, 64 * 1024)
+        handle.flush()
+        return extract_resume(handle.name, file.filename)["text"]
@@ -0,0 +1,339 @@
+# File: backend/services/role_fit.py
+"""
+Role x skill weight matrix and vectorized "which roles fit me" scoring.
+
+The matrix is built offline from JOB_POSTINGS: postings are grouped by
+canonical job title, and a role's weight for a skill is the share of its
+postings asking for it, scaled by how specific the skill is across roles
+(skills every role wants, such as "Communication", weigh less). Each role
+keeps its strongest skills, strongest first, in a CSR .npz artifact.
+
+At request time the user's skills become one vector over the matrix columns
+(1 for an extracted skill, rating / 5 for a rated one), and fit, coverage and
+missing skills for every role come from a few numpy passes over the non-zero
+entries, with no LLM call. Build it from the project root after the dbt
+models are rebuilt:
+
+    python -m backend.services.role_fit --min-postings 20
+"""
+import argparse
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from backend.services.artifacts import artifact_path
+from backend.services.learning_path_materializer import canonical_role
+from backend.services.skill_normalizer import get_skill_normalizer
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+ROLE_FIT_PATH = artifact_path("role_fit.npz", "ROLE_FIT_PATH")
+
+# Skills asked for by fewer than this share of a role's postings are noise
+MIN_SKILL_SHARE = 0.05
+# Strongest skills kept per role
+MAX_SKILLS_PER_ROLE = 40
+# A skill counts as "had" at this level (rating 3 of 5, or extracted from the resume)
+HAVE_THRESHOLD = 0.6
+MAX_RATING = 5
+
+
+class RoleFitMatrix:
+    """Roles x skills weights in CSR form; each row's skills are sorted by weight, strongest first."""
+
+    def __init__(self, roles: List[str], postings: np.ndarray, skills: List[str],
+                 indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, version: str = ""):
+        self.roles = list(roles)
+        self.postings = postings
+        self.skills = list(skills)
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.version = version
+        # Row of every non-zero entry, so per-role sums are one bincount
+        self._rows = np.repeat(np.arange(len(self.roles), dtype=np.int32), np.diff(indptr))
+        self._row_weight = np.bincount(self._rows, weights=weights, minlength=len(self.roles))
+        self._row_size = np.diff(indptr)
+        self._normalizer = None
+        self._columns: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def empty(cls) -> "RoleFitMatrix":
+        return cls([], np.zeros(0, dtype=np.int32), [], np.zeros(1, dtype=np.int64),
+                   np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.size)
+
+    def _column_map(self) -> Dict[int, int]:
+        """Skill ID -> column, rebuilt if the skill taxonomy was swapped."""
+        normalizer = get_skill_normalizer()
+        if normalizer is not self._normalizer:
+            with self._lock:
+                if normalizer is not self._normalizer:
+                    columns: Dict[int, int] = {}
+                    for column, name in enumerate(self.skills):
+                        skill_id = normalizer.skill_id(name)
+                        if skill_id is not None:
+                            columns.setdefault(skill_id, column)
+                    self._columns, self._normalizer = columns, normalizer
+        return self._columns
+
+    def user_vector(self, skills: Iterable[str] = (), ratings: Optional[Dict[str, int]] = None):
+        """
+        Map a user's skills onto the matrix columns.
+
+        Args:
+            skills (list): Skills the user has (extracted from a resume)
+            ratings (dict, optional): Skill -> self-rating 0-5; overrides skills
+
+        Returns:
+            tuple: (vector over columns, recognized input skills, unrecognized input skills)
+        """
+        columns = self._column_map()
+        normalizer = get_skill_normalizer()
+        vector = np.zeros(len(self.skills), dtype=np.float32)
+        recognized, unknown = [], []
+        levels = [(skill, 1.0) for skill in skills or ()]
+        for skill, rating in (ratings or {}).items():
+            try:
+                levels.append((skill, min(max(float(rating) / MAX_RATING, 0.0), 1.0)))
+            except (TypeError, ValueError):
+                continue
+        for skill, level in levels:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            column = columns.get(normalizer.skill_id(skill))
+            if column is None:
+                unknown.append(skill)
+                continue
+            vector[column] = level
+            recognized.append(skill)
+        return vector, recognized, unknown
+
+    def score(self, skills: Iterable[str] = (), ratings: Optional[Dict[str, int]] = None,
+              limit: int = 10, missing_limit: int = 5) -> Dict:
+        """
+        Rank every role by how well the user's skills fit it.
+
+        Args:
+            skills (list): Skills the user has
+            ratings (dict, optional): Skill -> self-rating 0-5
+            limit (int): Number of roles to return
+            missing_limit (int): Missing skills listed per role, most important first
+
+        Returns:
+            dict: roles (role, fit, coverage, postings, matched_skills, missing_skills),
+                  recognized_skills, unknown_skills, roles_scored and elapsed_us
+        """
+        start = time.perf_counter()
+        vector, recognized, unknown = self.user_vector(skills, ratings)
+        result = {"roles": [], "recognized_skills": recognized, "unknown_skills": unknown,
+                  "roles_scored": len(self.roles), "elapsed_us": 0}
+        if not self.roles:
+            return result
+
+        levels = vector[self.indices]
+        has = levels >= HAVE_THRESHOLD
+        # Weighted share of each role's skills the user has, and the plain share at "have" level
+        fit = np.bincount(self._rows, weights=self.weights * levels, minlength=len(self.roles))
+        fit /= np.maximum(self._row_weight, 1e-9)
+        coverage = np.bincount(self._rows, weights=has, minlength=len(self.roles))
+        coverage /= np.maximum(self._row_size, 1)
+
+        limit = max(0, min(limit, len(self.roles)))
+        if limit == 0:
+            return result
+        top = np.argpartition(-fit, limit - 1)[:limit] if limit < len(self.roles) else np.arange(len(self.roles))
+        top = top[np.lexsort((-coverage[top], -fit[top]))]
+
+        for row in top.tolist():
+            begin, end = self.indptr[row], self.indptr[row + 1]
+            row_skills = self.indices[begin:end]
+            row_has = has[begin:end]
+            result["roles"].append({
+                "role": self.roles[row],
+                "fit": round(float(fit[row]) * 100, 1),
+                "coverage": round(float(coverage[row]) * 100, 1),
+                "postings": int(self.postings[row]),
+                "matched_skills": [self.skills[i] for i in row_skills[row_has].tolist()],
+                "missing_skills": [self.skills[i] for i in row_skills[~row_has][:missing_limit].tolist()],
+            })
+        result["elapsed_us"] = int((time.perf_counter() - start) * 1e6)
+        return result
+
+    def save(self, path: str = ROLE_FIT_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(
+            path,
+            roles=np.array(self.roles, dtype=np.str_),
+            postings=self.postings,
+            skills=np.array(self.skills, dtype=np.str_),
+            indptr=self.indptr,
+            indices=self.indices,
+            weights=self.weights,
+            version=np.array(self.version, dtype=np.str_),
+        )
+        logger.info(f"Saved role fit matrix ({len(self.roles)} roles, {len(self.skills)} skills, "
+                    f"{self.nnz} weights) to {path}")
+
+    @classmethod
+    def load(cls, path: str = ROLE_FIT_PATH) -> "RoleFitMatrix":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["roles"].tolist(), data["postings"], data["skills"].tolist(),
+                data["indptr"], data["indices"], data["weights"], str(data["version"]),
+            )
+
+
+def build_role_fit_matrix(rows: Iterable[Dict], min_postings: int = 20,
+                          max_skills: int = MAX_SKILLS_PER_ROLE, min_share: float = MIN_SKILL_SHARE,
+                          version: str = "") -> RoleFitMatrix:
+    """
+    Build the role x skill weight matrix from job postings.
+
+    Args:
+        rows (iterable): Dicts with TITLE_REPORTED, HARD_SKILLS and SOFT_SKILLS
+        min_postings (int): Minimum postings for a title to become a role
+        max_skills (int): Strongest skills kept per role
+        min_share (float): Minimum share of a role's postings asking for a skill
+        version (str): Build version recorded in the artifact
+
+    Returns:
+        RoleFitMatrix: The matrix
+    """
+    from backend.services.skill_taxonomy_builder import split_labels, surface_variants
+
+    normalizer = get_skill_normalizer()
+    role_postings: Counter = Counter()
+    role_spellings: Dict[str, Counter] = {}
+    role_skills: Dict[str, Counter] = {}
+    for row in rows:
+        title = " ".join(str(row.get("TITLE_REPORTED") or "").split())
+        role = canonical_role(title)
+        if not role:
+            continue
+        role_postings[role] += 1
+        role_spellings.setdefault(role, Counter())[title] += 1
+        # Each skill counts once per posting, under its canonical name
+        skills = set()
+        for raw in (row.get("HARD_SKILLS"), row.get("SOFT_SKILLS")):
+            for label in split_labels(raw):
+                surface, _ = surface_variants(label)
+                if normalizer.skill_id(surface) is not None:
+                    skills.add(normalizer.canonical(surface))
+        role_skills.setdefault(role, Counter()).update(skills)
+
+    roles = sorted(role for role, count in role_postings.items() if count >= min_postings)
+    shares = {
+        role: {skill: count / role_postings[role] for skill, count in role_skills[role].items()
+               if count / role_postings[role] >= min_share}
+        for role in roles
+    }
+    # Skills wanted by many roles say little about which role fits
+    role_frequency: Counter = Counter(skill for role in roles for skill in shares[role])
+    specificity = {skill: math.log(1 + len(roles) / count) for skill, count in role_frequency.items()}
+
+    columns: Dict[str, int] = {}
+    indptr = np.zeros(len(roles) + 1, dtype=np.int64)
+    indices, weights = [], []
+    for i, role in enumerate(roles):
+        ranked = sorted(((share * specificity[skill], skill) for skill, share in shares[role].items()),
+                        key=lambda x: (-x[0], x[1]))[:max_skills]
+        indices.extend(columns.setdefault(skill, len(columns)) for _, skill in ranked)
+        weights.extend(weight for weight, _ in ranked)
+        indptr[i + 1] = len(indices)
+
+    names = [max(role_spellings[role].items(), key=lambda x: (x[1], -len(x[0])))[0] for role in roles]
+    skills = [None] * len(columns)
+    for skill, column in columns.items():
+        skills[column] = skill
+    return RoleFitMatrix(
+        names, np.array([role_postings[role] for role in roles], dtype=np.int32), skills,
+        indptr, np.array(indices, dtype=np.int32), np.array(weights, dtype=np.float32), version,
+    )
+
+
+# How often a worker without the artifact looks for it again
+RELOAD_MISSING_SECONDS = 60
+
+_matrix: Optional[RoleFitMatrix] = None
+_matrix_lock = threading.Lock()
+_missing_since: Optional[float] = None
+
+
+def _due_for_load() -> bool:
+    # Never loaded, or loaded empty and due for another look
+    return _matrix is None or (_missing_since is not None
+                               and time.monotonic() - _missing_since >= RELOAD_MISSING_SECONDS)
+
+
+def get_role_fit_matrix() -> RoleFitMatrix:
+    """
+    Return the process-wide role fit matrix, loading the artifact on first use.
+
+    Without the artifact an empty matrix is returned, and the artifact is looked
+    for again at most every RELOAD_MISSING_SECONDS, so a worker picks it up once
+    it has been built without a restart.
+    """
+    global _matrix, _missing_since
+    if _due_for_load():
+        with _matrix_lock:
+            if _due_for_load():
+                try:
+                    _matrix = RoleFitMatrix.load()
+                    _missing_since = None
+                    logger.info(f"Loaded role fit matrix {_matrix.version} with {len(_matrix)} roles")
+                except FileNotFoundError:
+                    if _matrix is None:
+                        logger.warning(f"No role fit matrix at {ROLE_FIT_PATH}; role fit scoring is unavailable")
+                        _matrix = RoleFitMatrix.empty()
+                    _missing_since = time.monotonic()
+    return _matrix
+
+
+def load_posting_rows() -> List[Dict]:
+    """Fetch job title and hard / soft skill labels of every job posting from Snowflake."""
+    from backend.database import get_snowflake_connection
+    from backend.services.skill_taxonomy_builder import JOB_POSTINGS_TABLE
+
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT TITLE_REPORTED, HARD_SKILLS, SOFT_SKILLS FROM {JOB_POSTINGS_TABLE} "
+                    f"WHERE TITLE_REPORTED IS NOT NULL")
+        return [{"TITLE_REPORTED": title, "HARD_SKILLS": hard, "SOFT_SKILLS": soft}
+                for title, hard, soft in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    from datetime import datetime, timezone
+
+    from backend.logging_config import setup_logging
+
+    setup_logging("role_fit")
+    parser = argparse.ArgumentParser(description="Build the role x skill fit matrix artifact")
+    parser.add_argument("--min-postings", type=int, default=20, help="Minimum postings per role")
+    parser.add_argument("--max-skills", type=int, default=MAX_SKILLS_PER_ROLE, help="Skills kept per role")
+    parser.add_argument("--output", default=ROLE_FIT_PATH, help="Where to write the .npz artifact")
+    args = parser.parse_args()
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    matrix = build_role_fit_matrix(load_posting_rows(), args.min_postings, args.max_skills, version=version)
+    matrix.save(args.output)
+    print(f"Role fit matrix {version}: {len(matrix)} roles, {len(matrix.skills)} skills, {matrix.nnz} weights")
@@ -0,0 +1,297 @@
+# File: backend/services/shared_cache.py
+"""
+Key/value cache shared by every API worker process on a host.
+
+With several gunicorn workers, each worker's in-process caches only see the
+requests it served. This tier sits behind them: a value computed by one worker
+(role skills from Cortex, a resume analysis) is found by the others.
+
+Backends:
+    redis   when SHARED_CACHE_URL is a redis:// URL and the redis package is installed
+    sqlite  otherwise; a WAL-mode SQLite file in /dev/shm (memory-backed on Linux)
+
+Values are JSON and every entry has a TTL. The cache never raises: a backend
+error or an undecodable value is logged and treated as a miss.
+
+Entries include resume text, so the SQLite file lives in a directory only the
+service user can enter and is created 0600 (SQLite gives its -wal and -shm
+files the same mode). If that directory or file belongs to someone else, the
+cache moves to a fresh private temporary directory instead.
+
+Settings (environment):
+    SHARED_CACHE_URL          redis://host:port/db, or unset for SQLite
+    SHARED_CACHE_PATH         SQLite file (/dev/shm/skillpath-<uid>/cache.sqlite3)
+    SHARED_CACHE_MAX_ENTRIES  SQLite entries kept before the oldest are evicted (50000)
+"""
+import json
+import logging
+import os
+import random
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+_SHM = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+_PRIVATE_DIR = os.path.join(_SHM, f"skillpath-{os.getuid()}" if hasattr(os, "getuid") else "skillpath")
+
+SHARED_CACHE_URL = os.environ.get("SHARED_CACHE_URL", "")
+SHARED_CACHE_PATH = os.environ.get("SHARED_CACHE_PATH", os.path.join(_PRIVATE_DIR, "cache.sqlite3"))
+MAX_ENTRIES = int(os.environ.get("SHARED_CACHE_MAX_ENTRIES", "50000"))
+DEFAULT_TTL = 3600
+
+# Share of writes that also purge expired rows and enforce MAX_ENTRIES
+_PRUNE_EVERY = 1 / 200
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class SharedCache:
+    """Interface and hit counters; subclasses implement _get, _set and _delete."""
+
+    backend = "none"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: str, ttl: float):
+        raise NotImplementedError
+
+    def _delete(self, key: str):
+        raise NotImplementedError
+
+    def get(self, key: str) -> Any:
+        """Cached value, or None on a miss or backend error."""
+        try:
+            raw = self._get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        try:
+            value = json.loads(raw)
+        except ValueError as e:
+            self.misses += 1
+            logger.warning(f"Shared cache entry {key} is not valid JSON, dropping it: {e}")
+            self.delete(key)
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_TTL):
+        """Store a JSON-serializable value for ttl seconds."""
+        try:
+            self._set(key, _encode(value), ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shared cache write failed for {key}: {e}")
+
+    def delete(self, key: str):
+        try:
+            self._delete(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shared cache delete failed for {key}: {e}")
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], ttl: float = DEFAULT_TTL) -> Any:
+        """
+        Cached value, computing and storing it on a miss.
+
+        Args:
+            key (str): Cache key
+            compute (callable): Produces the value; a None result is not cached
+            ttl (float): Seconds to keep a computed value
+
+        Returns:
+            The cached or computed value
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value, ttl)
+        return value
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class SQLiteCache(SharedCache):
+    """
+    Cache table in a SQLite file that all processes open.
+
+    WAL mode lets readers proceed while one process writes. Connections are
+    per thread and per process, so nothing opened before a fork is reused.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = SHARED_CACHE_PATH, max_entries: int = MAX_ENTRIES):
+        super().__init__()
+        self.max_entries = max_entries
+        self._local = threading.local()
+        try:
+            _create_private(path)
+        except OSError as e:
+            # Never write resume text where another user could read or replace it
+            path = os.path.join(tempfile.mkdtemp(prefix="skillpath-cache-"), os.path.basename(path))
+            _create_private(path)
+            logger.error(f"Shared cache path is not private ({e}); using {path}, "
+                         f"which only workers forked from this process share")
+        self.path = path
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str, ttl: float):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+        if random.random() < _PRUNE_EVERY:
+            self.prune()
+
+    def _delete(self, key: str):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def prune(self):
+        """Drop expired entries, then the soonest-expiring ones beyond max_entries."""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        excess = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at LIMIT ?)", (excess,)
+            )
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache")
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        stats["path"] = self.path
+        try:
+            stats["entries"] = self._conn().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        except sqlite3.Error:
+            stats["entries"] = None
+        return stats
+
+
+def _check_owned(path: str, is_dir: bool):
+    """Raise PermissionError unless path is ours and (for directories) not a symlink."""
+    info = os.lstat(path)
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by uid {info.st_uid}")
+    if is_dir and not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+
+
+def _create_private(path: str):
+    """
+    Create the cache file 0600, in a 0700 directory when it is our own default.
+
+    Raises:
+        OSError: If the directory or file belongs to another user (e.g. someone
+            created /dev/shm/skillpath-<uid> first) or can't be made private
+    """
+    directory = os.path.dirname(path)
+    if directory == _PRIVATE_DIR:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        _check_owned(directory, is_dir=True)
+        os.chmod(directory, 0o700)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    try:
+        _check_owned(path, is_dir=False)
+        # Files created by older versions were 0644
+        os.chmod(path, 0o600)
+    finally:
+        os.close(fd)
+
+
+class RedisCache(SharedCache):
+    """Cache in a Redis server (redis-py connection pools are fork-aware)."""
+
+    backend = "redis"
+
+    def __init__(self, url: str):
+        super().__init__()
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+
+    def _get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def _set(self, key: str, value: str, ttl: float):
+        self.client.set(key, value, ex=max(1, int(ttl)))
+
+    def _delete(self, key: str):
+        self.client.delete(key)
+
+    def clear(self):
+        self.client.flushdb()
+
+
+_shared: Optional[SharedCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache:
+    """The process-wide handle to the shared cache, created on first use."""
+    global _shared
+    if _shared is not None:
+        return _shared
+    with _shared_lock:
+        if _shared is None:
+            if SHARED_CACHE_URL.startswith(("redis://", "rediss://", "unix://")):
+                try:
+                    _shared = RedisCache(SHARED_CACHE_URL)
+                    logger.info("Shared cache: Redis")
+                except ImportError:
+                    logger.warning("SHARED_CACHE_URL is set but redis is not installed; using SQLite")
+            if _shared is None:
+                _shared = SQLiteCache()
+                logger.info(f"Shared cache: SQLite at {SHARED_CACHE_PATH}")
+    return _shared
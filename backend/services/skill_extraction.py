@@ -0,0 +1,273 @@
+# File: backend/services/skill_extraction.py
+"""
+Dictionary-first skill extraction.
+
+In hybrid mode the compiled skill matcher scans the whole resume. The resume is
+split into sections, and only sections that still contain many unexplained
+technical-looking terms (low dictionary coverage) are sent to the LLM. LLM
+answers are mapped back onto canonical skill names and merged with the
+dictionary matches.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.services.admission import AdmissionRejected
+from backend.services.deadline import LLM_MIN_BUDGET, has_budget, mark_degraded
+from backend.services.skill_normalizer import get_skill_normalizer
+from backend.services.skill_taxonomy import get_skill_matcher, tokenize
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+MODE_HYBRID = "hybrid"
+MODE_DICTIONARY = "dictionary"
+MODE_LLM = "llm"
+EXTRACTION_MODES = (MODE_HYBRID, MODE_DICTIONARY, MODE_LLM)
+DEFAULT_MODE = os.environ.get("SKILL_EXTRACTION_MODE", MODE_HYBRID)
+
+# A section goes to the LLM when at least RESIDUE_MIN_TERMS candidate terms are
+# unexplained and less than COVERAGE_THRESHOLD of its candidates were matched.
+COVERAGE_THRESHOLD = 0.6
+RESIDUE_MIN_TERMS = 3
+SECTION_MAX_CHARS = 1500
+LLM_MAX_CHARS = 4000
+LLM_MAX_CALLS = 3
+
+SKILL_HEADINGS = {
+    "skills", "technical skills", "core competencies", "competencies", "technologies",
+    "tools", "tools and technologies", "technical proficiencies", "proficiencies", "tech stack",
+}
+KNOWN_HEADINGS = SKILL_HEADINGS | {
+    "summary", "professional summary", "profile", "objective", "experience", "work experience",
+    "professional experience", "employment history", "education", "projects", "certifications",
+    "publications", "awards", "languages", "interests", "volunteer experience", "achievements",
+}
+
+# Capitalized words that say nothing about skills
+_COMMON_WORDS = {
+    "i", "a", "an", "the", "and", "or", "of", "in", "at", "for", "with", "to", "on", "by",
+    "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+    "january", "february", "march", "april", "june", "july", "august", "september", "october",
+    "november", "december", "present", "current", "university", "college", "school", "institute",
+    "inc", "llc", "ltd", "corp", "company", "team", "bachelor", "master", "masters", "degree",
+    "senior", "junior", "lead", "intern", "engineer", "developer", "manager", "analyst",
+    "usa", "us", "ca", "ny", "remote", "gpa", "references", "available", "upon", "request",
+}
+_SKIP_SPANS = re.compile(r"\S+@\S+|https?://\S+|www\.\S+")
+_SENTENCE_START = re.compile(r"(?:^|[.!?]\s+|\n\s*[-•*▪◦·]?\s*)$")
+
+
+class _Stats:
+    """Process-wide extraction counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.resumes = 0
+        self.resumes_without_llm = 0
+        self.llm_calls = 0
+        self.sections = 0
+        self.sections_sent = 0
+        self.chars = 0
+        self.chars_sent = 0
+        self.elapsed_s = 0.0
+
+    def record(self, report: Dict):
+        with self._lock:
+            self.resumes += 1
+            self.resumes_without_llm += report["llm_calls"] == 0
+            self.llm_calls += report["llm_calls"]
+            self.sections += report["sections"]
+            self.sections_sent += report["llm_sections"]
+            self.chars += report["chars"]
+            self.chars_sent += report["llm_chars"]
+            self.elapsed_s += report["elapsed_ms"] / 1000
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "mode": DEFAULT_MODE,
+                "resumes": self.resumes,
+                "resumes_without_llm": self.resumes_without_llm,
+                "no_llm_fraction": round(self.resumes_without_llm / self.resumes, 4) if self.resumes else None,
+                "llm_calls": self.llm_calls,
+                "sections": self.sections,
+                "sections_sent_to_llm": self.sections_sent,
+                "chars": self.chars,
+                "chars_sent_to_llm": self.chars_sent,
+                "avg_ms": round(1000 * self.elapsed_s / self.resumes, 2) if self.resumes else None,
+            }
+
+
+_stats = _Stats()
+
+
+def get_extraction_stats() -> Dict:
+    """Aggregate counters for all extractions since startup."""
+    return _stats.snapshot()
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Split a resume into (heading, body) sections at heading-like lines.
+
+    Long sections are further cut at line boundaries into SECTION_MAX_CHARS pieces.
+    """
+    sections = []
+    heading, lines = "", []
+
+    def flush():
+        body = "\n".join(lines).strip()
+        piece = ""
+        for line in body.split("\n"):
+            if piece and len(piece) + len(line) + 1 > SECTION_MAX_CHARS:
+                sections.append((heading, piece))
+                piece = ""
+            piece = f"{piece}\n{line}" if piece else line
+        if piece.strip():
+            sections.append((heading, piece))
+
+    for line in text.splitlines():
+        stripped = line.strip().rstrip(":").strip()
+        if stripped and _is_heading(stripped, line):
+            flush()
+            heading, lines = stripped.casefold(), []
+        else:
+            lines.append(line)
+    flush()
+    return sections
+
+
+def _is_heading(stripped: str, line: str) -> bool:
+    if len(stripped) > 40 or len(stripped.split()) > 4 or any(ch.isdigit() for ch in stripped):
+        return False
+    return stripped.casefold() in KNOWN_HEADINGS or stripped.isupper() or line.rstrip().endswith(":")
+
+
+def _candidate_terms(text: str) -> List[Tuple[int, int]]:
+    """Spans of tokens that look like named technologies or skills."""
+    skip = [m.span() for m in _SKIP_SPANS.finditer(text)]
+    candidates = []
+    for token, start, end in tokenize(text):
+        surface = text[start:end]
+        if token in _COMMON_WORDS or len(token) < 2 or not any(ch.isalpha() for ch in surface):
+            continue
+        technical = surface[-1] in "+#" or any(ch.isdigit() for ch in surface) or surface[1:] != surface[1:].lower()
+        if not technical and (not surface[0].isupper() or _SENTENCE_START.search(text[max(0, start - 4):start])):
+            continue
+        if any(s <= start < e for s, e in skip):
+            continue
+        candidates.append((start, end))
+    return candidates
+
+
+def section_coverage(heading: str, body: str) -> Dict:
+    """Dictionary matches and coverage of the candidate terms in one section."""
+    matches = get_skill_matcher().find(body)
+    spans = [(m.start, m.end) for m in matches]
+    candidates = _candidate_terms(body)
+    covered = sum(1 for start, end in candidates if any(s <= start and end <= e for s, e in spans))
+    residue = len(candidates) - covered
+    coverage = covered / len(candidates) if candidates else 1.0
+    needs_llm = residue >= (1 if heading in SKILL_HEADINGS else RESIDUE_MIN_TERMS) and coverage < COVERAGE_THRESHOLD
+    return {"skills": [m.skill for m in matches], "coverage": coverage, "residue": residue, "needs_llm": needs_llm}
+
+
+def merge_skills(*skill_lists: List[str]) -> List[str]:
+    """
+    Merge skill lists, mapping known surface forms to canonical names and
+    dropping duplicates that differ only in case, punctuation or alias.
+    """
+    return get_skill_normalizer().dedupe(skill for skills in skill_lists for skill in skills)
+
+
+def _default_llm_extract(text: str) -> List[str]:
+    from backend.services.chat_service import get_chat_service
+    return get_chat_service().extract_skills_llm(text)
+
+
+def extract_skills(resume_text: str, mode: Optional[str] = None,
+                   llm_extract: Optional[Callable[[str], List[str]]] = None) -> Tuple[List[str], Dict]:
+    """
+    Extract skills from a resume.
+
+    Args:
+        resume_text (str): Full resume text
+        mode (str): "hybrid", "dictionary" or "llm"; defaults to SKILL_EXTRACTION_MODE
+        llm_extract (callable): LLM extraction for a text fragment
+
+    Returns:
+        tuple: (skills, report) where report describes sections, coverage and LLM usage
+    """
+    started = time.perf_counter()
+    mode = (mode or DEFAULT_MODE).lower()
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown skill extraction mode: {mode}")
+    llm_extract = llm_extract or _default_llm_extract
+    resume_text = resume_text or ""
+
+    report = {"mode": mode, "chars": len(resume_text), "sections": 0, "llm_sections": 0,
+              "llm_calls": 0, "llm_chars": 0, "dictionary_skills": 0, "llm_skills": 0,
+              "llm_truncated": False}
+
+    if mode == MODE_LLM:
+        skills = llm_extract(resume_text)
+        report.update({"llm_calls": 1, "llm_chars": min(len(resume_text), LLM_MAX_CHARS), "llm_skills": len(skills)})
+    else:
+        sections = split_sections(resume_text)
+        analyzed = [(heading, body, section_coverage(heading, body)) for heading, body in sections]
+        dictionary_skills = merge_skills(*(a["skills"] for _, _, a in analyzed))
+        report.update({"sections": len(sections), "dictionary_skills": len(dictionary_skills)})
+
+        llm_skills: List[str] = []
+        if mode == MODE_HYBRID:
+            # Skill sections first, then the sections with the most unexplained terms
+            residue = sorted(
+                (section for section in analyzed if section[2]["needs_llm"]),
+                key=lambda s: (s[0] not in SKILL_HEADINGS, -s[2]["residue"]),
+            )
+            report["llm_sections"] = len(residue)
+            batches, batch = [], ""
+            for heading, body, _ in residue:
+                block = f"{heading.upper()}\n{body}" if heading else body
+                if batch and len(batch) + len(block) + 2 > LLM_MAX_CHARS:
+                    batches.append(batch)
+                    batch = ""
+                batch = f"{batch}\n\n{block}" if batch else block[:LLM_MAX_CHARS]
+            if batch:
+                batches.append(batch)
+            if len(batches) > LLM_MAX_CALLS:
+                logger.warning(f"Skill extraction residue needs {len(batches)} LLM calls; sending {LLM_MAX_CALLS}")
+                report["llm_truncated"] = True
+            for batch in batches[:LLM_MAX_CALLS]:
+                if not has_budget(LLM_MIN_BUDGET):
+                    # Out of time: keep the dictionary skills for the remaining sections
+                    mark_degraded("llm_sections_skipped")
+                    report["llm_truncated"] = True
+                    break
+                report["llm_calls"] += 1
+                report["llm_chars"] += len(batch)
+                try:
+                    llm_skills.extend(llm_extract(batch))
+                except AdmissionRejected:
+                    raise
+                except Exception as e:
+                    logger.error(f"LLM skill extraction failed for a residue section: {e}")
+            report["llm_skills"] = len(llm_skills)
+
+        skills = merge_skills(dictionary_skills, llm_skills)
+
+    report["skills"] = len(skills)
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    _stats.record(report)
+    logger.info(
+        f"Extracted {len(skills)} skills ({mode}): {report['sections']} sections, "
+        f"{report['llm_sections']} sent to LLM in {report['llm_calls']} calls"
+    )
+    return skills, report
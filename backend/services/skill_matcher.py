@@ -1,53 +1,24 @@
 import re
 from typing import List, Dict, Any
 
+from backend.services.admission import get_limiter
+from backend.services.deadline import execute
+
+from backend.services.skill_normalizer import get_skill_normalizer
+from backend.services.skill_taxonomy import get_skill_matcher
+
 def extract_skills_from_text(text: str) -> List[str]:
     """
-    Extract skills from resume text using regex pattern matching.
-    This is a basic implementation - in production, you'd want to use NLP.
-    """
-    # Common skills dictionary with categories
-    skills_dict = {
-        "Programming Languages": [
-            "Python", "Java", "JavaScript", "C\\+\\+", "C#", "Ruby", "PHP", "Swift", "Kotlin", 
-            "TypeScript", "Go", "Rust", "Scala", "Perl", "R", "MATLAB"
-        ],
-        "Web Development": [
-            "HTML", "CSS", "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask",
-            "Spring Boot", "ASP.NET", "jQuery", "Bootstrap", "Tailwind", "WordPress"
-        ],
-        "Databases": [
-            "SQL", "MySQL", "PostgreSQL", "MongoDB", "Oracle", "SQLite", "Redis", "Cassandra",
-            "DynamoDB", "Elasticsearch", "MariaDB", "Firebase"
-        ],
-        "Cloud & DevOps": [
-            "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", "Git", "GitHub",
-            "CI/CD", "Terraform", "Ansible", "Chef", "Puppet", "Nginx", "Apache"
-        ],
-        "Data Science": [
-            "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Analysis",
-            "Pandas", "NumPy", "SciPy", "Scikit-learn", "TensorFlow", "PyTorch", "Keras",
-            "Data Visualization", "Tableau", "Power BI", "Statistics"
-        ],
-        "Business Skills": [
-            "Project Management", "Product Management", "Agile", "Scrum", "Leadership",
-            "Communication", "Presentation", "Negotiation", "Customer Service", "Sales",
-            "Marketing", "Business Analysis", "Strategic Planning"
-        ]
-    }
-    
-    # Flatten the skills list
-    all_skills = [skill for category in skills_dict.values() for skill in category]
-    
-    # Extract skills
-    extracted_skills = []
-    for skill in all_skills:
-        # Look for word boundaries to avoid partial matches
-        pattern = r'\b' + skill + r'\b'
-        if re.search(pattern, text, re.IGNORECASE):
-            extracted_skills.append(skill)
+    Extract skills from resume text using the compiled skill taxonomy matcher.
+    The whole text is scanned once; aliases ("JS", "Postgres") map to their canonical skill.
     
-    return extracted_skills
+    Args:
+        text (str): Resume or free text
+        
+    Returns:
+        list: Distinct canonical skills in order of first mention
+    """
+    return get_skill_matcher().extract(text)
 
 def get_job_requirements(role: str) -> Dict[str, List[str]]:
     """
@@ -62,11 +33,11 @@ def get_job_requirements(role: str) -> Dict[str, List[str]]:
     """
     # Import here to avoid circular import
     from backend.database import get_snowflake_connection
-    from backend.services.chat_service import ChatService
+    from backend.services.chat_service import get_chat_service
     
     try:
         # Try to use ChatService for getting skill requirements
-        chat_service = ChatService()
+        chat_service = get_chat_service()
         
         prompt = (
             f"You are a career expert in 2025. For a {role} position, identify two categories of required skills:\n"
@@ -136,7 +107,8 @@ def query_for_skills(role: str) -> Dict[str, List[str]]:
         )['results'] as results;
         """
         
-        cursor.execute(query)
+        with get_limiter("search").slot():
+            execute(cursor, query)
         result = cursor.fetchone()[0]
         
         # Process results
@@ -181,9 +153,6 @@ def match_skills(extracted_skills: List[str], target_role: str) -> Dict[str, Any
     Match extracted skills with required skills for the target role.
     Returns analysis of matching and missing skills.
     """
-    # Convert all skills to lowercase for case-insensitive matching
-    normalized_skills = [skill.lower() for skill in extracted_skills]
-    
     # Get job requirements
     job_reqs = get_job_requirements(target_role)
     
@@ -191,18 +160,18 @@ def match_skills(extracted_skills: List[str], target_role: str) -> Dict[str, Any
     essential_skills = job_reqs.get("essential", [])
     preferred_skills = job_reqs.get("preferred", [])
     
-    # Check which skills are present/missing
-    matching_essential = [skill for skill in essential_skills 
-                         if any(skill.lower() == s.lower() for s in normalized_skills)]
-    
-    matching_preferred = [skill for skill in preferred_skills 
-                         if any(skill.lower() == s.lower() for s in normalized_skills)]
+    # Check which skills are present/missing, comparing canonical skill IDs so
+    # aliases ("JS" vs "JavaScript") and case or punctuation differences match
+    normalizer = get_skill_normalizer()
+    have = normalizer.ids(extracted_skills)
+    essential_ids = [normalizer.skill_id(skill) for skill in essential_skills]
+    preferred_ids = [normalizer.skill_id(skill) for skill in preferred_skills]
     
-    missing_essential = [skill for skill in essential_skills 
-                        if skill not in matching_essential]
+    matching_essential = [skill for skill, skill_id in zip(essential_skills, essential_ids) if skill_id in have]
+    matching_preferred = [skill for skill, skill_id in zip(preferred_skills, preferred_ids) if skill_id in have]
     
-    missing_preferred = [skill for skill in preferred_skills 
-                        if skill not in matching_preferred]
+    missing_essential = [skill for skill, skill_id in zip(essential_skills, essential_ids) if skill_id not in have]
+    missing_preferred = [skill for skill, skill_id in zip(preferred_skills, preferred_ids) if skill_id not in have]
     
     # Calculate match percentages
     essential_match_pct = (len(matching_essential) / len(essential_skills) * 100) if essential_skills else 0
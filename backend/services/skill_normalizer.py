@@ -0,0 +1,194 @@
+# File: backend/services/skill_normalizer.py
+"""
+Canonical skill identity shared by all skill matching and diffing.
+
+Every surface form of a skill ("JS", "javascript", "Java Script") maps to one
+integer ID through the taxonomy's alias table. Keys are casefolded token tuples
+(see skill_taxonomy.term_key), so case and punctuation never matter, and each
+known form is also registered with its tokens joined ("Node JS" -> "nodejs").
+Skills outside the taxonomy get IDs of their own on first sight, so any two
+skill lists can be compared as sets of IDs in O(n) instead of nested scans.
+
+IDs are only meaningful inside the running process; persist names, not IDs.
+"""
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from backend.services.skill_taxonomy import SkillTaxonomy, get_skill_matcher, term_key
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Beyond this many interned unknown skills, new ones get hash-derived IDs instead
+MAX_INTERNED = 200_000
+
+# Trailing words that don't change which skill is meant ("Communication Skills")
+_FILLER_SUFFIXES = ("skills", "skill")
+
+
+def skill_key(surface: str) -> Tuple[str, ...]:
+    """Casefolded token tuple for a skill with filler suffixes removed."""
+    key = term_key(str(surface))
+    while len(key) > 1 and key[-1] in _FILLER_SUFFIXES:
+        key = key[:-1]
+    return key
+
+
+class SkillNormalizer:
+    """Alias table from skill surface forms to canonical integer IDs."""
+
+    def __init__(self, taxonomy: SkillTaxonomy):
+        self.taxonomy = taxonomy
+        self._names: List[str] = list(taxonomy.categories)
+        self._ids: Dict[Tuple[str, ...], int] = {}
+        self._known = len(self._names)
+        self._lock = threading.Lock()
+
+        ids = {name: i for i, name in enumerate(self._names)}
+        # Canonical names win over aliases, and exact keys over joined ones
+        forms = sorted(taxonomy.surface_forms(), key=lambda form: form[0] != form[1])
+        joined = []
+        for surface, skill in forms:
+            key = skill_key(surface)
+            if not key:
+                continue
+            self._ids.setdefault(key, ids[skill])
+            if len(key) > 1:
+                joined.append((("".join(key),), ids[skill]))
+        for key, skill_id in joined:
+            self._ids.setdefault(key, skill_id)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def skill_id(self, surface: str) -> Optional[int]:
+        """
+        Integer ID of a skill, interning skills outside the taxonomy.
+
+        Args:
+            surface (str): Any spelling of the skill
+
+        Returns:
+            int: The skill's ID, or None for empty input
+        """
+        key = skill_key(surface)
+        if not key:
+            return None
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            skill_id = self._ids.get(("".join(key),)) if len(key) > 1 else None
+        if skill_id is not None:
+            return skill_id
+        with self._lock:
+            skill_id = self._ids.get(key)
+            if skill_id is None:
+                if len(self._names) - self._known >= MAX_INTERNED:
+                    return -1 - (hash(key) & 0x7FFFFFFFFFFF)
+                skill_id = len(self._names)
+                self._names.append(" ".join(str(surface).split()))
+                self._ids[key] = skill_id
+        return skill_id
+
+    def is_known(self, skill_id: Optional[int]) -> bool:
+        """True if the ID belongs to a taxonomy skill rather than an interned one."""
+        return skill_id is not None and 0 <= skill_id < self._known
+
+    def name(self, skill_id: int) -> str:
+        """Canonical name of a known skill, or the first spelling seen of an interned one."""
+        return self._names[skill_id]
+
+    def canonical(self, surface: str) -> str:
+        """Canonical name for a surface form; unknown skills come back trimmed."""
+        skill_id = self.skill_id(surface)
+        if self.is_known(skill_id):
+            return self._names[skill_id]
+        return " ".join(str(surface).split())
+
+    def category(self, surface: str) -> Optional[str]:
+        """Taxonomy category of a skill, or None if it isn't in the taxonomy."""
+        skill_id = self.skill_id(surface)
+        return self.taxonomy.categories[self._names[skill_id]] if self.is_known(skill_id) else None
+
+    def ids(self, skills: Iterable[str]) -> FrozenSet[int]:
+        """Set of IDs for a list of skills, ignoring blanks and non-strings."""
+        return frozenset(self._iter_ids(skills))
+
+    def _iter_ids(self, skills: Iterable[str]):
+        for skill in skills or ():
+            if isinstance(skill, str):
+                skill_id = self.skill_id(skill)
+                if skill_id is not None:
+                    yield skill_id
+
+    def _select(self, skills: Iterable[str], other: Set[int], keep: bool) -> List[str]:
+        selected = []
+        seen: Set[int] = set()
+        for skill in skills or ():
+            if not isinstance(skill, str):
+                continue
+            skill_id = self.skill_id(skill)
+            if skill_id is None or skill_id in seen:
+                continue
+            seen.add(skill_id)
+            if (skill_id in other) == keep:
+                selected.append(skill)
+        return selected
+
+    def difference(self, skills: Iterable[str], other: Iterable[str]) -> List[str]:
+        """
+        Skills not present in other, compared by ID.
+
+        Args:
+            skills (list): Skills to filter (e.g. required by a role)
+            other (list): Skills to remove (e.g. found on a resume)
+
+        Returns:
+            list: Entries of skills, in order and spelled as given, one per ID
+        """
+        return self._select(skills, self.ids(other), keep=False)
+
+    def intersection(self, skills: Iterable[str], other: Iterable[str]) -> List[str]:
+        """Skills also present in other, compared by ID, in order and spelled as given."""
+        return self._select(skills, self.ids(other), keep=True)
+
+    def dedupe(self, skills: Iterable[str]) -> List[str]:
+        """Distinct skills in order, known ones under their canonical names."""
+        merged = []
+        seen: Set[int] = set()
+        for skill in skills or ():
+            if not isinstance(skill, str):
+                continue
+            skill_id = self.skill_id(skill)
+            if skill_id is not None and skill_id not in seen:
+                seen.add(skill_id)
+                merged.append(self._names[skill_id] if self.is_known(skill_id) else " ".join(skill.split()))
+        return merged
+
+    def terms(self, surface: str) -> FrozenSet[str]:
+        """Tokens of a skill, its canonical name and its category, for keyword matching."""
+        tokens = set(skill_key(surface))
+        skill_id = self.skill_id(surface)
+        if self.is_known(skill_id):
+            name = self._names[skill_id]
+            tokens.update(skill_key(name))
+            tokens.update(skill_key(self.taxonomy.categories[name]))
+        return frozenset(tokens)
+
+
+_normalizer: Optional[SkillNormalizer] = None
+_normalizer_lock = threading.Lock()
+
+
+def get_skill_normalizer() -> SkillNormalizer:
+    """Return the normalizer for the current skill taxonomy, rebuilding it after a swap."""
+    global _normalizer
+    taxonomy = get_skill_matcher().taxonomy
+    normalizer = _normalizer
+    if normalizer is None or normalizer.taxonomy is not taxonomy:
+        with _normalizer_lock:
+            if _normalizer is None or _normalizer.taxonomy is not taxonomy:
+                _normalizer = SkillNormalizer(taxonomy)
+                logger.info(f"Skill normalizer built with {len(_normalizer)} skills")
+            normalizer = _normalizer
+    return normalizer
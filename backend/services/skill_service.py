@@ -1,20 +1,45 @@
 # File: backend/services/skill_service.py
 import logging
+import os
 from backend.database import get_snowflake_connection
+from backend.services.admission import get_limiter
+from backend.services.deadline import execute
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Role skills barely change; keep them in the cache shared by all API workers
+ROLE_SKILLS_TTL = int(os.environ.get("ROLE_SKILLS_TTL", "86400"))
+
+def _role_skills_key(role):
+    from backend.services.learning_path_materializer import canonical_role
+    return f"role_skills:{canonical_role(role)}"
+
+def cache_role_skills(role, skills):
+    """Store the top skills of a role in the shared cache (e.g. from a materialized plan)."""
+    from backend.services.shared_cache import get_shared_cache
+    if skills:
+        get_shared_cache().set(_role_skills_key(role), list(skills)[:5], ROLE_SKILLS_TTL)
+
 def get_top_skills_for_role(role):
     """
     Get the top 5 skills for a specific role using Snowflake Cortex.
     
+    Results are cached per canonical role for ROLE_SKILLS_TTL seconds in the
+    shared cache, so each role costs one Cortex call across all workers.
+    
     Args:
         role (str): The target role to get skills for
         
     Returns:
         list: A list of the top skills for the role
     """
+    from backend.services.shared_cache import get_shared_cache
+    cached = get_shared_cache().get(_role_skills_key(role))
+    if cached:
+        logger.debug("Top skills for %s served from the shared cache", role)
+        return cached
+    
     logger.info(f"Getting top skills for role: {role}")
     
     conn = None
@@ -33,10 +58,11 @@ def get_top_skills_for_role(role):
         ) AS skills;
         """
         
-        logger.debug(f"Executing skills query: {query}")
-        cur.execute(query)
+        logger.debug("Executing skills query: %s", query)
+        with get_limiter("complete").slot():
+            execute(cur, query)
         result = cur.fetchone()[0]
-        logger.debug(f"Skills query result: {result}")
+        logger.debug("Skills query result: %s", result)
         
         # Process the comma-separated list
         if result:
@@ -55,6 +81,7 @@ def get_top_skills_for_role(role):
                 skills.append(skill)
             
             logger.info(f"Successfully extracted skills: {skills[:5]}")
+            cache_role_skills(role, skills)
             return skills[:5]  # Ensure we only get top 5
         else:
             logger.error("Empty result from Cortex")
@@ -0,0 +1,375 @@
+# File: backend/services/skill_taxonomy.py
+"""
+Skill taxonomy and a compiled, single-pass skill matcher.
+
+The matcher tokenizes text once and looks up token n-grams in a dictionary
+compiled from the taxonomy (canonical names and aliases), taking the longest
+match at each position. Its cost depends on the text length and the longest
+term, not on the number of skills, so it scales to large vocabularies.
+
+The built-in taxonomy below is extended with the vocabulary mined offline by
+skill_taxonomy_builder, stored as a versioned binary artifact that is opened
+with mmap (see SkillVocabulary).
+"""
+import json
+import logging
+import os
+import re
+import struct
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from backend.services.artifacts import artifact_path
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+TAXONOMY_PATH = artifact_path("skill_taxonomy.bin", "SKILL_TAXONOMY_PATH")
+
+# Words are runs of letters/digits, optionally followed by "+" or "#" (C++, C#);
+# everything else (spaces, dots, slashes, hyphens) separates tokens.
+_TOKEN = re.compile(r"[^\W_]+[+#]*")
+
+DEFAULT_SKILLS = {
+    "Programming Languages": [
+        "Python", "Java", "JavaScript", "C++", "C#", "Ruby", "PHP", "Swift", "Kotlin",
+        "TypeScript", "Go", "Rust", "Scala", "Perl", "R", "MATLAB"
+    ],
+    "Web Development": [
+        "HTML", "CSS", "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask",
+        "Spring Boot", "ASP.NET", "jQuery", "Bootstrap", "Tailwind", "WordPress"
+    ],
+    "Databases": [
+        "SQL", "MySQL", "PostgreSQL", "MongoDB", "Oracle", "SQLite", "Redis", "Cassandra",
+        "DynamoDB", "Elasticsearch", "MariaDB", "Firebase"
+    ],
+    "Cloud & DevOps": [
+        "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", "Git", "GitHub",
+        "CI/CD", "Terraform", "Ansible", "Chef", "Puppet", "Nginx", "Apache"
+    ],
+    "Data Science": [
+        "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Analysis",
+        "Pandas", "NumPy", "SciPy", "Scikit-learn", "TensorFlow", "PyTorch", "Keras",
+        "Data Visualization", "Tableau", "Power BI", "Statistics"
+    ],
+    "Business Skills": [
+        "Project Management", "Product Management", "Agile", "Scrum", "Leadership",
+        "Communication", "Presentation", "Negotiation", "Customer Service", "Sales",
+        "Marketing", "Business Analysis", "Strategic Planning"
+    ]
+}
+
+DEFAULT_ALIASES = {
+    "JavaScript": ["JS"],
+    "TypeScript": ["TS"],
+    "Node.js": ["NodeJS"],
+    "Vue": ["Vue.js", "VueJS"],
+    "React": ["React.js", "ReactJS"],
+    "PostgreSQL": ["Postgres"],
+    "Google Cloud": ["GCP", "Google Cloud Platform"],
+    "AWS": ["Amazon Web Services"],
+    "Kubernetes": ["K8s"],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "NLP": ["Natural Language Processing"],
+    "Machine Learning": ["ML"],
+    "CI/CD": ["CICD", "Continuous Integration"],
+    "Power BI": ["PowerBI"],
+}
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Split text into (casefolded token, start, end) triples."""
+    return [(m.group().casefold(), m.start(), m.end()) for m in _TOKEN.finditer(text)]
+
+
+def term_key(term: str) -> Tuple[str, ...]:
+    """Token tuple a term is matched on ("Node.js" -> ("node", "js"))."""
+    return tuple(token for token, _, _ in tokenize(term))
+
+
+class SkillMatch(NamedTuple):
+    skill: str      # canonical skill name
+    category: str
+    start: int      # character offsets of the matched text
+    end: int
+    text: str       # the matched surface form
+
+
+class SkillTaxonomy:
+    """Canonical skills with their category and surface-form aliases."""
+
+    def __init__(self):
+        self.categories: Dict[str, str] = {}
+        self.aliases: Dict[str, List[str]] = {}
+
+    def add(self, skill: str, category: str = "Other", aliases: Iterable[str] = ()):
+        """Add a skill (or more aliases for an existing one)."""
+        self.categories.setdefault(skill, category)
+        known = self.aliases.setdefault(skill, [])
+        known.extend(a for a in aliases if a not in known)
+
+    @classmethod
+    def from_dict(cls, skills_by_category: Dict[str, List[str]],
+                  aliases: Optional[Dict[str, List[str]]] = None) -> "SkillTaxonomy":
+        taxonomy = cls()
+        aliases = aliases or {}
+        for category, skills in skills_by_category.items():
+            for skill in skills:
+                taxonomy.add(skill, category, aliases.get(skill, ()))
+        return taxonomy
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def surface_forms(self) -> Iterable[Tuple[str, str]]:
+        """Yield (surface form, canonical skill) for every name and alias."""
+        for skill, aliases in self.aliases.items():
+            yield skill, skill
+            for alias in aliases:
+                yield alias, skill
+
+
+class SkillMatcher:
+    """Longest-match dictionary lookup over token n-grams, compiled once per taxonomy."""
+
+    def __init__(self, taxonomy: SkillTaxonomy):
+        self.taxonomy = taxonomy
+        self._terms: Dict[Tuple[str, ...], str] = {}
+        # Longest term starting with each first token, so most tokens cost one lookup
+        self._max_len: Dict[str, int] = {}
+        # Canonical names win over aliases that normalize to the same tokens
+        forms = sorted(taxonomy.surface_forms(), key=lambda form: form[0] != form[1])
+        for surface, skill in forms:
+            key = term_key(surface)
+            if not key:
+                continue
+            if key in self._terms and self._terms[key] != skill:
+                logger.debug("Ambiguous surface form %r: keeping %r", surface, self._terms[key])
+                continue
+            self._terms[key] = skill
+            self._max_len[key[0]] = max(self._max_len.get(key[0], 0), len(key))
+
+    def _scan(self, tokens: List[str]) -> Iterable[Tuple[int, int, str]]:
+        """Yield (token index, token count, skill) for each longest match."""
+        i = 0
+        n = len(tokens)
+        while i < n:
+            longest = self._max_len.get(tokens[i])
+            if longest:
+                for length in range(min(longest, n - i), 0, -1):
+                    skill = self._terms.get(tuple(tokens[i:i + length]))
+                    if skill:
+                        yield i, length, skill
+                        i += length
+                        break
+                else:
+                    i += 1
+            else:
+                i += 1
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """
+        Find all non-overlapping skill mentions in one pass over the text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            list: SkillMatch entries in text order, with character offsets
+        """
+        if not text:
+            return []
+        spans = tokenize(text)
+        matches = []
+        for i, length, skill in self._scan([token for token, _, _ in spans]):
+            start, end = spans[i][1], spans[i + length - 1][2]
+            matches.append(SkillMatch(skill, self.taxonomy.categories[skill], start, end, text[start:end]))
+        return matches
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct canonical skills mentioned in the text, in order of first mention."""
+        if not text:
+            return []
+        # Offsets aren't needed here, so tokenize the casefolded text in one findall
+        return list(dict.fromkeys(skill for _, _, skill in self._scan(_TOKEN.findall(text.casefold()))))
+
+
+# -------------------- Binary artifact --------------------
+#
+# Layout (little endian):
+#   8 bytes   magic b"SKTAXO01"
+#   4 bytes   header length H
+#   H bytes   JSON header: format, version, categories, and the byte offset and
+#             row count of every section, each section aligned to 8 bytes
+#   sections  strings (utf-8 blob), string_offsets (uint32, n_strings + 1),
+#             skills (SKILL_DTYPE records), aliases (ALIAS_DTYPE records)
+
+ARTIFACT_MAGIC = b"SKTAXO01"
+ARTIFACT_FORMAT = 1
+SKILL_DTYPE = np.dtype([("name", "<u4"), ("category", "<u4"), ("course_freq", "<u4"), ("job_freq", "<u4")])
+ALIAS_DTYPE = np.dtype([("alias", "<u4"), ("skill", "<u4")])
+
+
+def write_taxonomy_artifact(path: str, entries: List[Dict], version: str):
+    """
+    Write a mined vocabulary as a taxonomy artifact.
+
+    Args:
+        path (str): Output file
+        entries (list): Dicts with name, category, course_freq, job_freq, aliases
+        version (str): Build version recorded in the header
+    """
+    strings: Dict[str, int] = {}
+
+    def string_id(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    categories: Dict[str, int] = {}
+    skills = np.zeros(len(entries), dtype=SKILL_DTYPE)
+    aliases = []
+    for i, entry in enumerate(entries):
+        skills[i] = (
+            string_id(entry["name"]),
+            categories.setdefault(entry["category"], len(categories)),
+            entry.get("course_freq", 0),
+            entry.get("job_freq", 0),
+        )
+        aliases.extend((string_id(alias), i) for alias in entry.get("aliases", ()))
+    alias_rows = np.array(aliases, dtype=ALIAS_DTYPE)
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    sections = [
+        ("strings", b"".join(encoded), len(encoded)),
+        ("string_offsets", offsets.tobytes(), offsets.size),
+        ("skills", skills.tobytes(), skills.size),
+        ("aliases", alias_rows.tobytes(), alias_rows.size),
+    ]
+
+    # Offsets depend on the header size, so lay out sections after a header estimate
+    header = {"format": ARTIFACT_FORMAT, "version": version,
+              "categories": list(categories), "sections": {}}
+    header_size = len(json.dumps(header)) + 64 * (len(sections) + 1)
+    position = _align(len(ARTIFACT_MAGIC) + 4 + header_size)
+    for name, data, count in sections:
+        header["sections"][name] = [position, count]
+        position = _align(position + len(data))
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(ARTIFACT_MAGIC + struct.pack("<I", header_size) + header_bytes)
+        for name, data, _ in sections:
+            f.seek(header["sections"][name][0])
+            f.write(data)
+        f.truncate(position)
+    os.replace(tmp_path, path)
+    logger.info(f"Wrote skill taxonomy {version} ({len(entries)} skills, {len(alias_rows)} aliases) to {path}")
+
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+
+class SkillVocabulary:
+    """
+    Read-only view of a taxonomy artifact. The file is memory-mapped and the
+    tables are numpy views into it, so opening it costs only the header parse.
+    """
+
+    def __init__(self, path: str = TAXONOMY_PATH):
+        self.path = path
+        self._buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self._buffer[:len(ARTIFACT_MAGIC)]) != ARTIFACT_MAGIC:
+            raise ValueError(f"{path} is not a skill taxonomy artifact")
+        (header_size,) = struct.unpack("<I", bytes(self._buffer[8:12]))
+        header = json.loads(bytes(self._buffer[12:12 + header_size]).decode("utf-8"))
+        if header["format"] != ARTIFACT_FORMAT:
+            raise ValueError(f"Unsupported skill taxonomy format {header['format']}")
+
+        self.version: str = header["version"]
+        self.categories: List[str] = header["categories"]
+        sections = header["sections"]
+        self._offsets = self._section(sections["string_offsets"], np.dtype("<u4"))
+        blob_start = sections["strings"][0]
+        self._blob = self._buffer[blob_start:blob_start + int(self._offsets[-1])]
+        self.skills = self._section(sections["skills"], SKILL_DTYPE)
+        self.aliases = self._section(sections["aliases"], ALIAS_DTYPE)
+
+    def _section(self, spec: List[int], dtype: np.dtype) -> np.ndarray:
+        offset, count = spec
+        return np.frombuffer(self._buffer, dtype=dtype, count=count, offset=offset)
+
+    def __len__(self) -> int:
+        return int(self.skills.size)
+
+    def string(self, string_id: int) -> str:
+        start, end = self._offsets[string_id], self._offsets[string_id + 1]
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+    def skill_name(self, skill_id: int) -> str:
+        return self.string(int(self.skills["name"][skill_id]))
+
+    def strings(self) -> List[str]:
+        """Decode the whole string table at once."""
+        data = self._blob.tobytes()
+        offsets = self._offsets.tolist()
+        return [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def merge_into(self, taxonomy: SkillTaxonomy) -> SkillTaxonomy:
+        """Add every mined skill and alias to a taxonomy (existing entries keep their category)."""
+        strings = self.strings()
+        names = [strings[i] for i in self.skills["name"].tolist()]
+        aliases: Dict[int, List[str]] = {}
+        for alias_id, skill_id in self.aliases.tolist():
+            aliases.setdefault(skill_id, []).append(strings[alias_id])
+        for i, (name, category) in enumerate(zip(names, self.skills["category"].tolist())):
+            taxonomy.add(name, self.categories[category], aliases.get(i, ()))
+        return taxonomy
+
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def default_taxonomy() -> SkillTaxonomy:
+    return SkillTaxonomy.from_dict(DEFAULT_SKILLS, DEFAULT_ALIASES)
+
+
+def load_taxonomy(path: str = TAXONOMY_PATH) -> SkillTaxonomy:
+    """The built-in taxonomy extended with the mined vocabulary artifact, when present."""
+    taxonomy = default_taxonomy()
+    if not os.path.exists(path):
+        logger.info(f"No skill taxonomy artifact at {path}; using the built-in skills")
+        return taxonomy
+    try:
+        vocabulary = SkillVocabulary(path)
+        vocabulary.merge_into(taxonomy)
+        logger.info(f"Loaded skill taxonomy {vocabulary.version} with {len(vocabulary)} mined skills")
+    except Exception as e:
+        logger.error(f"Could not load skill taxonomy artifact {path}: {e}")
+    return taxonomy
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Return the process-wide matcher, compiling it on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+
+def set_skill_taxonomy(taxonomy: SkillTaxonomy) -> SkillMatcher:
+    """Compile a new taxonomy and swap it in for all subsequent matches."""
+    global _matcher
+    matcher = SkillMatcher(taxonomy)
+    with _matcher_lock:
+        _matcher = matcher
+    logger.info(f"Skill matcher compiled with {len(taxonomy)} skills")
+    return matcher
@@ -0,0 +1,204 @@
+# File: backend/services/skill_taxonomy_builder.py
+"""
+Offline builder for the skill taxonomy artifact.
+
+Mines a skill vocabulary from the SKILLS column of ALL_COURSES_COMBINED and the
+hard / soft skill labels of JOB_POSTINGS. Surface forms that tokenize the same
+way ("Scikit-learn", "scikit learn") are merged, the most frequent spelling
+becomes the canonical name and the others become aliases, as do qualifiers and
+acronyms in parentheses ("Python (Programming Language)", "Amazon Web Services
+(AWS)"). Labels that are a built-in skill or one of its aliases fold into that
+skill ("Amazon Web Services" into AWS), so every spelling resolves to one ID. Run it from the project root after the dbt models are rebuilt:
+
+    python -m backend.services.skill_taxonomy_builder --min-frequency 3
+"""
+import argparse
+import logging
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.services.course_index import COURSES_TABLE
+from backend.services.skill_taxonomy import (
+    DEFAULT_ALIASES, DEFAULT_SKILLS, TAXONOMY_PATH, term_key, write_taxonomy_artifact
+)
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+JOB_POSTINGS_TABLE = "SKILLPATH_DB.PROCESSED_DATA.JOB_POSTINGS"
+
+SOFT_CATEGORY = "Soft Skills"
+TECHNICAL_CATEGORY = "Technical Skills"
+
+_SPLIT = re.compile(r"[,;\n|]+")
+_PARENTHETICAL = re.compile(r"^(?P<base>[^()]+?)\s*\((?P<inner>[^()]+)\)$")
+_ACRONYM = re.compile(r"^[A-Z][A-Z0-9.+#&/-]{1,9}$")
+
+# Entries that are not skills but show up in LLM-generated SKILLS columns
+_NOT_SKILLS = {
+    ("none",), ("n", "a"), ("na",), ("other",), ("others",), ("various",), ("skills",),
+    ("etc",), ("and",), ("general",), ("misc",), ("miscellaneous",),
+}
+
+
+def split_labels(raw: Optional[str]) -> List[str]:
+    """Split a comma separated skills value into trimmed surface forms."""
+    if not raw:
+        return []
+    labels = []
+    for part in _SPLIT.split(str(raw)):
+        label = " ".join(part.strip(" \t\"'[]-•*.").split())
+        if label:
+            labels.append(label)
+    return labels
+
+
+def surface_variants(label: str) -> Tuple[str, List[str]]:
+    """
+    Split a label into the form to count and the extra aliases it implies.
+
+    "Python (Programming Language)" -> ("Python", ["Python (Programming Language)"])
+    "Amazon Web Services (AWS)"     -> ("Amazon Web Services", ["AWS"])
+    """
+    match = _PARENTHETICAL.match(label)
+    if not match:
+        return label, []
+    base, inner = match.group("base").strip(), match.group("inner").strip()
+    if _ACRONYM.match(inner):
+        return base, [inner]
+    return base, [label]
+
+
+class _Candidate:
+    __slots__ = ("spellings", "aliases", "course_freq", "hard_freq", "soft_freq")
+
+    def __init__(self):
+        self.spellings = Counter()
+        self.aliases = Counter()
+        self.course_freq = 0
+        self.hard_freq = 0
+        self.soft_freq = 0
+
+    def merge(self, other: "_Candidate"):
+        self.spellings.update(other.spellings)
+        self.aliases.update(other.aliases)
+        self.course_freq += other.course_freq
+        self.hard_freq += other.hard_freq
+        self.soft_freq += other.soft_freq
+
+
+def build_vocabulary(course_skills: Iterable[Optional[str]], hard_labels: Iterable[Optional[str]],
+                     soft_labels: Iterable[Optional[str]], min_frequency: int = 3) -> List[Dict]:
+    """
+    Mine skill entries with frequency, category and aliases.
+
+    Args:
+        course_skills (iterable): SKILLS values of courses
+        hard_labels (iterable): Hard skill labels of job postings (one string per posting)
+        soft_labels (iterable): Soft skill labels of job postings
+        min_frequency (int): Minimum courses + postings mentioning a skill
+
+    Returns:
+        list: Entries (name, category, course_freq, job_freq, aliases), most frequent first
+    """
+    candidates: Dict[Tuple[str, ...], _Candidate] = {}
+
+    def count(values: Iterable[Optional[str]], field: str):
+        for raw in values:
+            seen = set()
+            for label in split_labels(raw):
+                surface, aliases = surface_variants(label)
+                key = term_key(surface)
+                if not key or key in _NOT_SKILLS or key in seen or (len(key) == 1 and len(key[0]) < 2):
+                    continue
+                seen.add(key)
+                candidate = candidates.get(key)
+                if candidate is None:
+                    candidate = candidates[key] = _Candidate()
+                candidate.spellings[surface] += 1
+                candidate.aliases.update(aliases)
+                setattr(candidate, field, getattr(candidate, field) + 1)
+
+    count(course_skills, "course_freq")
+    count(hard_labels, "hard_freq")
+    count(soft_labels, "soft_freq")
+
+    # Built-in skills keep their spelling and category
+    builtin = {term_key(skill): (skill, category) for category, skills in DEFAULT_SKILLS.items() for skill in skills}
+    # A label spelled like a built-in alias is that skill, not a new canonical one
+    builtin_alias = {term_key(alias): term_key(skill) for skill, aliases in DEFAULT_ALIASES.items()
+                     if term_key(skill) in builtin for alias in aliases}
+    folded: Dict[Tuple[str, ...], _Candidate] = {}
+    for key, candidate in candidates.items():
+        key = key if key in builtin else builtin_alias.get(key, key)
+        if key in folded:
+            folded[key].merge(candidate)
+        else:
+            folded[key] = candidate
+
+    ranked = []
+    for key, candidate in folded.items():
+        frequency = candidate.course_freq + candidate.hard_freq + candidate.soft_freq
+        if frequency < min_frequency and key not in builtin:
+            continue
+        if key in builtin:
+            name, category = builtin[key]
+        else:
+            name = max(candidate.spellings.items(), key=lambda x: (x[1], -len(x[0])))[0]
+            category = SOFT_CATEGORY if candidate.soft_freq > candidate.hard_freq + candidate.course_freq \
+                else TECHNICAL_CATEGORY
+        aliases = {spelling for spelling in candidate.spellings if spelling != name}
+        aliases.update(candidate.aliases)
+        # One spelling per token form ("Postgres" and "postgres" fold into one built-in)
+        by_form = {}
+        for alias in sorted(aliases):
+            by_form.setdefault(term_key(alias), alias)
+        ranked.append((-frequency, name, {
+            "name": name,
+            "category": category,
+            "course_freq": candidate.course_freq,
+            "job_freq": candidate.hard_freq + candidate.soft_freq,
+            # Spellings that tokenize like the name add nothing for the matchers
+            "aliases": sorted(alias for form, alias in by_form.items() if form != key),
+        }))
+
+    ranked.sort(key=lambda x: x[:2])
+    return [entry for _, _, entry in ranked]
+
+
+def load_skill_sources() -> Tuple[List[str], List[str], List[str]]:
+    """Fetch course SKILLS and job posting hard / soft skill labels from Snowflake."""
+    from backend.database import get_snowflake_connection
+
+    conn = get_snowflake_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT SKILLS FROM {COURSES_TABLE} WHERE SKILLS IS NOT NULL")
+        course_skills = [row[0] for row in cur.fetchall()]
+        cur.execute(f"SELECT HARD_SKILLS, SOFT_SKILLS FROM {JOB_POSTINGS_TABLE}")
+        hard_labels, soft_labels = [], []
+        for hard, soft in cur.fetchall():
+            hard_labels.append(hard)
+            soft_labels.append(soft)
+        return course_skills, hard_labels, soft_labels
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    from backend.logging_config import setup_logging
+
+    setup_logging("skill_taxonomy_builder")
+    parser = argparse.ArgumentParser(description="Build the skill taxonomy artifact")
+    parser.add_argument("--min-frequency", type=int, default=3, help="Minimum courses + postings per skill")
+    parser.add_argument("--output", default=TAXONOMY_PATH, help="Where to write the artifact")
+    args = parser.parse_args()
+
+    vocabulary = build_vocabulary(*load_skill_sources(), min_frequency=args.min_frequency)
+    version = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    write_taxonomy_artifact(args.output, vocabulary, version)
+    print(f"Skill taxonomy {version}: {len(vocabulary)} skills, "
+          f"{sum(len(e['aliases']) for e in vocabulary)} aliases")
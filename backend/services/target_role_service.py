@@ -1,14 +1,19 @@
 # File: backend/services/target_role_service.py
+import logging
 from backend.database import get_snowflake_connection
-import streamlit as st
+
+# Set up logger
+logger = logging.getLogger(__name__)
 
 def get_target_role(username: str) -> str:
     """Retrieve the target role for the given username from LEARNING_PATHS."""
+    conn = None
+    cur = None
     try:
         conn = get_snowflake_connection()
         cur = conn.cursor()
         query = """
-        SELECT TARGET_ROLE 
+        SELECT TARGET_ROLE
         FROM SKILLPATH_DB.PROCESSED_DATA.LEARNING_PATHS
         WHERE NAME = %s
         ORDER BY CREATED_AT DESC
@@ -18,10 +23,9 @@ def get_target_role(username: str) -> str:
         result = cur.fetchone()
         return result[0] if result else "data engineer"
     except Exception as e:
-        st.error(f"Error fetching target role: {e}")
+        # The backend has no UI to report to (this used to call st.error); callers get the default role
+        logger.error(f"Error fetching target role: {e}")
         return "data engineer"
     finally:
-        cur.close()
-        conn.close()
-
-
+        if cur: cur.close()
+        if conn: conn.close()
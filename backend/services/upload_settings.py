@@ -0,0 +1,17 @@
+# File: backend/services/upload_settings.py
+"""
+Upload size limits and bulk ingestion sizing.
+
+Kept free of heavy imports so the API's upload middleware can read them
+without importing the ingestion pipeline.
+
+Settings (environment):
+    BULK_INGEST_MAX_BYTES   largest archive accepted by /user-input/bulk-ingest (512 MB)
+    BULK_INGEST_WORKERS     extraction processes of a bulk ingestion job started through the API (2)
+"""
+import os
+
+BULK_MAX_BYTES = int(os.environ.get("BULK_INGEST_MAX_BYTES", 512 * 1024 * 1024))
+
+# Every API worker may run a job, so they get a small pool rather than one process per CPU
+BULK_API_WORKERS = max(1, int(os.environ.get("BULK_INGEST_WORKERS", min(2, os.cpu_count() or 1))))
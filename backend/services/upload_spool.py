@@ -0,0 +1,86 @@
+# File: backend/services/upload_spool.py
+"""
+Memory-bounded handling of uploaded resumes.
+
+Uploads are copied in fixed-size chunks into a named temporary file while
+their SHA-256 is computed, so a worker never holds a whole file in memory.
+The copy stops as soon as the size cap is passed. Parsers and the extraction
+process pool then open the file by path instead of receiving its bytes.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+
+from backend.services.resume_parser import MAX_BYTES, ResumeTooLargeError
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+SPOOL_DIR = os.environ.get("UPLOAD_SPOOL_DIR") or None
+CHUNK_SIZE = 64 * 1024
+
+
+class SpooledUpload:
+    """An upload copied to disk: path, size and SHA-256. The file is removed on close."""
+
+    def __init__(self, path: str, size: int, sha256: str, filename: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.filename = filename
+
+    def close(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+async def spool_upload(upload, max_bytes: int = MAX_BYTES, chunk_size: int = CHUNK_SIZE) -> SpooledUpload:
+    """
+    Copy an UploadFile to a temporary file in chunks, hashing as it goes.
+
+    Args:
+        upload (UploadFile): The uploaded file
+        max_bytes (int): Size cap; larger uploads are rejected without being copied further
+        chunk_size (int): Bytes read per step
+
+    Returns:
+        SpooledUpload: Use it as a context manager so the temporary file is removed
+
+    Raises:
+        ResumeTooLargeError: If the upload exceeds max_bytes
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise ResumeTooLargeError(f"Resume is {upload.size} bytes; the limit is {max_bytes}")
+
+    suffix = os.path.splitext(upload.filename or "")[1].lower()
+    digest = hashlib.sha256()
+    size = 0
+    handle = tempfile.NamedTemporaryFile(prefix="resume-", suffix=suffix, dir=SPOOL_DIR, delete=False)
+    try:
+        with handle:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ResumeTooLargeError(f"Resume exceeds the limit of {max_bytes} bytes")
+                digest.update(chunk)
+                handle.write(chunk)
+    except BaseException:
+        os.unlink(handle.name)
+        raise
+    finally:
+        # Drop the framework's own spool as soon as the copy exists
+        await upload.close()
+
+    return SpooledUpload(handle.name, size, digest.hexdigest(), upload.filename or "")
@@ -0,0 +1,270 @@
+# File: backend/services/workflow.py
+"""
+Server-side career analysis and learning path workflows.
+
+The Streamlit pages used to drive these flows one HTTP call per step. Here a
+workflow is a small dependency graph of steps, each a blocking function of
+the results it needs. A step starts in the threadpool as soon as those
+results are in, so independent steps (storing the analysis and searching
+courses) run concurrently. run_workflow() streams one NDJSON line per
+finished step, then a summary line:
+
+    {"step": "missing_skills", "status": "ok", "result": [...], "elapsed_ms": 812.4, "degraded": []}
+    {"step": "courses", "status": "error", "error": "...", "retry_after": 4}
+    {"step": "transition_plan", "status": "skipped", "error": "needs courses"}
+    {"summary": {"workflow": "career_transition", "steps": 6, "errors": 1, ...}}
+
+A failed step only skips the steps that need its result. Steps run within the
+request's deadline; since response headers go out before the first step
+finishes, degraded fallbacks are reported per step instead of in X-Degraded.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.services import deadline
+from backend.services.admission import AdmissionRejected
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+WORKFLOW_CAREER_TRANSITION = "career_transition"
+WORKFLOW_LEARNING_PATH = "learning_path"
+
+
+class Step:
+    """One step of a workflow: fn(results) runs once the results named in needs exist."""
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Any], needs: Sequence[str] = ()):
+        self.name = name
+        self.fn = fn
+        self.needs = tuple(needs)
+
+
+def _validate(steps: List[Step]):
+    names = [step.name for step in steps]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate workflow step names: {names}")
+    # Steps may only need earlier steps, which also rules out cycles
+    seen = set()
+    for step in steps:
+        unknown = [need for need in step.needs if need not in seen]
+        if unknown:
+            raise ValueError(f"Step {step.name} needs unknown or later steps: {unknown}")
+        seen.add(step.name)
+
+
+def _run_step(step: Step, results: Dict[str, Any]):
+    """Run a step in its own nested budget; returns (result, degraded reasons, seconds)."""
+    started = time.perf_counter()
+    with deadline.nested() as budget:
+        result = step.fn(results)
+        reasons = list(budget.degraded) if budget else []
+    return result, reasons, time.perf_counter() - started
+
+
+async def run_workflow(name: str, steps: List[Step]) -> AsyncIterator[str]:
+    """
+    Run steps as their inputs become available, streaming NDJSON progress.
+
+    Args:
+        name (str): Workflow name, echoed in the summary
+        steps (list): Steps in an order where each only needs earlier steps
+
+    Yields:
+        str: One NDJSON line per step as it finishes (ok, error or skipped), then a summary
+    """
+    _validate(steps)
+    started = time.perf_counter()
+    results: Dict[str, Any] = {}
+    failed = set()
+    pending = list(steps)
+    running: Dict[asyncio.Future, Step] = {}
+    errors = 0
+
+    try:
+        while pending or running:
+            # Start every step whose inputs are ready; skip those whose inputs failed
+            for step in list(pending):
+                missing = [need for need in step.needs if need in failed]
+                if missing:
+                    pending.remove(step)
+                    failed.add(step.name)
+                    yield _line({"step": step.name, "status": "skipped", "error": f"needs {', '.join(missing)}"})
+                elif all(need in results for need in step.needs):
+                    pending.remove(step)
+                    # Each step sees a snapshot, so concurrent steps never share a mutable dict
+                    task = asyncio.ensure_future(run_in_threadpool(_run_step, step, dict(results)))
+                    running[task] = step
+            if not running:
+                continue
+
+            done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step = running.pop(task)
+                try:
+                    result, reasons, elapsed = task.result()
+                except Exception as e:
+                    errors += 1
+                    failed.add(step.name)
+                    record = {"step": step.name, "status": "error", "error": str(e)}
+                    if isinstance(e, AdmissionRejected):
+                        record["retry_after"] = e.retry_after
+                    logger.error(f"Workflow {name} step {step.name} failed: {e}")
+                    yield _line(record)
+                    continue
+                results[step.name] = result
+                yield _line({
+                    "step": step.name,
+                    "status": "ok",
+                    "result": result,
+                    "elapsed_ms": round(elapsed * 1000, 1),
+                    "degraded": reasons,
+                })
+    finally:
+        # The client went away (or the stream failed): don't start anything else
+        for task in running:
+            task.cancel()
+
+    yield _line({
+        "summary": {
+            "workflow": name,
+            "steps": len(steps),
+            "completed": len(results),
+            "errors": errors,
+            "degraded": deadline.degraded_reasons(),
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        }
+    })
+
+
+def career_transition_steps(username: str, target_role: str, resume_text: Optional[str] = None,
+                            resume_hash: Optional[str] = None, extracted_skills: Optional[List[str]] = None,
+                            mode: Optional[str] = None, limit: int = 6) -> List[Step]:
+    """
+    Steps of the career transition analysis.
+
+    resume_text -> extracted_skills -> missing_skills, then storing the analysis
+    (resume_id) and the course search (courses) side by side, and the
+    transition plan once the courses are in. Text and skills the client already
+    has are reused; with a resume_hash, text, skills and missing skills come
+    from the resume cache when possible, as on the single-step endpoints.
+    """
+    from backend.services.resume_cache import get_resume_cache, lookup_resume
+
+    cache = get_resume_cache()
+
+    def text_step(results):
+        if resume_text:
+            return resume_text
+        entry = lookup_resume(resume_hash) if resume_hash else None
+        if not entry or not entry.get("text"):
+            raise ValueError("No resume text: send resume_text, or the resume_hash of an extracted resume")
+        return entry["text"]
+
+    def skills_step(results):
+        if extracted_skills:
+            return list(extracted_skills)
+        text = results["resume_text"]
+        if resume_hash:
+            cached = cache.get_skills(resume_hash, text, mode)
+            if cached:
+                return cached
+        from backend.services.skill_extraction import extract_skills
+        skills, report = extract_skills(text, mode=mode)
+        if not skills:
+            raise ValueError("Could not extract skills from the resume text.")
+        # Skills found under time pressure are not reused for this resume
+        if resume_hash and not deadline.is_degraded():
+            cache.put_skills(resume_hash, skills, mode=mode or report["mode"], resume_text=text)
+        return skills
+
+    def missing_step(results):
+        from backend.services.career_transition_service import process_missing_skills
+        skills = results["extracted_skills"]
+        if resume_hash:
+            cached = cache.get_missing(resume_hash, target_role, skills)
+            if cached is not None:
+                return cached
+        missing = process_missing_skills(skills, target_role)
+        if resume_hash and missing and not deadline.is_degraded():
+            cache.put_missing(resume_hash, target_role, skills, missing)
+        return missing
+
+    def store_step(results):
+        from backend.services.career_transition_service import store_career_analysis
+        return store_career_analysis(
+            username=username,
+            resume_text=results["resume_text"],
+            extracted_skills=results["extracted_skills"],
+            target_role=target_role,
+            missing_skills=results["missing_skills"],
+            resume_hash=resume_hash
+        )
+
+    def courses_step(results):
+        from backend.services.career_transition_service import get_career_transition_courses
+        found = get_career_transition_courses(target_role, results["missing_skills"], limit)
+        return (found or {}).get("courses", [])
+
+    def plan_step(results):
+        from backend.services.career_transition_service import format_transition_plan
+        return format_transition_plan(
+            username=username,
+            current_skills=results["extracted_skills"],
+            target_role=target_role,
+            missing_skills=results["missing_skills"],
+            courses=results["courses"]
+        )
+
+    return [
+        Step("resume_text", text_step),
+        Step("extracted_skills", skills_step, needs=["resume_text"]),
+        Step("missing_skills", missing_step, needs=["extracted_skills"]),
+        Step("resume_id", store_step, needs=["resume_text", "extracted_skills", "missing_skills"]),
+        Step("courses", courses_step, needs=["missing_skills"]),
+        Step("transition_plan", plan_step, needs=["extracted_skills", "missing_skills", "courses"]),
+    ]
+
+
+def learning_path_steps(name: str, target_role: str, skill_ratings: Optional[Dict[str, int]] = None,
+                        top_skills: Optional[List[str]] = None) -> List[Step]:
+    """
+    Steps of the learning path: top skills, storing the ratings (record_id) and
+    the course search (courses), all side by side.
+
+    The course search uses the ratings from the request rather than reading
+    back the stored record, so it does not wait for the store.
+    """
+    ratings = dict(skill_ratings or {})
+
+    def top_skills_step(results):
+        if top_skills:
+            return list(top_skills)
+        from backend.services.skill_service import get_top_skills_for_role
+        return get_top_skills_for_role(target_role)
+
+    def store_step(results):
+        from backend.services.learning_path_service import store_learning_path
+        record_id = store_learning_path({"name": name, "target_role": target_role, "skill_ratings": ratings})
+        if record_id is None:
+            raise RuntimeError("Learning path could not be stored")
+        return record_id
+
+    def courses_step(results):
+        from backend.services.course_service import get_course_recommendations
+        return get_course_recommendations(target_role, skill_ratings=ratings or None)
+
+    return [
+        Step("top_skills", top_skills_step),
+        Step("record_id", store_step),
+        Step("courses", courses_step),
+    ]
+
+
+def _line(record: Dict) -> str:
+    return json.dumps(record, default=str) + "\n"
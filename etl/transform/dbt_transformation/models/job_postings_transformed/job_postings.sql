@@ -16,7 +16,11 @@ SELECT
       COALESCE(HARD_SKILL_LABELS, ARRAY_CONSTRUCT()),
       COALESCE(SOFT_SKILL_LABELS, ARRAY_CONSTRUCT())
     ), ', '
-  ) AS SKILLS
+  ) AS SKILLS,
+
+  -- Keep hard and soft skills apart as well, for the skill taxonomy builder
+  ARRAY_TO_STRING(COALESCE(HARD_SKILL_LABELS, ARRAY_CONSTRUCT()), ', ') AS HARD_SKILLS,
+  ARRAY_TO_STRING(COALESCE(SOFT_SKILL_LABELS, ARRAY_CONSTRUCT()), ', ') AS SOFT_SKILLS
 
 FROM {{ source('RAW_DATA', 'STG_JOB_POSTINGS') }}
 
@@ -0,0 +1,220 @@
+# File: frontend/api_client.py
+"""
+HTTP helpers for the backend API with conditional requests.
+
+The heavy endpoints (course lists, transition plans, chat history) return an
+ETag. request() keeps the last body per (method, URL, params, JSON body) and
+sends its ETag as If-None-Match; when the backend answers 304 the cached body
+is returned and the payload is not transferred again. Streamlit reruns the
+page script on every interaction, so most of these calls hit the cache.
+Bodies arrive gzip-compressed and requests decodes them.
+
+Every request carries the signed-in user in X-User-Id (user_headers()), with
+FRONTEND_API_TOKEN in X-Frontend-Token so the backend trusts it for its
+per-user rate limits; a 429 comes with Retry-After (see busy_message()). Requests that must not be revalidated (writes, uploads,
+LLM calls) go through send() instead, with the same headers.
+
+No request waits forever: each has a connect and a read timeout, and the read
+timeout is sent as X-Request-Timeout so the backend finishes (falling back
+to a degraded answer if need be) before the frontend gives up. Degraded
+responses are flagged with X-Degraded.
+
+Workflow endpoints answer with NDJSON progress events, one per finished step;
+stream() yields them as they arrive.
+
+Settings (environment):
+    API_CACHE_ENTRIES    responses kept for revalidation (128)
+    API_CACHE_MB         total size of the kept bodies (16)
+    API_TIMEOUT          seconds to wait for a response (60)
+    API_CONNECT_TIMEOUT  seconds to wait for a connection (5)
+    FRONTEND_API_TOKEN   secret shared with the backend (unset: rate limited per address)
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple
+
+import requests
+
+# Logging is configured once per process by frontend/main.py (backend.logging_config)
+logger = logging.getLogger(__name__)
+
+CACHE_ENTRIES = int(os.environ.get("API_CACHE_ENTRIES", "128"))
+CACHE_BYTES = int(float(os.environ.get("API_CACHE_MB", "16")) * 1024 * 1024)
+TIMEOUT = float(os.environ.get("API_TIMEOUT", "60"))
+CONNECT_TIMEOUT = float(os.environ.get("API_CONNECT_TIMEOUT", "5"))
+
+FRONTEND_TOKEN = os.environ.get("FRONTEND_API_TOKEN", "")
+
+USER_HEADER = "X-User-Id"
+TOKEN_HEADER = "X-Frontend-Token"
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+_local = threading.local()
+_cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _session() -> requests.Session:
+    """One keep-alive session per thread (Streamlit runs each script run on its own thread)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+def user_headers() -> dict:
+    """X-User-Id of the signed-in Streamlit user and the frontend token, sent with every request."""
+    try:
+        import streamlit as st
+        username = st.session_state.get("username")
+    except Exception:
+        username = None
+    if not username:
+        return {}
+    headers = {USER_HEADER: str(username)}
+    if FRONTEND_TOKEN:
+        headers[TOKEN_HEADER] = FRONTEND_TOKEN
+    return headers
+
+
+def busy_message(response: requests.Response) -> Optional[str]:
+    """A message for the user when the backend answered 429, else None."""
+    if response.status_code != 429:
+        return None
+    retry_after = response.headers.get("Retry-After", "a few")
+    return f"The service is busy right now. Please try again in {retry_after} seconds."
+
+
+def _prepare(kwargs) -> dict:
+    """Headers and timeout for a request, taken out of (and put back into) kwargs."""
+    timeout = kwargs.pop("timeout", None) or TIMEOUT
+    if isinstance(timeout, tuple):
+        timeout = timeout[-1]
+    headers = {**user_headers(), TIMEOUT_HEADER: f"{timeout:g}", **(kwargs.pop("headers", None) or {})}
+    kwargs["timeout"] = (CONNECT_TIMEOUT, timeout)
+    return headers
+
+
+def _check_degraded(response: requests.Response, url: str):
+    response.degraded = response.headers.get("X-Degraded")
+    if response.degraded:
+        logger.warning(f"Degraded response from {url}: {response.degraded}")
+
+
+def send(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send a request without revalidation, with the user and deadline headers and a timeout.
+
+    Args:
+        method (str): HTTP method
+        url (str): Full endpoint URL
+        kwargs: Passed through to requests (json, files, params, headers, timeout, ...)
+
+    Returns:
+        requests.Response: The response; `degraded` holds the X-Degraded reasons, if any
+    """
+    headers = _prepare(kwargs)
+    response = _session().request(method, url, headers=headers, **kwargs)
+    _check_degraded(response, url)
+    return response
+
+
+def stream(url: str, body=None, **kwargs) -> Iterator[Dict]:
+    """
+    POST to an NDJSON streaming endpoint and yield its events as they arrive.
+
+    Args:
+        url (str): Full endpoint URL
+        body: JSON request body
+        kwargs: Passed through to requests (headers, timeout, ...); the read
+            timeout applies between events, not to the whole stream
+
+    Yields:
+        dict: One decoded event per line
+
+    Raises:
+        requests.HTTPError: If the backend did not accept the request (e.g. 429)
+    """
+    headers = _prepare(kwargs)
+    with _session().post(url, json=body, headers=headers, stream=True, **kwargs) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
+
+def _cache_key(method: str, url: str, params, body) -> str:
+    spec = json.dumps([method, url, params, body], sort_keys=True, default=str)
+    return hashlib.blake2b(spec.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _remember(key: str, etag: str, content: bytes):
+    global _cache_bytes
+    if len(content) > CACHE_BYTES:
+        return
+    with _cache_lock:
+        previous = _cache.pop(key, None)
+        if previous:
+            _cache_bytes -= len(previous[1])
+        _cache[key] = (etag, content)
+        _cache_bytes += len(content)
+        while _cache and (len(_cache) > CACHE_ENTRIES or _cache_bytes > CACHE_BYTES):
+            _, (_, evicted) = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted)
+
+
+def _lookup(key: str) -> Optional[Tuple[str, bytes]]:
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry:
+            _cache.move_to_end(key)
+        return entry
+
+
+def request(method: str, url: str, params=None, json=None, **kwargs) -> requests.Response:
+    """
+    Send a request, revalidating a previously received body with If-None-Match.
+
+    Args:
+        method (str): HTTP method
+        url (str): Full endpoint URL
+        params (dict, optional): Query parameters
+        json: JSON request body
+        kwargs: Passed through to requests (headers, timeout, ...)
+
+    Returns:
+        requests.Response: The response; on a 304 its status is 200, its body is the
+            cached one and `from_cache` is True
+    """
+    key = _cache_key(method.upper(), url, params, json)
+    cached = _lookup(key)
+    headers = _prepare(kwargs)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    response = _session().request(method, url, params=params, json=json, headers=headers, **kwargs)
+    _check_degraded(response, url)
+    response.from_cache = False
+    if response.status_code == 304 and cached:
+        logger.debug("Not modified, reusing %d cached bytes for %s", len(cached[1]), url)
+        response.status_code = 200
+        response._content = cached[1]
+        response.from_cache = True
+    elif response.status_code == 200 and response.headers.get("ETag"):
+        _remember(key, response.headers["ETag"], response.content)
+    return response
+
+
+def get(url: str, params=None, **kwargs) -> requests.Response:
+    """GET with conditional revalidation (see request())."""
+    return request("GET", url, params=params, **kwargs)
+
+
+def post(url: str, json=None, **kwargs) -> requests.Response:
+    """POST with conditional revalidation (see request()); only for lookups without side effects."""
+    return request("POST", url, json=json, **kwargs)
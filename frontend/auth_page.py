@@ -3,7 +3,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import streamlit as st
-import requests
+from frontend import api_client
 import json
 import os
 
@@ -32,7 +32,7 @@ def login_page():
 
             if submit:
                 try:
-                    response = requests.post(
+                    response = api_client.send("POST",
                         f"{API_URL}/auth/login",
                         json={"username": username, "password": password}
                     )
@@ -84,7 +84,7 @@ def signup_page():
                 else:
                     try:
                         # Call the API instead of direct function call
-                        response = requests.post(
+                        response = api_client.send("POST",
                             f"{API_URL}/auth/signup",
                             json={
                                 "name": new_name,
@@ -123,7 +123,7 @@ def forgot_password_page():
                     st.error("Passwords do not match.")
                 else:
                     try:
-                        response = requests.post(
+                        response = api_client.send("POST",
                             f"{API_URL}/auth/reset-password",
                             json={"username": username, "new_password": new_password}
                         )
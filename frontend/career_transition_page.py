@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import os
 import sys
@@ -5,24 +6,15 @@ import json
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import requests
 
 # Ensure backend services can be imported
 # sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # Import backend services
+from frontend import api_client
 from frontend.ui_formatter import format_transition_plan
 
-# Set up logging (consider moving configuration to a central place)
-logging.basicConfig(
-    level=logging.INFO, # Changed default level to INFO
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/career_transition.log"),
-        logging.StreamHandler()
-    ]
-)
-
+# Logging is configured once per process by frontend/main.py (backend.logging_config)
 logger = logging.getLogger(__name__)
 now = datetime.now()
 
@@ -53,7 +45,7 @@ def save_session_state_api(user_name, session_state_data, cur_timestamp, source_
         # Call the API endpoint to save session state data
         logger.info(f"Session state data: {session_state_json[:100]}...")  # Log only first 100 chars
         
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/save-session-state",
             json={
                 "user_name": user_name,
@@ -74,6 +66,27 @@ def save_session_state_api(user_name, session_state_data, cur_timestamp, source_
         logger.error(f"Error calling session state API: {str(e)}")
         return False
 
+def lookup_resume_api(resume_hash):
+    """Look up a previously analyzed resume by the SHA-256 of its bytes using the API."""
+    try:
+        response = api_client.send("POST",
+            f"{API_URL}/user-input/resume/lookup",
+            json={"resume_hash": resume_hash}
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("found"):
+                logger.info(f"Resume {resume_hash[:12]} already analyzed; skipping upload")
+                return data
+            return None
+        else:
+            logger.error(f"API error looking up resume: {response.status_code}")
+            return None
+    except Exception as e:
+        logger.error(f"Error calling resume lookup API: {str(e)}")
+        return None
+
 def extract_resume_text_api(file):
     """Extract text from a resume file using the API."""
     try:
@@ -81,7 +94,7 @@ def extract_resume_text_api(file):
         files = {"file": (file.name, file, file.type)}
         
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/resume/extract",
             files=files
         )
@@ -89,7 +102,7 @@ def extract_resume_text_api(file):
         if response.status_code == 200:
             data = response.json()
             if data.get("success"):
-                logger.info("Resume text extracted successfully via API")
+                logger.info(f"Resume text extracted successfully via API (cached={data.get('cached')})")
                 return data.get("text", "")
             else:
                 logger.warning(f"API returned failure: {data.get('message')}")
@@ -101,13 +114,13 @@ def extract_resume_text_api(file):
         logger.error(f"Error calling resume extraction API: {str(e)}")
         return ""
 
-def extract_skills_api(resume_text):
+def extract_skills_api(resume_text, resume_hash=None):
     """Extract skills from resume text using the API."""
     try:
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/skills/extract",
-            json={"resume_text": resume_text}
+            json={"resume_text": resume_text, "resume_hash": resume_hash}
         )
         
         if response.status_code == 200:
@@ -129,7 +142,7 @@ def extract_skills_regex_api(resume_text):
     """Extract skills from resume text using regex via the API."""
     try:
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/skills/extract-regex",
             json={"resume_text": resume_text}
         )
@@ -149,15 +162,16 @@ def extract_skills_regex_api(resume_text):
         logger.error(f"Error calling skills regex extraction API: {str(e)}")
         return []
 
-def process_missing_skills_api(extracted_skills, target_role):
+def process_missing_skills_api(extracted_skills, target_role, resume_hash=None):
     """Process missing skills for a target role using the API."""
     try:
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/skills/missing",
             json={
                 "extracted_skills": extracted_skills,
-                "target_role": target_role
+                "target_role": target_role,
+                "resume_hash": resume_hash
             }
         )
         
@@ -176,18 +190,19 @@ def process_missing_skills_api(extracted_skills, target_role):
         logger.error(f"Error calling missing skills API: {str(e)}")
         return []
 
-def store_career_analysis_api(username, resume_text, extracted_skills, target_role, missing_skills):
+def store_career_analysis_api(username, resume_text, extracted_skills, target_role, missing_skills, resume_hash=None):
     """Store career analysis data using the API."""
     try:
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/career-analysis/store",
             json={
                 "username": username,
                 "resume_text": resume_text,
                 "extracted_skills": extracted_skills,
                 "target_role": target_role,
-                "missing_skills": missing_skills
+                "missing_skills": missing_skills,
+                "resume_hash": resume_hash
             }
         )
         
@@ -210,7 +225,7 @@ def get_career_transition_courses_api(target_role, missing_skills, limit=6):
     """Get career transition courses using the API."""
     try:
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.post(
             f"{API_URL}/user-input/career-courses",
             json={
                 "target_role": target_role,
@@ -238,7 +253,7 @@ def format_transition_plan_api(username, current_skills, target_role, missing_sk
     """Format transition plan using the API."""
     try:
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.post(
             f"{API_URL}/user-input/transition-plan",
             json={
                 "username": username,
@@ -264,11 +279,49 @@ def format_transition_plan_api(username, current_skills, target_role, missing_sk
         logger.error(f"Error calling transition plan API: {str(e)}")
         return None
 
+def run_career_workflow_api(username, resume_text, extracted_skills, target_role, resume_hash=None, on_step=None):
+    """
+    Run missing skills, storage, courses and the transition plan in one API request.
+
+    The backend streams an event per finished step; on_step(event, finished, total)
+    is called for each. Returns the results of the steps that succeeded, keyed by
+    step name (missing_skills, resume_id, courses, transition_plan); steps that
+    failed are simply absent, so the caller can fall back to the single-step calls.
+    """
+    results = {}
+    total = 6
+    try:
+        events = api_client.stream(
+            f"{API_URL}/user-input/workflow/career-transition",
+            {
+                "username": username,
+                "target_role": target_role,
+                "resume_text": resume_text,
+                "resume_hash": resume_hash,
+                "extracted_skills": extracted_skills
+            }
+        )
+        for finished, event in enumerate(events, start=1):
+            if "summary" in event:
+                logger.info(f"Career workflow finished: {event['summary']}")
+                break
+            if event.get("status") == "ok":
+                results[event["step"]] = event.get("result")
+                if event.get("degraded"):
+                    logger.warning(f"Workflow step {event['step']} degraded: {event['degraded']}")
+            else:
+                logger.warning(f"Workflow step {event['step']} {event.get('status')}: {event.get('error')}")
+            if on_step:
+                on_step(event, finished, total)
+    except Exception as e:
+        logger.error(f"Error calling career workflow API: {str(e)}")
+    return results
+
 def answer_career_question_api(question, user_context):
     """Answer a career-related question using the API."""
     try:
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/career-question",
             json={
                 "question": question,
@@ -284,6 +337,9 @@ def answer_career_question_api(question, user_context):
             else:
                 logger.warning(f"API returned failure: {data.get('message')}")
                 return "I'm having trouble answering your question right now. Please try asking in a different way."
+        elif response.status_code == 429:
+            logger.warning("Career question API is busy (429)")
+            return api_client.busy_message(response)
         elif response.status_code == 503:
             # Service unavailable - extract error message from response
             error_detail = response.json().get("detail", "Unknown error")
@@ -357,7 +413,7 @@ def render_career_transition_page(): # Renamed function
         # Ensure messages list exists
         if "ct_messages" not in st.session_state: st.session_state.ct_messages = []
         st.session_state.ct_messages.append({"role": role, "content": content})
-        logger.debug(f"Added CT message: {role} - {content[:50]}...") # Optional debug log
+        logger.debug("Added CT message: %s - %s...", role, content[:50]) # Optional debug log
 
     # Display chat history
     if "ct_messages" in st.session_state:
@@ -395,8 +451,15 @@ def render_career_transition_page(): # Renamed function
         if uploaded_file:
             with st.spinner("Analyzing your resume..."):
                 try:
-                    # Use the API function instead of direct call
-                    resume_text = extract_resume_text_api(uploaded_file)
+                    # Identical files are recognized by content hash; on a hit the upload is skipped
+                    resume_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+                    st.session_state.ct_data["resume_hash"] = resume_hash
+                    known_resume = lookup_resume_api(resume_hash)
+                    if known_resume:
+                        resume_text = known_resume.get("text", "")
+                    else:
+                        # Use the API function instead of direct call
+                        resume_text = extract_resume_text_api(uploaded_file)
                     if not resume_text or len(resume_text) < 50:
                         add_message("assistant", "⚠️ I couldn't extract enough text from your resume. Please try uploading a different file.")
                         logger.warning(f"Insufficient text extracted from {uploaded_file.name}")
@@ -406,9 +469,13 @@ def render_career_transition_page(): # Renamed function
                     logger.info("Resume text extracted.")
 
                     try:
-                        # Use the API function instead of direct call
-                        extracted_skills = extract_skills_api(resume_text)
-                        logger.info("Skills extracted using API.")
+                        if known_resume and known_resume.get("skills"):
+                            extracted_skills = known_resume["skills"]
+                            logger.info("Skills reused from a previous analysis of this resume.")
+                        else:
+                            # Use the API function instead of direct call
+                            extracted_skills = extract_skills_api(resume_text, resume_hash)
+                            logger.info("Skills extracted using API.")
                     except Exception as e:
                         logger.warning(f"API skill extraction failed: {e}. Falling back to regex.")
                         # Use the regex API function as fallback
@@ -485,24 +552,46 @@ def render_career_transition_page(): # Renamed function
                     logger.info(f"Starting skill analysis for {name} -> {target_role}.")
 
                     skill_progress = st.progress(0.0, text="Identifying missing skills...")
-                    debug_container.write("Identifying missing skills...")
-                    # Use the API function instead of direct call
-                    missing_skills = process_missing_skills_api(extracted_skills, target_role)
+                    debug_container.write("Running the career analysis workflow...")
+                    step_labels = {
+                        "missing_skills": "Storing analysis and searching for courses...",
+                        "courses": "Preparing your transition plan...",
+                    }
+
+                    def show_step(event, finished, total):
+                        label = step_labels.get(event.get("step"), "Analyzing...")
+                        skill_progress.progress(min(finished / total, 1.0), text=label)
+
+                    # One request runs the whole analysis; storing and the course search run side by side
+                    workflow = run_career_workflow_api(
+                        name, resume_text, extracted_skills, target_role,
+                        resume_hash=st.session_state.ct_data.get("resume_hash"),
+                        on_step=show_step
+                    )
+                    if workflow.get("transition_plan"):
+                        st.session_state.ct_data["transition_plan"] = workflow["transition_plan"]
+
+                    # Steps the workflow could not finish fall back to the single-step calls
+                    missing_skills = workflow.get("missing_skills")
+                    if missing_skills is None:
+                        missing_skills = process_missing_skills_api(
+                            extracted_skills, target_role, st.session_state.ct_data.get("resume_hash")
+                        )
                     st.session_state.ct_data["missing_skills"] = missing_skills
                     debug_container.success(f"Identified {len(missing_skills)} missing skills: {missing_skills}")
                     logger.info(f"Identified {len(missing_skills)} missing skills.")
 
-                    skill_progress.progress(0.3, text="Storing analysis results...")
-                    debug_container.write("Storing career analysis data...")
-                    # Use the API function instead of direct call
                     try:
-                        resume_id = store_career_analysis_api(
-                            username=name,
-                            resume_text=resume_text,
-                            extracted_skills=extracted_skills,
-                            target_role=target_role,
-                            missing_skills=missing_skills
-                        )
+                        resume_id = workflow.get("resume_id")
+                        if resume_id is None:
+                            resume_id = store_career_analysis_api(
+                                username=name,
+                                resume_text=resume_text,
+                                extracted_skills=extracted_skills,
+                                target_role=target_role,
+                                missing_skills=missing_skills,
+                                resume_hash=st.session_state.ct_data.get("resume_hash")
+                            )
                         st.session_state.ct_data["resume_id"] = resume_id
                         debug_container.success(f"Analysis stored with ID: {resume_id}")
                         logger.info(f"Analysis stored with ID: {resume_id}")
@@ -511,14 +600,14 @@ def render_career_transition_page(): # Renamed function
                         debug_container.warning(f"Failed to store analysis: {e}")
                         st.session_state.ct_data["resume_id"] = None # Indicate storage failure
 
-                    skill_progress.progress(0.6, text="Searching for relevant courses...")
-                    debug_container.write("Getting course recommendations...")
                     try:
-                        # Use the API function instead of direct call
-                        courses_result = get_career_transition_courses_api(
-                            target_role=target_role,
-                            missing_skills=missing_skills
-                        )
+                        if workflow.get("courses") is not None:
+                            courses_result = {"courses": workflow["courses"], "count": len(workflow["courses"])}
+                        else:
+                            courses_result = get_career_transition_courses_api(
+                                target_role=target_role,
+                                missing_skills=missing_skills
+                            )
                         if courses_result and courses_result.get("count", 0) > 0:
                             courses_df = pd.DataFrame(courses_result["courses"])
                             debug_container.success(f"Found {len(courses_df)} course recommendations.")
@@ -548,6 +637,7 @@ def render_career_transition_page(): # Renamed function
                     if "missing_skills" in st.session_state.ct_data: del st.session_state.ct_data["missing_skills"]
                     if "courses" in st.session_state.ct_data: del st.session_state.ct_data["courses"]
                     if "resume_id" in st.session_state.ct_data: del st.session_state.ct_data["resume_id"]
+                    if "transition_plan" in st.session_state.ct_data: del st.session_state.ct_data["transition_plan"]
                     st.rerun()
         else:
              # If analysis already done, just ensure we are in display state
@@ -582,8 +672,8 @@ def render_career_transition_page(): # Renamed function
 
             # Use formatting function for consistent UI
             try:
-                # Use the API function instead of direct call
-                transition_plan = format_transition_plan_api(
+                # The analysis workflow already built the plan; otherwise ask the API for it
+                transition_plan = st.session_state.ct_data.get("transition_plan") or format_transition_plan_api(
                     username=name,
                     current_skills=extracted_skills,
                     target_role=target_role,
@@ -1,30 +1,14 @@
 import streamlit as st
 import json
-import requests
 import os
 import logging
-from logging.handlers import RotatingFileHandler
 from datetime import datetime
 
+from frontend import api_client
 
-# Configure logging with a rotating file handler
-log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s')
-log_file = 'logs/dashboard.log'
 
-# Create a handler that rotates log files when they reach 1MB
-file_handler = RotatingFileHandler(log_file, maxBytes=1_000_000, backupCount=3)
-file_handler.setFormatter(log_formatter)
-file_handler.setLevel(logging.INFO)
-
-# Get logger
+# Logging is configured once per process by frontend/main.py (backend.logging_config)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)
-
-# Remove any duplicate handlers
-for handler in logger.handlers[:]:
-    if isinstance(handler, logging.FileHandler) and handler != file_handler:
-        logger.removeHandler(handler)
 
 FASTAPI_BASE_URL = os.environ.get("API_URL", "http://backend:8000")
 
@@ -66,7 +50,7 @@ def generate_chat_preview(chat_list):
         else:
             preview = "(empty or invalid chat data)"
         
-        logger.debug(f"Created preview: {preview[:30]}...")
+        logger.debug("Created preview: %s...", preview[:30])
         return preview
     except Exception as e:
         logger.error(f"Error creating preview: {str(e)}")
@@ -75,12 +59,13 @@ def generate_chat_preview(chat_list):
 def fetch_recent_chats(user_name, limit=5):
     logger.info(f"Fetching recent chats for user: {user_name}, limit: {limit}")
     try:
-        response = requests.get(
+        # Conditional GET: unchanged history comes back as a 304 and is served from api_client's cache
+        response = api_client.get(
             f"{FASTAPI_BASE_URL}/user-input/chat-history/recent",
             params={"user_name": user_name, "limit": limit}
         )
 
-        logger.debug(f"API response status: {response.status_code}")
+        logger.debug("API response status: %s", response.status_code)
         
         if response.status_code == 200:
             chats = response.json()
@@ -98,7 +83,7 @@ def fetch_recent_chats(user_name, limit=5):
 def clean_selected_chat(user_name, timestamp):
     logger.info(f"Cleaning chat for user: {user_name}, timestamp: {timestamp}")
     try:
-        response = requests.post(
+        response = api_client.send("POST",
             f"{FASTAPI_BASE_URL}/user-input/chat-history/clean",
             json={"user_name": user_name, "timestamp": timestamp}
         )
@@ -155,13 +140,13 @@ def render_dashboard_page():
             source = record.get("source_page", "unknown")
             role = record.get("role", "")
             
-            logger.debug(f"Processing chat record {i+1}: source={source}, timestamp={timestamp}")
+            logger.debug("Processing chat record %s: source=%s, timestamp=%s", i+1, source, timestamp)
             
             # Parse chat list if needed
             if isinstance(chat_list, str):
                 try:
                     chat_list = json.loads(chat_list)
-                    logger.debug(f"Successfully parsed chat_list JSON for record {i+1}")
+                    logger.debug("Successfully parsed chat_list JSON for record %s", i+1)
                 except json.JSONDecodeError as e:
                     logger.error(f"JSON parsing error for chat record {i+1}: {str(e)}")
                     chat_list = []
@@ -5,23 +5,15 @@ import json
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import requests
 
 # Ensure backend services can be imported
 # sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # Import backend services
+from frontend import api_client
 from frontend.ui_formatter import format_course_message, format_introduction, format_career_advice, format_skills_for_display
 
-# Set up logging (consider moving configuration to a central place)
-logging.basicConfig(
-    level=logging.INFO, # Changed default level to INFO
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/learning_path_debug.log", mode='a'), # Append mode
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Logging is configured once per process by frontend/main.py (backend.logging_config)
 logger = logging.getLogger(__name__) # Use __name__ for logger
 now = datetime.now()
 
@@ -47,7 +39,7 @@ def save_session_state_api(user_name, session_state_data, cur_timestamp, source_
         
         session_state_json = json.dumps(session_state_data, cls=CustomJSONEncoder)
         # Call the API endpoint to save session state
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/save-session-state",
             json={
                 "user_name": user_name,
@@ -68,7 +60,7 @@ def get_top_skills_for_role_api(target_role):
     """Call the API to get top skills for a role."""
     try:
         # Call the API endpoint to get top skills
-        response = requests.get(
+        response = api_client.send("GET",
             f"{API_URL}/recommendations/skills/top/{target_role}"
         )
         if response.status_code == 200:
@@ -89,8 +81,8 @@ def get_top_skills_for_role_api(target_role):
 def get_course_recommendations_api(target_role, user_id=None):
     """Call the API to get course recommendations for a role."""
     try:
-        # Call the API endpoint to get course recommendations
-        response = requests.post(
+        # Call the API endpoint to get course recommendations (revalidated with If-None-Match)
+        response = api_client.post(
             f"{API_URL}/recommendations/courses",
             json={"role": target_role, "user_id": user_id, "limit": 5}
         )
@@ -122,7 +114,7 @@ def store_skill_ratings_api(learning_path_data):
         #     api_data["courses"] = courses.to_dict('records')
         
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/skill-ratings/store",
             json=api_data
         )
@@ -142,6 +134,37 @@ def store_skill_ratings_api(learning_path_data):
         logger.error(f"Error calling learning path storage API: {str(e)}", exc_info=True)
         return None
 
+def run_learning_path_workflow_api(learning_path_data):
+    """
+    Store the skill ratings and fetch courses in one API request, side by side.
+
+    Returns the results of the steps that succeeded, keyed by step name
+    (top_skills, record_id, courses); steps that failed are absent, so the
+    caller can fall back to the single-step calls.
+    """
+    results = {}
+    try:
+        events = api_client.stream(
+            f"{API_URL}/user-input/workflow/learning-path",
+            {
+                "name": learning_path_data.get("name", "Unknown"),
+                "target_role": learning_path_data.get("target_role", "Unknown Role"),
+                "top_skills": learning_path_data.get("top_skills") or None,
+                "skill_ratings": learning_path_data.get("skill_ratings", {})
+            }
+        )
+        for event in events:
+            if "summary" in event:
+                logger.info(f"Learning path workflow finished: {event['summary']}")
+                break
+            if event.get("status") == "ok":
+                results[event["step"]] = event.get("result")
+            else:
+                logger.warning(f"Workflow step {event['step']} {event.get('status')}: {event.get('error')}")
+    except Exception as e:
+        logger.error(f"Error calling learning path workflow API: {str(e)}", exc_info=True)
+    return results
+
 def answer_career_question_api(question, user_context):
     """Call the API to get an answer to a career-related question."""
     try:
@@ -152,7 +175,7 @@ def answer_career_question_api(question, user_context):
         }
         
         # Call the API endpoint
-        response = requests.post(
+        response = api_client.send("POST",
             f"{API_URL}/user-input/career-question",
             json=request_data
         )
@@ -160,6 +183,9 @@ def answer_career_question_api(question, user_context):
         if response.status_code == 200:
             data = response.json()
             return data.get("response", "I'm sorry, I couldn't find an answer.")
+        elif response.status_code == 429:
+            logger.warning("Career question API is busy (429)")
+            return api_client.busy_message(response)
         else:
             # Extract error message from response if possible
             try:
@@ -398,10 +424,14 @@ def render_learning_path_page(): # Renamed function
                 target_role = st.session_state.lp_data.get("target_role", "Unknown Role")
                 user_id = None # Placeholder for user ID if needed by course service
 
-                # Store the learning path data first (optional, depends on whether ID is needed for courses)
+                # Storing the ratings and the course search run side by side in one request
+                debug_container.write("Running the learning path workflow...")
+                workflow = run_learning_path_workflow_api(st.session_state.lp_data)
+
+                # Steps the workflow could not finish fall back to the single-step calls
                 try:
                     debug_container.write("Storing learning path data...")
-                    store_result = store_skill_ratings_api(st.session_state.lp_data)
+                    store_result = workflow.get("record_id") or store_skill_ratings_api(st.session_state.lp_data)
                     if store_result:
                         debug_container.success("Learning path stored successfully")
                         # Get the ID from the stored data
@@ -419,7 +449,10 @@ def render_learning_path_page(): # Renamed function
                 # Get recommended courses
                 try:
                     debug_container.write("Fetching course recommendations...")
-                    courses_df = get_course_recommendations_api(target_role, user_id)
+                    if workflow.get("courses") is not None:
+                        courses_df = pd.DataFrame(workflow["courses"])
+                    else:
+                        courses_df = get_course_recommendations_api(target_role, user_id)
                     debug_container.success(f"Retrieved {len(courses_df)} course recommendations.")
                     logger.info(f"Retrieved {len(courses_df)} course recommendations for role '{target_role}'.")
                     st.session_state.lp_data["courses"] = courses_df
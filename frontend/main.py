@@ -12,20 +12,14 @@ import sys
 import time
 import os
 
-# Ensure logs directory exists
-os.makedirs("logs", exist_ok=True)
+# Add the parent directory to sys.path to allow absolute imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Set up minimal logging
-logging.basicConfig(
-    level=logging.WARNING,  # Only log warnings and errors
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler("logs/app_errors.log"), logging.StreamHandler()]
-)
+# Queue-based logging shared with the backend; Streamlit reruns this script, setup runs once
+from backend.logging_config import setup_logging
+setup_logging("frontend", level=os.environ.get("LOG_LEVEL", "WARNING"))
 
 logger = logging.getLogger("SkillPathAI")
-
-# Add the parent directory to sys.path to allow absolute imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from frontend.auth_page import login_page, signup_page, forgot_password_page
 from frontend.dashboard import main_app
 
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from frontend import api_client
 import os
 
 API_URL = "http://backend:8000"  # Replace with your backend URL
@@ -13,7 +13,7 @@ def render_profile_page():
         return
 
     try:
-        response = requests.get(f"{API_URL}/auth/user-profile", params={"username": username})
+        response = api_client.send("GET", f"{API_URL}/auth/user-profile", params={"username": username})
         if response.status_code == 200:
             user_data = response.json()
         else:
@@ -25,8 +25,16 @@ def format_course_message(courses_df, target_role):
     levels = ["BEGINNER", "INTERMEDIATE", "ADVANCED"]
     has_valid_courses = False
     
-    for level in levels:
-        level_courses = courses_df[courses_df["LEVEL_CATEGORY"] == level]
+    # Courses planned by the backend carry their learning order and stage
+    planned = "PLAN_STAGE" in courses_df.columns and courses_df["PLAN_STAGE"].notna().all()
+    if planned:
+        courses_df = courses_df.sort_values("PLAN_ORDER")
+    
+    for stage, level in enumerate(levels):
+        if planned:
+            level_courses = courses_df[courses_df["PLAN_STAGE"] == stage]
+        else:
+            level_courses = courses_df[courses_df["LEVEL_CATEGORY"] == level]
         
         if not level_courses.empty:
             level_title_added = False